@@ -14,6 +14,226 @@
 # the opponent still has ring. If not, the current player won; If yes, game continues. Player can also resign as long as the game is unfinished.
 
 
+import random
+from enum import IntEnum
+from itertools import chain
+from time import perf_counter
+
+
+# the 8 directions a piece can move in, as (row step, column step) on the 20x20 board. Row 0 of the board is row '20'
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# letters of the 20 board columns, indexed by board column
+COLUMN_LETTERS = 'abcdefghijklmnopqrst'
+
+# board column of every column letter
+COLUMN_NUMBERS = {letter: column for column, letter in enumerate(COLUMN_LETTERS)}
+
+# location string (like 'c3') of every square of the 20x20 board, indexed by square = board row * 20 + board column
+LOCATIONS = tuple(COLUMN_LETTERS[square % 20] + str(20 - square // 20) for square in range(400))
+
+# square of every location string, the reverse of LOCATIONS
+SQUARES = {location: square for square, location in enumerate(LOCATIONS)}
+
+# Zobrist keys: one random 64-bit number per stone per square, and one for white to move.
+# The hash of a position is the XOR of the keys of every stone on the board (and of ZOBRIST_TURN when it's white's turn),
+# so a move only needs to XOR the keys of the squares it changes. The seed is fixed so hashes are the same in every process.
+_zobrist_random = random.Random(20200528)
+ZOBRIST_KEYS = {'●': tuple(_zobrist_random.getrandbits(64) for square in range(400)),
+                '○': tuple(_zobrist_random.getrandbits(64) for square in range(400))}
+ZOBRIST_TURN = _zobrist_random.getrandbits(64)
+
+# for each direction, the squares (relative to the piece center) that lead the piece when it moves that way.
+# A piece that moves one more square in that direction covers exactly these squares for the first time.
+LEADING_EDGES = {(dr, dc): tuple((r, c) for r in (-1, 0, 1) for c in (-1, 0, 1) if (dr and r == dr) or (dc and c == dc))
+                 for dr, dc in DIRECTIONS}
+
+
+
+# Position codec, see to_fen() and to_bytes(). Stones only ever sit on the 18x18 playable area, so a position is stored as two
+# 324-bit "area masks", one per stone, with bit (board row - 1) * 18 + (board column - 1) set for every square holding that stone,
+# plus the turn and the game state.
+# The binary form is POSITION_BYTES long: both masks as one 648-bit little-endian integer (black in the low 324 bits), then one
+# byte holding the turn (bit 0, set for white) and the game state (bits 1-2, the index in POSITION_STATES).
+# The text form is like chess FEN: the 18 rows from row '19' down to row '2' separated by '/', 'b' and 'w' for stones and a number
+# for a run of empty squares, then the turn ('b' or 'w') and the game state ('-', 'B' or 'W'), e.g. the initial position starts
+# "1w1w1wwwwwwww1w1w1/www1w1wwww1w1w1www/..." and ends "... b -".
+POSITION_BYTES = 82
+POSITION_TURNS = ('black', 'white')
+POSITION_STATES = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+FEN_TURNS = ('b', 'w')
+FEN_STATES = ('-', 'B', 'W')
+
+# one digit per square of the playable area: '0' empty, '1' black, '2' white
+CELL_DIGITS = {'': '0', '●': '1', '○': '2'}
+DIGIT_STONES = {'0': '', '1': '●', '2': '○'}
+_BLACK_DIGITS = str.maketrans('012', '010')
+_WHITE_DIGITS = str.maketrans('012', '001')
+_DIGIT_FEN = str.maketrans('012', '.bw')
+_FEN_DIGITS = str.maketrans('.bw', '012')
+
+
+def digits_to_area(digits):
+    """
+    Takes the 324 square digits of the playable area (board row 1 first) and returns the 2 area masks (black, white)
+    """
+    return int(digits.translate(_BLACK_DIGITS)[::-1], 2), int(digits.translate(_WHITE_DIGITS)[::-1], 2)
+
+
+def area_to_digits(black, white):
+    """
+    Takes the 2 area masks and returns the 324 square digits of the playable area (board row 1 first)
+    """
+    # read each mask as a 324-digit decimal number of 0s and 1s: black + 2 * white never carries, since no square holds both
+    return str(int(format(black, '0324b')) + 2 * int(format(white, '0324b'))).zfill(324)[::-1]
+
+
+def encode_position(black, white, turn, state):
+    """
+    Takes the 2 area masks, the turn and the game state and returns the position as POSITION_BYTES bytes
+    """
+    return (black | white << 324).to_bytes(81, 'little') + bytes((POSITION_TURNS.index(turn) | POSITION_STATES.index(state) << 1,))
+
+
+def decode_position(data):
+    """
+    Takes the bytes returned by encode_position() and returns the position as (black area mask, white area mask, turn, state).
+    Raises ValueError if data isn't a valid position.
+    """
+    if len(data) != POSITION_BYTES:
+        raise ValueError(f'a position is {POSITION_BYTES} bytes, not {len(data)}')
+    area = int.from_bytes(data[:81], 'little')
+    black = area & ((1 << 324) - 1)
+    white = area >> 324
+    flags = data[81]
+    if black & white or flags >> 1 >= len(POSITION_STATES):
+        raise ValueError('not a valid position')
+    return black, white, POSITION_TURNS[flags & 1], POSITION_STATES[flags >> 1]
+
+
+def encode_fen(black, white, turn, state):
+    """
+    Takes the 2 area masks, the turn and the game state and returns the position as a FEN-like string
+    """
+    cells = area_to_digits(black, white).translate(_DIGIT_FEN)
+    placement = '/'.join([cells[start:start+18] for start in range(0, 324, 18)])
+    # longest runs first, so every run of empty squares becomes one number ('/' keeps runs from spanning rows)
+    for length in range(18, 0, -1):
+        placement = placement.replace('.' * length, str(length))
+    return f'{placement} {FEN_TURNS[POSITION_TURNS.index(turn)]} {FEN_STATES[POSITION_STATES.index(state)]}'
+
+
+def decode_fen(fen):
+    """
+    Takes a string returned by encode_fen() and returns the position as (black area mask, white area mask, turn, state).
+    Raises ValueError if fen isn't a valid position.
+    """
+    fields = fen.split()
+    if len(fields) != 3 or fields[1] not in FEN_TURNS or fields[2] not in FEN_STATES:
+        raise ValueError(f'not a position: {fen!r}')
+    import re                   # only needed here, and slow to import for processes that never read a FEN
+    # split() with a group keeps the numbers at the odd indices
+    parts = re.split(r'([0-9]+)', fields[0])
+    parts[1::2] = ['.' * int(number) for number in parts[1::2]]
+    rows = ''.join(parts).split('/')
+    if len(rows) != 18 or any(len(row) != 18 or row.strip('.bw') for row in rows):
+        raise ValueError(f'not a position: {fen!r}')
+    black, white = digits_to_area(''.join(rows).translate(_FEN_DIGITS))
+    return black, white, POSITION_TURNS[FEN_TURNS.index(fields[1])], POSITION_STATES[FEN_STATES.index(fields[2])]
+
+
+
+# Board masks, the form GessGame_Bitboard keeps the board in: a 400-bit integer per stone, one bit per square of the 20x20 board
+# (bit index = board row * 20 + board column). A position read from its area masks gets its rings and hash from these with a few
+# shifts instead of a walk over the board.
+
+# every square of the 18x18 playable area. Clearing the border is a single AND with this mask
+INTERIOR = sum(0x3FFFF << (row*20 + 1) for row in range(1, 19))
+
+
+def mask_to_area(mask):
+    """
+    Takes a mask of the 20x20 board and returns the area mask of its 18x18 playable area, as in GessGame.encode_position()
+    """
+    area = 0
+    for row in range(18, 0, -1):
+        area = area << 18 | (mask >> (row*20 + 1)) & 0x3FFFF
+    return area
+
+
+def area_to_mask(area):
+    """
+    Takes an area mask of the 18x18 playable area and returns the mask of the 20x20 board, the reverse of mask_to_area()
+    """
+    mask = 0
+    for row in range(1, 19):
+        mask |= (area >> ((row - 1)*18) & 0x3FFFF) << (row*20 + 1)
+    return mask
+
+
+def ring_centers_mask(own, occupied):
+    """
+    Takes the mask of one colour and the mask of every stone on the board.
+    Returns the mask of the center of every ring of that colour: an empty square with 8 of the colour's stones around it.
+    """
+    return ((own << 21) & (own << 20) & (own << 19) & (own << 1) & (own >> 1) & (own >> 19) & (own >> 20) & (own >> 21)
+            & ~occupied & INTERIOR)
+
+
+def mask_hash(mask, keys):
+    """
+    Takes a mask and the Zobrist keys of one stone, returns the XOR of the keys of every square in the mask
+    """
+    position_hash = 0
+    while mask:
+        lowest = mask & -mask
+        mask ^= lowest
+        position_hash ^= keys[lowest.bit_length() - 1]
+    return position_hash
+
+
+def mask_centers(mask):
+    """
+    Takes a mask and returns the set of (board row, board column) of every square in it
+    """
+    centers = set()
+    while mask:
+        lowest = mask & -mask
+        mask ^= lowest
+        centers.add(divmod(lowest.bit_length() - 1, 20))
+    return centers
+
+
+def legal_destinations(data):
+    """
+    Takes a position as the bytes returned by GessGame.to_bytes() and returns a dictionary {from_square: tuple of to_square} with
+    every legal move of whoever's turn it is. Meant for a worker process: only the bytes are sent to it, and the moves are found
+    on a GessGame_Bitboard, imported on the first call so that a process that never calls it doesn't load that module.
+    """
+    from GessGame_Bitboard import GessGame_Bitboard
+
+    destinations = {}
+    for from_square, to_square in GessGame_Bitboard.from_bytes(data).iter_legal_moves_idx():
+        destinations.setdefault(from_square, []).append(to_square)
+    return {from_square: tuple(to_squares) for from_square, to_squares in destinations.items()}
+
+
+
+class MoveReason(IntEnum):
+    """
+    Why a move is rejected, as returned by GessGame.check_move(). LEGAL is 0, so a reason can be tested like a bool:
+    "if game.check_move(...)" is true when the move is illegal. The values follow the order the rules are checked in.
+    """
+    LEGAL = 0
+    OUT_OF_BOUNDS = 1           # a piece center is off the 18x18 grid
+    NOT_STRAIGHT = 2            # neither straight nor 45 degree diagonal
+    MIXED_PIECE = 3             # the 3x3 grid holds an opponent's stone
+    NO_PERIMETER_STONE = 4      # no stone of the piece's perimeter in that direction
+    TOO_FAR = 5                 # over 3 squares with an empty center
+    OBSTRUCTED = 6              # a stone in the way
+    LEAVES_NO_RING = 7          # the player would have no ring left
+
+
 class GessGame:
     """ 
     Represents a board game called Gess that's played by two players (black and white) on an 18x18 grid of a board.
@@ -24,7 +244,7 @@ class GessGame:
     Stones are removed when 1) being covered by the footprint of a piece 2) part of the piece gets moved beyond the board boundaries.
     A player doesn't lose until they have no remaining ring which is composed of eight stones being around an empty center.
 
-    Totally 11 methods are implemented:
+    Totally 33 methods are implemented:
         1) __init__ ()
         2) make_move(stone, from_location, to_location)
         3) is_move_legal(stone, from_location, to_location)
@@ -34,19 +254,49 @@ class GessGame:
         7) get_game_state()
         8) set_game_state(winner)
         9) set_turn(turn)
+        10) generate_legal_moves()
+        11) iter_legal_moves()
+        12) unmake_move()
+        13) get_hash()
+        14) count_stones(stone)
+        15) count_rings(stone)
+        16) move_captures(from_location, to_location)
+        17) get_board()
+        18) check_move(stone, from_location, to_location)
+        Saving and loading positions (see encode_position() and encode_fen()):
+        19) to_bytes()
+        20) from_bytes(data) (class method)
+        21) to_fen()
+        22) from_fen(fen) (class method)
+        Taking squares (board row * 20 + board column) instead of location strings, for engines:
+        23) make_move_idx(from_square, to_square)
+        24) is_move_legal_idx(stone, from_square, to_square)
+        25) check_move_idx(stone, from_square, to_square)
+        26) generate_legal_moves_idx()
+        27) iter_legal_moves_idx()
+        28) move_captures_idx(from_square, to_square)
+        Opt-in counters of the legality pipeline (see game_stats.py):
+        29) enable_stats(stats)
+        30) disable_stats()
+        31) get_stats()
         For debugging:
-        10) get_turn()  
-        11) print_board()
+        32) get_turn()
+        33) print_board()
 
     """
+    _stats = None   # the GameStats counting for this game, set by enable_stats()
+
     def __init__(self):
         """
-        Takes no parameters and initializes a GessGame object with 3 private data members: state, turn and board.
+        Takes no parameters and initializes a GessGame object with 6 private data members: state, turn, board, undo_stack, rings and hash.
         board is initialized as a 20x20 nested list, each outerlist represents a row, each element of the innerlist 
-        represents a square.
+        represents a square. undo_stack keeps what's needed to take back every move made by make_move().
+        rings keeps the centers of every ring of each stone, updated every time a piece moves.
+        hash is the 64-bit Zobrist hash of the board and turn, also updated every time a piece moves or the turn changes.
         """
         self._state = 'UNFINISHED'
         self._turn = 'black'
+        self._undo_stack = []
         self._board = [['','','','','','','','','','','','','','','','','','','',''],
                        ['','','○','','○','','○','○','○','○','○','○','○','○','','○','','○','',''],
                        ['','○','○','○','','○','','○','○','○','○','','○','','○','','○','○','○',''],
@@ -67,6 +317,8 @@ class GessGame:
                        ['','●','●','●','','●','','●','●','●','●','','●','','●','','●','●','●',''],
                        ['','','●','','●','','●','●','●','●','●','●','●','●','','●','','●','',''],
                        ['','','','','','','','','','','','','','','','','','','','']]
+        self._rings = self._scan_rings()
+        self._hash = self._scan_hash()
        
          
     
@@ -80,150 +332,205 @@ class GessGame:
         if self._state != 'UNFINISHED':
             return False
         
-        # define stone, opponent's stone and next_turn based on the current turn
+        # define stone based on the current turn
         if self._turn == 'black':
             stone = '●'
-            opponent_stone = '○'
-            next_turn = 'white'
         else:
             stone = '○'
-            opponent_stone = '●'
-            next_turn = 'black'
         
         # check if the move is legal
         if not self.is_move_legal(stone, from_location, to_location):
             return False
        
-        # make the move if it's legal 
-        self.move_and_capture(stone, from_location, to_location)
+        self._play_move(SQUARES[from_location], SQUARES[to_location])
+        
+        return True
+
+
+    def make_move_idx(self, from_square, to_square):
+        """
+        Same as make_move(), with the centers given as squares (board row * 20 + board column, see SQUARES) so no string
+        is parsed. Returns True if the move was made, False if it's illegal or the game is finished.
+        """
+        if self._state != 'UNFINISHED':
+            return False
+
+        if self._turn == 'black':
+            stone = '●'
+        else:
+            stone = '○'
+
+        if not self.is_move_legal_idx(stone, from_square, to_square):
+            return False
+
+        self._play_move(from_square, to_square)
+
+        return True
+
+
+    def _play_move(self, from_square, to_square):
+        """
+        Takes the squares of a legal move for the current turn. Makes the move, remembers how to take it back,
+        then updates game_state if the opponent has no ring left, otherwise the turn.
+        No return.
+        """
+        # define opponent's stone and next_turn based on the current turn
+        if self._turn == 'black':
+            opponent_stone = '○'
+            next_turn = 'white'
+        else:
+            opponent_stone = '●'
+            next_turn = 'black'
+
+        # make the move, remember how to take it back
+        from_row, from_column = divmod(from_square, 20)
+        to_row, to_column = divmod(to_square, 20)
+        self._undo_stack.append((self._state, self._turn, self._move_piece(from_row, from_column, to_row, to_column)))
 
         # check opponent's ring, if no ring then the current turn won. Update game_state
         if not self.has_ring(opponent_stone):
             self.set_game_state(self._turn) 
-            return True
+            return
             
         # game continues, update turn
         self.set_turn(next_turn)
-        
-        return True
 
 
     def is_move_legal(self, stone, from_location, to_location):
         """
-        Takes 3 parameters and check if the stone is allowed to make such move based on following rules:
+        Takes 3 parameters and check if the stone is allowed to make such move, see is_move_legal_idx() for the rules.
+        Returns False if the move is illegal, otherwise returns True.
+        """
+        # convert location from the format like 'm3' to the square of the board, with the table built once at the top of this file
+        from_square = SQUARES.get(from_location)
+        to_square = SQUARES.get(to_location)
+
+        # not a location of the board: parse it anyway so malformed input fails the way it always did
+        if from_square is None or to_square is None:
+            self._board_position(from_location)
+            self._board_position(to_location)
+            return False
+
+        return self.is_move_legal_idx(stone, from_square, to_square)
+
+
+    def is_move_legal_idx(self, stone, from_square, to_square):
+        """
+        Takes 3 parameters, the centers given as squares (board row * 20 + board column), and check if the stone is allowed
+        to make such move, see check_move_idx() for the rules.
+        Returns False if the move is illegal, otherwise returns True.
+        """
+        stats = self._stats
+        if stats is None:
+            return not self.check_move_idx(stone, from_square, to_square)
+
+        start = perf_counter()
+        result = self.check_move_idx(stone, from_square, to_square)
+        stats.count_check(result, perf_counter() - start)
+        return not result
+
+
+    def check_move(self, stone, from_location, to_location):
+        """
+        Takes 3 parameters and check if the stone is allowed to make such move, like is_move_legal(), but tells why it isn't.
+        Returns a MoveReason: MoveReason.LEGAL (which is falsy) if the move is legal, otherwise the reason it's rejected.
+        """
+        from_square = SQUARES.get(from_location)
+        to_square = SQUARES.get(to_location)
+
+        # not a location of the board: parse it anyway so malformed input fails the way is_move_legal() does
+        if from_square is None or to_square is None:
+            self._board_position(from_location)
+            self._board_position(to_location)
+            return MoveReason.OUT_OF_BOUNDS
+
+        return self.check_move_idx(stone, from_square, to_square)
+
+
+    def check_move_idx(self, stone, from_square, to_square):
+        """
+        Takes 3 parameters, the centers given as squares (board row * 20 + board column), and check if the stone is allowed
+        to make such move based on following rules:
             1) not legal if the center of the from_location or to_location is out of bound
             2) not legal if the 3x3 grid contains something else besides the right stone and empty squares
             3) not legal to move if it would leave no ring
             4) not legal to move in such direction that no stone in the corresponding spot on the piece's perimeter
+               (or in any direction but straight or 45 degree diagonal)
             5) not legal to move the over 3 squares if the piece center is empty
             6) not legal to move when there's obstructed stone in between
-            
-        Returns False if the move is illegal, otherwise returns True.
+
+        The cheapest checks go first, so most illegal moves are turned down before the board is read: the bounds and the
+        direction are arithmetic on the squares, then the 3x3 grid, one perimeter square, the center, the squares in between,
+        and last the ring, the only rule that needs the move made.
+        Returns a MoveReason: MoveReason.LEGAL if the move is legal, otherwise the first reason it's rejected, in the order
+        OUT_OF_BOUNDS, NOT_STRAIGHT, MIXED_PIECE, NO_PERIMETER_STONE, TOO_FAR, OBSTRUCTED, LEAVES_NO_RING.
         """
-        
-        # convert location from the format like 'm3' to 2 integers that repectively represents column and row of the board
-        column_range = ['b','c','d','e','f','g','h','i','j','k','l','m','n','o','p','q','r','s']
-        row_range = ['2','3','4','5','6','7','8','9','10','11','12','13','14','15','16','17','18','19']
-        column_lookup_table = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7, 'i': 8, 'j': 9, 'k': 10,
-                               'l': 11, 'm': 12, 'n': 13, 'o': 14, 'p': 15, 'q': 16, 'r': 17, 's': 18, 't': 19}
-        from_row = from_location[1:]
-        from_column = from_location[0]
-        from_location_board_row = 20 - int(from_row) 
-        from_location_board_column = column_lookup_table[from_column]  # get the corresponding column integer from the look up table
-        
-        to_row = to_location[1:]
-        to_column = to_location[0]
-        to_location_board_row = 20 - int(to_row)
-        to_location_board_column = column_lookup_table[to_column]   # get the corresponding column integer from the look up table
+        from_location_board_row, from_location_board_column = divmod(from_square, 20)
+        to_location_board_row, to_location_board_column = divmod(to_square, 20)
         
         # 1) not legal if the center of the from_location or to_location is out of bound
-        if from_column not in column_range or from_row not in row_range:
-            return False
-        if to_column not in column_range or to_row not in row_range:
-            return False
+        if not (1 <= from_location_board_row <= 18 and 1 <= from_location_board_column <= 18):
+            return MoveReason.OUT_OF_BOUNDS
+        if not (1 <= to_location_board_row <= 18 and 1 <= to_location_board_column <= 18):
+            return MoveReason.OUT_OF_BOUNDS
+
+        # 4) only straight or 45 degree diagonal moves
+        row_distance = abs(to_location_board_row - from_location_board_row)
+        column_distance = abs(to_location_board_column - from_location_board_column)
+        if row_distance and column_distance and row_distance != column_distance:
+            return MoveReason.NOT_STRAIGHT
         
         # 2) not legal if the 3x3 grid contains something else besides the right stone and empty squares
         for r in range(from_location_board_row-1, from_location_board_row+2):
             for c in range(from_location_board_column-1, from_location_board_column+2):
                 if self._board[r][c] != stone and self._board[r][c] != '':
-                    return False
-        
-        # 3) not legal to move if it would leave no ring 
-        temp_board = []  
-        for outerlist in self._board:
-            temp_board.append(list(outerlist))  # save the current board in a temporary variable      
-
-        self.move_and_capture(stone, from_location, to_location)  # make the move
-
-        # change the board back to the previous board, then return False if there would be no ring 
-        if not self.has_ring(stone):
-            self._board = []
-            for outerlist in temp_board:
-                self._board.append(list(outerlist))
-            return False
-        
-        # change the board back to the previous board
-        self._board = []
-        for outerlist in temp_board:
-            self._board.append(list(outerlist))  
+                    return MoveReason.MIXED_PIECE
         
         # 4) not legal to move in such direction that no stone in the corresponding spot on the piece's perimeter
         # 4.1) horizontally
         if from_location_board_row == to_location_board_row:
             # West
             if from_location_board_column > to_location_board_column and self._board[from_location_board_row][from_location_board_column-1] == '':
-                return False
+                return MoveReason.NO_PERIMETER_STONE
             # East  
             if from_location_board_column < to_location_board_column and self._board[from_location_board_row][from_location_board_column+1] == '':
-                return False
+                return MoveReason.NO_PERIMETER_STONE
        
         # 4.2) vertically
         if from_location_board_column == to_location_board_column:
             # North
             if from_location_board_row > to_location_board_row and self._board[from_location_board_row-1][from_location_board_column] == '':
-                return False
+                return MoveReason.NO_PERIMETER_STONE
             # South
             if from_location_board_row < to_location_board_row and self._board[from_location_board_row+1][from_location_board_column] == '':
-                return False
+                return MoveReason.NO_PERIMETER_STONE
         
         # 4.3) West-diagonally
         if from_location_board_column > to_location_board_column:
             # North-West
             if from_location_board_row > to_location_board_row:
-                # check if it's 45 degree diagnoal
-                if from_location_board_column - to_location_board_column != from_location_board_row - to_location_board_row:
-                    return False
                 if self._board[from_location_board_row-1][from_location_board_column-1] == '':
-                    return False
+                    return MoveReason.NO_PERIMETER_STONE
             # South-West
             if from_location_board_row < to_location_board_row:
-                # check if it's 45 degree diagnoal
-                if from_location_board_column - to_location_board_column != to_location_board_row - from_location_board_row:
-                    return False
                 if self._board[from_location_board_row+1][from_location_board_column-1] == '':
-                    return False
+                    return MoveReason.NO_PERIMETER_STONE
                 
         # 4.4) East-diagonally
         if from_location_board_column < to_location_board_column:
             # North-East
             if from_location_board_row > to_location_board_row:
-                # check if it's 45 degree diagnoal
-                if to_location_board_column - from_location_board_column != from_location_board_row - to_location_board_row:                    
-                    return False
                 if self._board[from_location_board_row-1][from_location_board_column+1] == '':
-                    return False
+                    return MoveReason.NO_PERIMETER_STONE
             # South-East
             if from_location_board_row < to_location_board_row:
-                # check if it's 45 degree diagnoal
-                if to_location_board_column - from_location_board_column != to_location_board_row - from_location_board_row:    
-                    return False
                 if self._board[from_location_board_row+1][from_location_board_column+1] == '':
-                    return False
+                    return MoveReason.NO_PERIMETER_STONE
 
         # 5) not legal to move over 3 squares if the piece center is empty
         if self._board[from_location_board_row][from_location_board_column] == '':  # empty center
             if abs(to_location_board_column - from_location_board_column) > 3 or abs(to_location_board_row - from_location_board_row) > 3:
-                return False
+                return MoveReason.TOO_FAR
         
         # 6) not legal to move when there's obstructed stone in between
         # 6.1) horizontally
@@ -233,13 +540,13 @@ class GessGame:
                 for r in range(from_location_board_row-1, from_location_board_row+2):
                     for c in range(to_location_board_column, from_location_board_column-1):
                         if self._board[r][c] != '':
-                            return False          
+                            return MoveReason.OBSTRUCTED          
             # East 
             if from_location_board_column < to_location_board_column:
                 for r in range(from_location_board_row-1, from_location_board_row+2):
                     for c in range(from_location_board_column+2, to_location_board_column+1):
                         if self._board[r][c] != '':
-                            return False 
+                            return MoveReason.OBSTRUCTED 
                                      
         # 6.2) vertically
         if from_location_board_column == to_location_board_column:
@@ -248,14 +555,14 @@ class GessGame:
                 for r in range(to_location_board_row, from_location_board_row-1):
                     for c in range(from_location_board_column-1, from_location_board_column+2):
                         if self._board[r][c] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                                                  
             # South
             if from_location_board_row < to_location_board_row:
                 for r in range(from_location_board_row+2, to_location_board_row+1):
                     for c in range(from_location_board_column-1, from_location_board_column+2):
                         if self._board[r][c] != '':
-                            return False              
+                            return MoveReason.OBSTRUCTED              
                     
         # 6.3) West-diagonally
         if from_location_board_column > to_location_board_column:
@@ -266,10 +573,10 @@ class GessGame:
                 while mobile_row >  to_location_board_row:
                     for r in range(mobile_row-1, mobile_row+2):
                         if self._board[r][mobile_column-1] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     for c in range(mobile_column-1, mobile_column+2):
                         if self._board[mobile_row-1][c] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     mobile_row -= 1
                     mobile_column -= 1                   
             
@@ -280,10 +587,10 @@ class GessGame:
                 while mobile_row < to_location_board_row:
                     for r in range(mobile_row-1, mobile_row+2):
                         if self._board[r][mobile_column-1] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     for c in range(mobile_column-1, mobile_column+2):
                         if self._board[mobile_row+1][c] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     mobile_row += 1
                     mobile_column -= 1
                     
@@ -296,10 +603,10 @@ class GessGame:
                 while mobile_row >  to_location_board_row:
                     for r in range(mobile_row-1, mobile_row+2):
                         if self._board[r][mobile_column+1] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     for c in range(mobile_column-1, mobile_column+2):
                         if self._board[mobile_row-1][c] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     mobile_row -= 1
                     mobile_column += 1
                     
@@ -310,14 +617,22 @@ class GessGame:
                 while mobile_row < to_location_board_row:
                     for r in range(mobile_row-1, mobile_row+2):
                         if self._board[r][mobile_column+1] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     for c in range(mobile_column-1, mobile_column+2):
                         if self._board[mobile_row+1][c] != '':
-                            return False
+                            return MoveReason.OBSTRUCTED
                     mobile_row += 1
                     mobile_column += 1
-                  
-        return True
+
+        # 3) not legal to move if it would leave no ring. Checked last because it's the only rule that needs the move made:
+        # make the move, look for a ring, then take the move back
+        undo_record = self._move_piece(from_location_board_row, from_location_board_column, to_location_board_row, to_location_board_column)
+        ring_left = self.has_ring(stone)
+        self._restore_piece(undo_record)
+        if not ring_left:
+            return MoveReason.LEAVES_NO_RING
+
+        return MoveReason.LEGAL
     
 
     def move_and_capture(self, stone, from_location, to_location):
@@ -327,57 +642,370 @@ class GessGame:
         Simply return.
         """
         # convert location from the format like 'm3' to 2 integers that repectively represents column and row of the board
-        column_lookup_table = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7, 'i': 8,
-                               'j': 9, 'k': 10, 'l': 11, 'm': 12, 'n': 13, 'o': 14, 'p': 15, 'q': 16,
-                               'r': 17, 's': 18, 't': 19}
-        
-        from_row = from_location[1:]
-        from_column = from_location[0]
-        from_location_board_row = 20 - int(from_row)
-        from_location_board_column = column_lookup_table[from_column]
-        
-        to_row = to_location[1:]
-        to_column = to_location[0]
-        to_location_board_row = 20 - int(to_row)
-        to_location_board_column = column_lookup_table[to_column]
-        
-        temp = []       # used to store the old piece
-        
-        # empty old piece
-        for r in range(from_location_board_row-1, from_location_board_row+2):
-            for c in range(from_location_board_column-1, from_location_board_column+2):
-                temp.append(self._board[r][c])  # save the each square in the temporary list
-                self._board[r][c] = ''          # empty each square
-        
-        # restore the same squares in the new piece
-        index_temp = 0 
-        for r in range(to_location_board_row-1, to_location_board_row+2):
-            for c in range(to_location_board_column-1, to_location_board_column+2):
-                self._board[r][c] = temp[index_temp]  # assign each square of the new piece with each square of the old piece
-                index_temp += 1
-         
-        # empty out of boundary
-        for i in range(20):
-            self._board[0][i] = ''   # empty row '20'
-            self._board[19][i] = ''  # empty row '1'
-            self._board[i][0] = ''   # empty column 'a'
-            self._board[i][19] = ''  # empty column 't'
-            
+        from_location_board_row, from_location_board_column = self._board_position(from_location)
+        to_location_board_row, to_location_board_column = self._board_position(to_location)
+
+        self._move_piece(from_location_board_row, from_location_board_column, to_location_board_row, to_location_board_column)
+
         return
 
 
+    def unmake_move(self):
+        """
+        Takes no parameter and takes back the last move made by make_move(), restoring the board, turn and game_state.
+        Returns False if there's no move to take back, otherwise returns True.
+        """
+        if not self._undo_stack:
+            return False
+
+        state, turn, undo_record = self._undo_stack.pop()
+        self._restore_piece(undo_record)
+        self._state = state
+        self._turn = turn
+
+        return True
+
+
+    def _board_position(self, location):
+        """
+        Takes a location in the format like 'm3' and returns 2 integers that respectively represents row and column of the board.
+        """
+        return 20 - int(location[1:]), COLUMN_NUMBERS[location[0]]
+
+
+    def _move_piece(self, from_row, from_column, to_row, to_column):
+        """
+        Takes the board rows/columns of the old and the new piece center. Empties the old piece, restores the same contents
+        in the new piece and empties whatever lands out of boundary.
+        Only the 9 squares of each piece are touched: the boundary is always empty before a move, so the new piece is the only
+        place stones can land out of boundary. The rings overlapping either piece and the hash are updated.
+        Returns an undo record for _restore_piece().
+        """
+        stats = self._stats
+        if stats is not None:
+            start = perf_counter()
+
+        board = self._board
+        keys = ZOBRIST_KEYS
+        old_hash = self._hash
+        position_hash = old_hash
+
+        # empty old piece, save each square
+        old_piece = []
+        for r in range(from_row-1, from_row+2):
+            row = board[r]
+            for c in range(from_column-1, from_column+2):
+                if row[c]:
+                    position_hash ^= keys[row[c]][r*20 + c]
+                old_piece.append(row[c])
+                row[c] = ''
+
+        # restore the same squares in the new piece, save what was there
+        old_destination = []
+        index = 0
+        for r in range(to_row-1, to_row+2):
+            row = board[r]
+            for c in range(to_column-1, to_column+2):
+                if row[c]:
+                    position_hash ^= keys[row[c]][r*20 + c]
+                old_destination.append(row[c])
+                if 1 <= r <= 18 and 1 <= c <= 18 and old_piece[index]:
+                    row[c] = old_piece[index]
+                    position_hash ^= keys[row[c]][r*20 + c]
+                else:
+                    row[c] = ''     # empty, or out of boundary
+                index += 1
+
+        ring_changes = self._update_rings(from_row, from_column, to_row, to_column)
+        self._hash = position_hash
+
+        if stats is not None:
+            stats.count('move_and_capture', perf_counter() - start)
+        return (from_row, from_column, to_row, to_column, old_piece, old_destination, ring_changes, old_hash)
+
+
+    def _restore_piece(self, undo_record):
+        """
+        Takes an undo record returned by _move_piece() and puts the 18 squares it saved, the rings and the hash back.
+        No return.
+        """
+        from_row, from_column, to_row, to_column, old_piece, old_destination, ring_changes, old_hash = undo_record
+        board = self._board
+
+        # new piece first, then the old piece, so squares shared by both pieces end up with their original contents
+        index = 0
+        for r in range(to_row-1, to_row+2):
+            row = board[r]
+            for c in range(to_column-1, to_column+2):
+                row[c] = old_destination[index]
+                index += 1
+        index = 0
+        for r in range(from_row-1, from_row+2):
+            row = board[r]
+            for c in range(from_column-1, from_column+2):
+                row[c] = old_piece[index]
+                index += 1
+
+        self._toggle_rings(ring_changes)
+        self._hash = old_hash
+
+
+    def _scan_hash(self):
+        """
+        Takes no parameter, loops through the board and returns the Zobrist hash of the board and turn.
+        """
+        position_hash = 0
+        board = self._board
+        for row in range(20):
+            for column in range(20):
+                if board[row][column]:
+                    position_hash ^= ZOBRIST_KEYS[board[row][column]][row*20 + column]
+        if self._turn == 'white':
+            position_hash ^= ZOBRIST_TURN
+        return position_hash
+
+
+    def _scan_rings(self):
+        """
+        Takes no parameter, loops through the board and returns the centers of every ring of each stone
+        as a dictionary {stone: set of (board row, board column)}.
+        """
+        rings = {'●': set(), '○': set()}
+        for row in range(1, 19):
+            for column in range(1, 19):
+                stone = self._ring_at(row, column)
+                if stone:
+                    rings[stone].add((row, column))
+        return rings
+
+
+    def _ring_at(self, row, column):
+        """
+        Takes the board row and column of a square.
+        Returns the stone of the ring centered on that square, or '' if there's no ring there.
+        """
+        board = self._board
+        stone = board[row-1][column-1]
+        if stone and board[row][column] == '' and stone == board[row-1][column] == board[row-1][column+1] \
+                == board[row][column-1] == board[row][column+1] \
+                == board[row+1][column-1] == board[row+1][column] == board[row+1][column+1]:
+            return stone
+        return ''
+
+
+    def _update_rings(self, from_row, from_column, to_row, to_column):
+        """
+        Takes the board rows/columns of the old and the new piece center of a move that was just made.
+        Only a ring that overlaps one of the two pieces can appear or disappear, so only the centers within 2 squares
+        of either piece center are looked at again.
+        Returns the list of (stone, ring center) that were added or removed, for _toggle_rings() to take back.
+        """
+        centers = [(r, c) for r in range(max(1, from_row-2), min(18, from_row+2)+1)
+                   for c in range(max(1, from_column-2), min(18, from_column+2)+1)]
+        centers += [(r, c) for r in range(max(1, to_row-2), min(18, to_row+2)+1)
+                    for c in range(max(1, to_column-2), min(18, to_column+2)+1)
+                    if abs(r - from_row) > 2 or abs(c - from_column) > 2]
+
+        ring_changes = []
+        for center in centers:
+            stone = self._ring_at(center[0], center[1])
+            for ring_stone, ring_centers in self._rings.items():
+                if (center in ring_centers) != (stone == ring_stone):
+                    ring_changes.append((ring_stone, center))
+
+        self._toggle_rings(ring_changes)
+        return ring_changes
+
+
+    def _toggle_rings(self, ring_changes):
+        """
+        Takes a list of (stone, ring center) and adds each ring that isn't tracked, removes each ring that is.
+        No return.
+        """
+        for stone, center in ring_changes:
+            ring_centers = self._rings[stone]
+            if center in ring_centers:
+                ring_centers.remove(center)
+            else:
+                ring_centers.add(center)
+
+
     def has_ring(self, stone):
         """
-        Takes stone as parameter, loops through the board to see if there is a ring for the passed stone
-        Returns True if there is at least a ring, otherwise False.
+        Takes stone as parameter and looks it up in the rings kept up to date by every move.
+        Returns True if there is at least a ring for the passed stone, otherwise False.
+        """
+        stats = self._stats
+        if stats is None:
+            return bool(self._rings.get(stone))
+
+        start = perf_counter()
+        ring = bool(self._rings.get(stone))
+        stats.count('has_ring', perf_counter() - start)
+        return ring
+
+
+    def count_stones(self, stone):
+        """
+        Takes stone as parameter and returns how many of that stone are on the board
+        """
+        return sum(row.count(stone) for row in self._board)
+
+
+    def count_rings(self, stone):
+        """
+        Takes stone as parameter and returns how many rings that stone has
+        """
+        return len(self._rings.get(stone, ()))
+
+
+    def move_captures(self, from_location, to_location):
+        """
+        Takes two parameters that respectively represents the center of the piece being moved and the center of the new piece.
+        Returns 2 integers: how many stones of the opponent (of whoever's turn it is) the new piece would remove, and how many
+        of the opponent's rings it would break. Doesn't check whether the move is legal.
+        """
+        return self.move_captures_idx(SQUARES[from_location], SQUARES[to_location])
+
+
+    def move_captures_idx(self, from_square, to_square):
+        """
+        Same as move_captures(), with the centers given as squares (board row * 20 + board column)
+        """
+        if self._turn == 'black':
+            opponent_stone = '○'
+        else:
+            opponent_stone = '●'
+
+        to_row, to_column = divmod(to_square, 20)
+
+        # every stone under the new piece is removed, so every ring the new piece overlaps is broken
+        stones = 0
+        for r in range(to_row-1, to_row+2):
+            stones += self._board[r][to_column-1:to_column+2].count(opponent_stone)
+        rings = 0
+        for ring_row, ring_column in self._rings[opponent_stone]:
+            if abs(ring_row - to_row) <= 2 and abs(ring_column - to_column) <= 2:
+                rings += 1
+
+        return stones, rings
+
+
+    def generate_legal_moves(self):
+        """
+        Takes no parameter and returns a list of every legal move for the current turn in one pass over the board.
+        Each move is a tuple (from_location, to_location) in the format make_move() takes, like ('c3', 'c6').
+        Returns an empty list if the game is finished.
+        """
+        return list(self.iter_legal_moves())
+
+
+    def iter_legal_moves(self):
+        """
+        Takes no parameter and yields the legal moves for the current turn one at a time, in the same format and order
+        as generate_legal_moves(). Useful when only the first few moves are needed.
+        Moving a piece onto its own center is not a move, so it's never yielded.
         """
-        for row in range(19):
-            for column in range(19):
-                if stone == self._board[row][column] == self._board[row][column+1] == self._board[row][column+2]:
-                    if stone == self._board[row+1][column] == self._board[row+1][column+2] and self._board[row+1][column+1] == '':
-                        if stone == self._board[row+2][column] == self._board[row+2][column+1] == self._board[row+2][column+2]:
-                            return True
-        return False
+        for from_square, to_square in self.iter_legal_moves_idx():
+            yield (LOCATIONS[from_square], LOCATIONS[to_square])
+
+
+    def generate_legal_moves_idx(self):
+        """
+        Same as generate_legal_moves(), with each move as a tuple of squares (from_square, to_square) for make_move_idx()
+        """
+        return list(self.iter_legal_moves_idx())
+
+
+    def iter_legal_moves_idx(self):
+        """
+        Same as iter_legal_moves(), with each move as a tuple of squares (from_square, to_square) for make_move_idx()
+        """
+        if self._state != 'UNFINISHED':
+            return
+
+        if self._turn == 'black':
+            stone = '●'
+        else:
+            stone = '○'
+
+        yield from self._iter_piece_moves(stone)
+
+
+    def _iter_piece_moves(self, stone):
+        """
+        Takes stone as parameter and yields every legal move of that stone as 2 integers (from square, to square),
+        where square = board row * 20 + board column.
+        Every candidate piece is checked once, then each direction allowed by its perimeter is extended until it's blocked,
+        so it gives the same answer as calling is_move_legal() on every pair of locations.
+        """
+        board = self._board
+        ring_centers = list(self._rings[stone])
+
+        for from_row in range(1, 19):
+            for from_column in range(1, 19):
+                # 2) the 3x3 grid must contain nothing besides the right stone and empty squares
+                mixed = False
+                for r in range(from_row-1, from_row+2):
+                    for c in range(from_column-1, from_column+2):
+                        if board[r][c] != stone and board[r][c] != '':
+                            mixed = True
+                if mixed:
+                    continue
+
+                # 4) the piece can only move in the directions that have a stone in the corresponding spot on its perimeter
+                directions = [(dr, dc) for dr, dc in DIRECTIONS if board[from_row+dr][from_column+dc] != '']
+                if not directions:
+                    continue
+
+                # 5) up to 3 squares if the piece center is empty, otherwise any distance
+                if board[from_row][from_column] == '':
+                    max_distance = 3
+                else:
+                    max_distance = 17
+
+                for dr, dc in directions:
+                    leading_edge = LEADING_EDGES[(dr, dc)]
+                    to_row = from_row
+                    to_column = from_column
+                    for distance in range(max_distance):
+                        to_row += dr
+                        to_column += dc
+                        # 1) the center of the new piece must be in bound
+                        if not (1 <= to_row <= 18 and 1 <= to_column <= 18):
+                            break
+
+                        # 3) the move must not leave no ring
+                        if self._keeps_ring(stone, ring_centers, from_row, from_column, to_row, to_column):
+                            yield from_row*20 + from_column, to_row*20 + to_column
+
+                        # 6) the piece can go further only if the squares it would cover next are all empty
+                        obstructed = False
+                        for r, c in leading_edge:
+                            if board[to_row+r][to_column+c] != '':
+                                obstructed = True
+                                break
+                        if obstructed:
+                            break
+
+
+    def _keeps_ring(self, stone, ring_centers, from_row, from_column, to_row, to_column):
+        """
+        Takes stone, the ring centers of that stone before the move and the board rows/columns of a move.
+        Returns True if the stone would still have a ring after the move, otherwise False.
+        """
+        # a ring that doesn't overlap either 3x3 footprint isn't touched by the move
+        for ring_row, ring_column in ring_centers:
+            if (abs(ring_row - from_row) > 2 or abs(ring_column - from_column) > 2) and \
+                    (abs(ring_row - to_row) > 2 or abs(ring_column - to_column) > 2):
+                return True
+
+        # otherwise make the move, look for a ring and take the move back
+        undo_record = self._move_piece(from_row, from_column, to_row, to_column)
+        result = self.has_ring(stone)
+        self._restore_piece(undo_record)
+
+        return result
 
 
     def get_game_state(self):
@@ -385,7 +1013,80 @@ class GessGame:
         Takes no parameter and returns a GessGame object's game_state
         """
         return self._state
-    
+
+
+    def get_board(self):
+        """
+        Takes no parameter and returns a copy of the board as a 20x20 nested list of '●', '○' and ''.
+        Changing the copy doesn't change the game.
+        """
+        return [list(row) for row in self._board]
+
+
+    def to_bytes(self):
+        """
+        Takes no parameter and returns the board, turn and game state as POSITION_BYTES bytes, see encode_position()
+        """
+        return encode_position(*self._get_area(), self._turn, self._state)
+
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Takes the bytes returned by to_bytes() and returns a new game with that position and no moves to take back.
+        Raises ValueError if data isn't a valid position.
+        """
+        game = cls.__new__(cls)
+        game._set_area(*decode_position(data))
+        return game
+
+
+    def to_fen(self):
+        """
+        Takes no parameter and returns the board, turn and game state as a FEN-like string, see encode_fen()
+        """
+        return encode_fen(*self._get_area(), self._turn, self._state)
+
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Takes the string returned by to_fen() and returns a new game with that position and no moves to take back.
+        Raises ValueError if fen isn't a valid position.
+        """
+        game = cls.__new__(cls)
+        game._set_area(*decode_fen(fen))
+        return game
+
+
+    def _get_area(self):
+        """
+        Takes no parameter and returns the 2 area masks (black, white) of the board
+        """
+        board = self._board
+        return digits_to_area(''.join(map(CELL_DIGITS.__getitem__, chain.from_iterable([row[1:19] for row in board[1:19]]))))
+
+
+    def _set_area(self, black, white, turn, state):
+        """
+        Takes the 2 area masks, the turn and the game state and puts that position on the board, dropping the moves to take back.
+        No return.
+        """
+        # the rings and the hash come from the board masks, the board from one digit per square of the 20x20 board
+        black = area_to_mask(black)
+        white = area_to_mask(white)
+        digits = str(int(format(black, '0400b')) + 2 * int(format(white, '0400b'))).zfill(400)[::-1]
+        cells = list(map(DIGIT_STONES.__getitem__, digits))
+        self._board = [cells[start:start+20] for start in range(0, 400, 20)]
+        self._turn = turn
+        self._state = state
+        self._undo_stack = []
+        occupied = black | white
+        self._rings = {'●': mask_centers(ring_centers_mask(black, occupied)), '○': mask_centers(ring_centers_mask(white, occupied))}
+        self._hash = mask_hash(black, ZOBRIST_KEYS['●']) ^ mask_hash(white, ZOBRIST_KEYS['○'])
+        if turn == 'white':
+            self._hash ^= ZOBRIST_TURN
+
 
     def resign_game(self):
         """ 
@@ -422,12 +1123,53 @@ class GessGame:
 
     def set_turn(self, new_turn):
         """
-        Takes a parameter turn and makes it the GessGame object's self._turn.
+        Takes a parameter turn and makes it the GessGame object's self._turn, updating the hash.
         No return.
         """
+        if (new_turn == 'white') != (self._turn == 'white'):
+            self._hash ^= ZOBRIST_TURN
         self._turn = new_turn
   
 
+    def enable_stats(self, stats=None):
+        """
+        Takes an optional GameStats to count into (one can be shared by many games, default: a new one).
+        Starts counting calls, results and time of is_move_legal(), the piece move and has_ring() for this game.
+        Games that never call it run without any counting. Returns the GameStats.
+        """
+        if stats is None:
+            from game_stats import GameStats
+            stats = GameStats()
+        self._stats = stats
+        return stats
+
+
+    def disable_stats(self):
+        """
+        Takes no parameter and stops counting for this game.
+        No return.
+        """
+        self._stats = None
+
+
+    def get_stats(self):
+        """
+        Takes no parameter and returns a snapshot of the counters as a dictionary (see GameStats.snapshot()),
+        or None if enable_stats() wasn't called
+        """
+        if self._stats is None:
+            return None
+        return self._stats.snapshot()
+
+
+    def get_hash(self):
+        """
+        Takes no parameter and returns the 64-bit Zobrist hash of the board and whose turn it is.
+        Two positions with the same stones and the same turn always have the same hash, in any process.
+        """
+        return self._hash
+
+
     def get_turn(self):
         """
         Takes no parameter and returns whose turn it currently is
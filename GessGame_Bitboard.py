@@ -0,0 +1,474 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: A bitboard engine core for Gess. Each colour is kept as a 400-bit integer, one bit per square of the 20x20 board
+# (bit index = board row * 20 + board column), so footprint clearing, obstruction sweeps, border clearing and ring detection become
+# shifts and ANDs instead of cell-by-cell string comparisons.
+# The class GessGame_Bitboard inherits GessGame and keeps all of its public methods. The nested list self._board is still available
+# (built from the two masks when it's read), so print_board() and anything else that reads the board behaves exactly the same.
+
+
+from time import perf_counter
+
+from GessGame import (GessGame, MoveReason, DIRECTIONS, LEADING_EDGES, ZOBRIST_KEYS, ZOBRIST_TURN, INTERIOR, ring_centers_mask,
+                      mask_hash, mask_to_area, area_to_mask)
+
+
+def square_mask(squares):
+    """
+    Takes an iterable of (board row, board column) and returns the mask with those squares set
+    """
+    mask = 0
+    for row, column in squares:
+        mask |= 1 << (row*20 + column)
+    return mask
+
+
+# the squares a piece can be centered on, in the same order GessGame walks them
+CENTERS = tuple(row*20 + column for row in range(1, 19) for column in range(1, 19))
+
+# the leading edge of a piece moving in each direction, centered on square 21 (row 1, column 1): shifting it by square - 21 gives
+# the leading edge of a piece centered on any square of the playable area
+_EDGES = {direction: square_mask((1 + r, 1 + c) for r, c in edge) for direction, edge in LEADING_EDGES.items()}
+
+def _ray_table(square):
+    """
+    Takes a center square and returns its entry of RAYS
+    """
+    row, column = divmod(square, 20)
+    rays = []
+    for dr, dc in DIRECTIONS:
+        steps = []
+        edge = _EDGES[(dr, dc)]
+        to_row = row + dr
+        to_column = column + dc
+        while 1 <= to_row <= 18 and 1 <= to_column <= 18:
+            steps.append((to_row*20 + to_column, edge << (to_row*20 + to_column - 21)))
+            to_row += dr
+            to_column += dc
+        rays.append(((row + dr)*20 + column + dc, tuple(steps)))
+    return tuple(rays)
+
+
+# the 3x3 footprint of a piece centered on each square
+FOOTPRINTS = [square_mask((square//20 + r, square%20 + c) for r in (-1, 0, 1) for c in (-1, 0, 1)) if square in CENTERS else 0
+              for square in range(400)]
+
+# the 5x5 block around each square: the centers of every ring that overlaps the footprint centered on that square
+NEIGHBORHOODS = [square_mask((square//20 + r, square%20 + c) for r in (-2, -1, 0, 1, 2) for c in (-2, -1, 0, 1, 2)
+                             if 0 <= square//20 + r <= 19 and 0 <= square%20 + c <= 19) if square in CENTERS else 0
+                 for square in range(400)]
+
+# for each center, one entry per direction in DIRECTIONS: (perimeter square, ray). The ray is a tuple of (to_square, leading edge)
+# for 1, 2, 3... squares in that direction while the new center stays in bound. The piece can only go past a step when the
+# leading edge of that step is empty.
+RAYS = [_ray_table(square) if square in CENTERS else None for square in range(400)]
+
+# the complement of each neighborhood inside the playable area: rings left untouched by a piece centered on that square
+OUTSIDE_NEIGHBORHOODS = [INTERIOR & ~neighborhood for neighborhood in NEIGHBORHOODS]
+
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+
+# a piece read as a 9-bit pattern (bit 3 * (r+1) + (c+1) for the square at (r, c) from the center) -> the indices
+# in DIRECTIONS that have a stone on the corresponding spot of the perimeter
+PATTERN_DIRECTIONS = tuple(tuple(index for index, (dr, dc) in enumerate(DIRECTIONS) if pattern >> (3*(dr + 1) + dc + 1) & 1)
+                           for pattern in range(512))
+
+
+def dilate_mask(mask):
+    """
+    Takes a mask and returns it grown by one square in every direction: the centers of every footprint that overlaps the mask
+    """
+    mask |= (mask << 1) | (mask >> 1)
+    return mask | (mask << 20) | (mask >> 20)
+
+
+def shift_mask(mask, delta):
+    """
+    Takes a mask and a signed square offset and returns the mask moved by that many squares
+    """
+    if delta >= 0:
+        return mask << delta
+    return mask >> -delta
+
+
+def mask_move_rule(own, other, from_square, to_square, stats=None):
+    """
+    Takes the mask of the stone moving, the mask of every other stone, the squares of the old and the new piece center and
+    optionally a GameStats to count the piece move and the ring lookup of the ring rule into (see game_stats.py).
+    Returns MoveReason.LEGAL if the move is legal, otherwise the first reason it's rejected, like GessGame.check_move_idx().
+    """
+    from_row, from_column = divmod(from_square, 20)
+    to_row, to_column = divmod(to_square, 20)
+
+    # 1) not legal if the center of the from_location or to_location is out of bound
+    if not (1 <= from_row <= 18 and 1 <= from_column <= 18 and 1 <= to_row <= 18 and 1 <= to_column <= 18):
+        return MoveReason.OUT_OF_BOUNDS
+
+    # 4) only straight or 45 degree diagonal moves
+    row_distance = to_row - from_row
+    column_distance = to_column - from_column
+    if row_distance and column_distance and abs(row_distance) != abs(column_distance):
+        return MoveReason.NOT_STRAIGHT
+
+    # 2) not legal if the 3x3 grid contains something else besides the right stone and empty squares
+    if other & FOOTPRINTS[from_square]:
+        return MoveReason.MIXED_PIECE
+
+    distance = max(abs(row_distance), abs(column_distance))
+    if distance:
+        # 4) in a direction with a stone on the piece's perimeter
+        direction = (row_distance // distance, column_distance // distance)
+        perimeter_square, ray = RAYS[from_square][DIRECTION_INDEX[direction]]
+        if not (own >> perimeter_square) & 1:
+            return MoveReason.NO_PERIMETER_STONE
+
+        # 5) not legal to move over 3 squares if the piece center is empty
+        if not (own >> from_square) & 1 and distance > 3:
+            return MoveReason.TOO_FAR
+
+        # 6) not legal to move when there's obstructed stone in between
+        occupied = own | other
+        for step in range(distance - 1):
+            if ray[step][1] & occupied:
+                return MoveReason.OBSTRUCTED
+
+    # 3) not legal to move if it would leave no ring
+    if stats is not None:
+        start = perf_counter()
+    footprint = FOOTPRINTS[from_square]
+    to_footprint = FOOTPRINTS[to_square]
+    new_own = (own & ~footprint & ~to_footprint) | (shift_mask(own & footprint, to_square - from_square) & INTERIOR)
+    new_other = other & ~to_footprint
+    if stats is not None:
+        moved = perf_counter()
+        stats.count('move_and_capture', moved - start)
+    ring = ring_centers_mask(new_own, new_own | new_other)
+    if stats is not None:
+        stats.count('has_ring', perf_counter() - moved)
+    if not ring:
+        return MoveReason.LEAVES_NO_RING
+
+    return MoveReason.LEGAL
+
+
+def mask_piece_moves(own, other, rings):
+    """
+    Takes the mask of the stone moving, the mask of every other stone and the mask of the moving stone's ring centers.
+    Yields every legal move of that stone as 2 integers (from square, to square), in the same order as GessGame.
+    """
+    occupied = own | other
+
+    # 2) only the centers whose 3x3 grid holds the right stone and nothing else
+    candidates = dilate_mask(own) & ~dilate_mask(other) & INTERIOR
+
+    while candidates:
+        lowest = candidates & -candidates
+        candidates ^= lowest
+        from_square = lowest.bit_length() - 1
+
+        # read the piece as a 9-bit pattern, one row of 3 squares at a time
+        window = own >> (from_square - 21)
+        pattern = (window & 7) | ((window >> 17) & 56) | ((window >> 34) & 448)
+
+        # 4) the piece can only move in the directions that have a stone in the corresponding spot on its perimeter
+        directions = PATTERN_DIRECTIONS[pattern]
+        if not directions:
+            continue
+
+        # 5) up to 3 squares if the piece center is empty, otherwise any distance
+        if pattern & 16:
+            max_distance = 17
+        else:
+            max_distance = 3
+
+        footprint = FOOTPRINTS[from_square]
+        piece = own & footprint
+        own_left = own & ~footprint
+        rings_left = rings & OUTSIDE_NEIGHBORHOODS[from_square]   # rings the piece doesn't touch when it leaves
+        rays = RAYS[from_square]
+
+        for direction in directions:
+            for to_square, leading_edge in rays[direction][1][:max_distance]:
+                # 3) the move must not leave no ring: either a ring isn't touched, or the new board has one
+                if rings_left & OUTSIDE_NEIGHBORHOODS[to_square]:
+                    yield from_square, to_square
+                else:
+                    to_footprint = FOOTPRINTS[to_square]
+                    new_own = (own_left & ~to_footprint) | (shift_mask(piece, to_square - from_square) & INTERIOR)
+                    if ring_centers_mask(new_own, new_own | (other & ~to_footprint)):
+                        yield from_square, to_square
+
+                # 6) the piece can go further only if the squares it would cover next are all empty
+                if leading_edge & occupied:
+                    break
+
+
+def mask_move(black, white, from_square, to_square):
+    """
+    Takes the two masks and the squares of the old and the new piece center. Moves the contents of the old piece onto the new piece,
+    removing whatever was under the new piece and whatever lands out of boundary.
+    Returns the two new masks (black, white).
+    """
+    footprint = FOOTPRINTS[from_square]
+    to_footprint = FOOTPRINTS[to_square]
+    delta = to_square - from_square
+    return ((black & ~footprint & ~to_footprint) | (shift_mask(black & footprint, delta) & INTERIOR),
+            (white & ~footprint & ~to_footprint) | (shift_mask(white & footprint, delta) & INTERIOR))
+
+
+class GessGame_Bitboard(GessGame):
+    """
+    Inherit from class GessGame
+
+    Same public methods as GessGame, on top of 2 masks (self._black and self._white) instead of the nested list.
+    Reading self._board builds the nested list from the masks and assigning it sets the masks, so methods that only read
+    the board (like print_board()) are inherited unchanged.
+
+    self._rings holds one mask of ring centers per stone, so has_ring() is inherited as a lookup.
+
+    3 extra methods move positions between processes cheaply:
+        1) get_position()
+        2) from_position(position) (class method)
+        3) from_game(game) (class method)
+
+    Totally 14 methods are overridden:
+        1) __init__()
+        2) is_move_legal_idx(stone, from_square, to_square)
+        3) check_move_idx(stone, from_square, to_square)
+        4) count_stones(stone)
+        5) count_rings(stone)
+        6) move_captures_idx(from_square, to_square)
+        7) _scan_hash()
+        8) _scan_rings()
+        9) _iter_piece_moves(stone)
+        10) _move_piece(from_row, from_column, to_row, to_column)
+        11) _restore_piece(undo_record)
+        12) _board (property)
+        13) _get_area()
+        14) _set_area(black, white, turn, state)
+    """
+    def __init__(self):
+        """
+        Takes no parameters and initializes a GessGame_Bitboard object with the same initial board as GessGame
+        """
+        self._black = 0
+        self._white = 0
+        super().__init__()
+
+
+    @property
+    def _board(self):
+        """
+        Builds and returns the 20x20 nested list of the board from the masks.
+        """
+        black = self._black
+        white = self._white
+        board = []
+        for row in range(20):
+            squares = []
+            for column in range(20):
+                bit = 1 << (row*20 + column)
+                if black & bit:
+                    squares.append('●')
+                elif white & bit:
+                    squares.append('○')
+                else:
+                    squares.append('')
+            board.append(squares)
+        return board
+
+
+    @_board.setter
+    def _board(self, board):
+        """
+        Takes a 20x20 nested list of the board and sets the masks, the rings and the hash from it.
+        """
+        black = 0
+        white = 0
+        for row in range(20):
+            for column in range(20):
+                if board[row][column] == '●':
+                    black |= 1 << (row*20 + column)
+                elif board[row][column] == '○':
+                    white |= 1 << (row*20 + column)
+        self._black = black
+        self._white = white
+        self._rings = self._scan_rings()
+        self._hash = self._scan_hash()
+
+
+    def get_position(self):
+        """
+        Takes no parameter and returns the position as a compact tuple (black mask, white mask, turn, game_state),
+        small and quick to pickle when sending it to another process.
+        """
+        return (self._black, self._white, self._turn, self._state)
+
+
+    @classmethod
+    def from_position(cls, position):
+        """
+        Takes a tuple returned by get_position() and returns a new GessGame_Bitboard object with that position.
+        The new game has no moves to take back.
+        """
+        game = cls.__new__(cls)
+        game._black, game._white, game._turn, game._state = position
+        game._undo_stack = []
+        game._rings = game._scan_rings()
+        game._hash = game._scan_hash()
+        return game
+
+
+    @classmethod
+    def from_game(cls, game):
+        """
+        Takes any GessGame object and returns a new GessGame_Bitboard object with the same board, turn and game_state.
+        """
+        return cls.from_bytes(game.to_bytes())
+
+
+    def _get_area(self):
+        """
+        Takes no parameter and returns the 2 area masks (black, white) of the board, see GessGame.encode_position()
+        """
+        return mask_to_area(self._black), mask_to_area(self._white)
+
+
+    def _set_area(self, black, white, turn, state):
+        """
+        Takes the 2 area masks, the turn and the game state and puts that position on the board, dropping the moves to take back.
+        No return.
+        """
+        self._black = area_to_mask(black)
+        self._white = area_to_mask(white)
+        self._turn = turn
+        self._state = state
+        self._undo_stack = []
+        self._rings = self._scan_rings()
+        self._hash = self._scan_hash()
+
+
+    def _stone_masks(self, stone):
+        """
+        Takes stone as parameter and returns 2 masks: the squares holding that stone and the squares holding anything else.
+        """
+        if stone == '●':
+            return self._black, self._white
+        if stone == '○':
+            return self._white, self._black
+        return 0, self._black | self._white
+
+
+    def is_move_legal_idx(self, stone, from_square, to_square):
+        """
+        Takes 3 parameters, the centers given as squares, and check if the stone is allowed to make such move, with the same
+        rules as GessGame.is_move_legal_idx().
+        Returns False if the move is illegal, otherwise returns True.
+        """
+        own, other = self._stone_masks(stone)
+        stats = self._stats
+        if stats is None:
+            return not mask_move_rule(own, other, from_square, to_square)
+
+        start = perf_counter()
+        result = mask_move_rule(own, other, from_square, to_square, stats)
+        stats.count_check(result, perf_counter() - start)
+        return not result
+
+
+    def check_move_idx(self, stone, from_square, to_square):
+        """
+        Takes 3 parameters, the centers given as squares. Returns MoveReason.LEGAL if the move is legal, otherwise the first
+        reason it's rejected, like GessGame.check_move_idx().
+        """
+        own, other = self._stone_masks(stone)
+        return mask_move_rule(own, other, from_square, to_square)
+
+
+    def count_stones(self, stone):
+        """
+        Takes stone as parameter and returns how many of that stone are on the board
+        """
+        return self._stone_masks(stone)[0].bit_count()
+
+
+    def count_rings(self, stone):
+        """
+        Takes stone as parameter and returns how many rings that stone has
+        """
+        return self._rings.get(stone, 0).bit_count()
+
+
+    def move_captures_idx(self, from_square, to_square):
+        """
+        Takes the squares of the center of the piece being moved and the center of the new piece.
+        Returns 2 integers: how many stones of the opponent the new piece would remove, and how many of the opponent's rings
+        it would break. Doesn't check whether the move is legal.
+        """
+        if self._turn == 'black':
+            opponent_stone = '○'
+        else:
+            opponent_stone = '●'
+
+        stones = (self._stone_masks(opponent_stone)[0] & FOOTPRINTS[to_square]).bit_count()
+        rings = (self._rings[opponent_stone] & NEIGHBORHOODS[to_square]).bit_count()
+
+        return stones, rings
+
+
+    def _scan_hash(self):
+        """
+        Takes no parameter and returns the Zobrist hash of the board and turn, from the masks.
+        """
+        position_hash = mask_hash(self._black, ZOBRIST_KEYS['●']) ^ mask_hash(self._white, ZOBRIST_KEYS['○'])
+        if self._turn == 'white':
+            position_hash ^= ZOBRIST_TURN
+        return position_hash
+
+
+    def _scan_rings(self):
+        """
+        Takes no parameter and returns the mask of ring centers of each stone as a dictionary {stone: mask}.
+        """
+        occupied = self._black | self._white
+        return {'●': ring_centers_mask(self._black, occupied), '○': ring_centers_mask(self._white, occupied)}
+
+
+    def _iter_piece_moves(self, stone):
+        """
+        Takes stone as parameter and yields every legal move of that stone as 2 integers (from square, to square),
+        in the same order as GessGame.
+        """
+        own, other = self._stone_masks(stone)
+        return mask_piece_moves(own, other, self._rings[stone])
+
+
+    def _move_piece(self, from_row, from_column, to_row, to_column):
+        """
+        Takes the board rows/columns of the old and the new piece center. Moves the contents of the old piece onto the new piece,
+        removing whatever was under the new piece and whatever lands out of boundary.
+        Returns the undo record for _restore_piece(), which is simply the two masks, the rings and the hash before the move.
+        """
+        stats = self._stats
+        if stats is not None:
+            start = perf_counter()
+
+        black = self._black
+        white = self._white
+        undo_record = (black, white, self._rings, self._hash)
+
+        self._black, self._white = mask_move(black, white, from_row*20 + from_column, to_row*20 + to_column)
+        self._rings = self._scan_rings()
+        self._hash ^= mask_hash(black ^ self._black, ZOBRIST_KEYS['●']) ^ mask_hash(white ^ self._white, ZOBRIST_KEYS['○'])
+
+        if stats is not None:
+            stats.count('move_and_capture', perf_counter() - start)
+        return undo_record
+
+
+    def _restore_piece(self, undo_record):
+        """
+        Takes an undo record returned by _move_piece() and puts the two masks, the rings and the hash back.
+        No return.
+        """
+        self._black, self._white, self._rings, self._hash = undo_record
@@ -0,0 +1,552 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: A low-memory Gess game for keeping very many games in one process. The whole position is one 102-byte bytearray:
+# the black and the white mask of GessGame_Bitboard (50 bytes each, little-endian), whose turn it is and the game state.
+# The class has __slots__ and keeps no other cache than the Zobrist hash, updated by every move like GessGame's (rings are worked
+# out from the masks when asked for), so an idle game is one small object plus its buffer, and copy()/snapshot() copy that single
+# buffer. The rules are the mask functions of
+# GessGame_Bitboard, so the moves are exactly those of GessGame. The list of moves to take back is only created by the first move.
+#
+# Usage:
+#   game = GessGame_Compact()
+#   game.make_move('c3', 'c6')
+#   saved = game.snapshot()                      # 102 bytes
+#   game = GessGame_Compact.from_snapshot(saved)
+
+
+from time import perf_counter
+
+from GessGame import (MoveReason, SQUARES, LOCATIONS, COLUMN_NUMBERS, ZOBRIST_KEYS, ZOBRIST_TURN, encode_position, decode_position,
+                      encode_fen, decode_fen, ring_centers_mask, mask_hash, mask_to_area, area_to_mask)
+from GessGame_Bitboard import GessGame_Bitboard, FOOTPRINTS, NEIGHBORHOODS, mask_move, mask_move_rule, mask_piece_moves
+
+
+# layout of the buffer
+MASK_BYTES = 50
+TURN_BYTE = 100
+STATE_BYTE = 101
+BUFFER_SIZE = 102
+
+# values of the turn and state bytes, and the stone of each turn
+TURNS = ('black', 'white')
+STATES = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+STONES = ('●', '○')
+
+
+def position_buffer(black, white, turn, state):
+    """
+    Takes the two masks, the turn and the game state and returns the position as a buffer of BUFFER_SIZE bytes
+    """
+    return (black.to_bytes(MASK_BYTES, 'little') + white.to_bytes(MASK_BYTES, 'little')
+            + bytes((TURNS.index(turn), STATES.index(state))))
+
+
+def buffer_hash(buffer):
+    """
+    Takes a position buffer and returns the Zobrist hash of its position, the same as GessGame.get_hash()
+    """
+    position_hash = (mask_hash(int.from_bytes(buffer[:MASK_BYTES], 'little'), ZOBRIST_KEYS['●'])
+                     ^ mask_hash(int.from_bytes(buffer[MASK_BYTES:TURN_BYTE], 'little'), ZOBRIST_KEYS['○']))
+    if buffer[TURN_BYTE]:
+        position_hash ^= ZOBRIST_TURN
+    return position_hash
+
+
+INITIAL_BUFFER = position_buffer(*GessGame_Bitboard().get_position())
+INITIAL_HASH = buffer_hash(INITIAL_BUFFER)
+
+
+class GessGame_Compact:
+    """
+    Represents a GessGame in as little memory as possible, with the same public methods as GessGame.
+
+    4 extra methods copy and move positions cheaply:
+        1) copy()
+        2) snapshot()
+        3) from_snapshot(snapshot) (class method)
+        4) from_game(game) (class method)
+    and get_position() returns the same tuple as GessGame_Bitboard.get_position(). to_bytes()/from_bytes() and to_fen()/from_fen()
+    save and load positions in the same forms as GessGame, and enable_stats()/disable_stats()/get_stats() count the legality
+    pipeline like GessGame's (see game_stats.py).
+    """
+    __slots__ = ('_buffer', '_hash', '_undo_stack', '_stats')
+
+    def __init__(self):
+        """
+        Takes no parameters and initializes a game with the same initial board as GessGame
+        """
+        self._buffer = bytearray(INITIAL_BUFFER)
+        self._hash = INITIAL_HASH   # updated by every change to the buffer, see get_hash()
+        self._undo_stack = None     # created by the first move
+        self._stats = None          # the GameStats counting for this game, set by enable_stats()
+
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Takes the bytes returned by snapshot() and returns a new GessGame_Compact object with that position.
+        The new game has no moves to take back.
+        """
+        if len(snapshot) != BUFFER_SIZE:
+            raise ValueError(f'a snapshot is {BUFFER_SIZE} bytes, not {len(snapshot)}')
+        game = cls.__new__(cls)
+        game._buffer = bytearray(snapshot)
+        game._hash = buffer_hash(snapshot)
+        game._undo_stack = None
+        game._stats = None
+        return game
+
+
+    @classmethod
+    def from_game(cls, game):
+        """
+        Takes any GessGame object and returns a new GessGame_Compact object with the same board, turn and game_state.
+        """
+        black = 0
+        white = 0
+        for row, squares in enumerate(game.get_board()):
+            for column, square in enumerate(squares):
+                if square == '●':
+                    black |= 1 << (row*20 + column)
+                elif square == '○':
+                    white |= 1 << (row*20 + column)
+        return cls.from_snapshot(position_buffer(black, white, game.get_turn(), game.get_game_state()))
+
+
+    def snapshot(self):
+        """
+        Takes no parameter and returns the position as BUFFER_SIZE immutable bytes
+        """
+        return bytes(self._buffer)
+
+
+    def copy(self):
+        """
+        Takes no parameter and returns a new GessGame_Compact object with the same position and no moves to take back
+        """
+        game = GessGame_Compact.__new__(GessGame_Compact)
+        game._buffer = bytearray(self._buffer)
+        game._hash = self._hash
+        game._undo_stack = None
+        game._stats = None
+        return game
+
+
+    def to_bytes(self):
+        """
+        Takes no parameter and returns the position as bytes, like GessGame.to_bytes()
+        """
+        black, white = self._masks()
+        return encode_position(mask_to_area(black), mask_to_area(white), self.get_turn(), self.get_game_state())
+
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Takes the bytes returned by to_bytes() and returns a new GessGame_Compact object with that position
+        """
+        black, white, turn, state = decode_position(data)
+        return cls.from_snapshot(position_buffer(area_to_mask(black), area_to_mask(white), turn, state))
+
+
+    def to_fen(self):
+        """
+        Takes no parameter and returns the position as a FEN-like string, like GessGame.to_fen()
+        """
+        black, white = self._masks()
+        return encode_fen(mask_to_area(black), mask_to_area(white), self.get_turn(), self.get_game_state())
+
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Takes the string returned by to_fen() and returns a new GessGame_Compact object with that position
+        """
+        black, white, turn, state = decode_fen(fen)
+        return cls.from_snapshot(position_buffer(area_to_mask(black), area_to_mask(white), turn, state))
+
+
+    def get_position(self):
+        """
+        Takes no parameter and returns the position as the tuple (black mask, white mask, turn, game_state)
+        that GessGame_Bitboard.from_position() takes
+        """
+        black, white = self._masks()
+        return (black, white, self.get_turn(), self.get_game_state())
+
+
+    def _masks(self):
+        """
+        Takes no parameter and returns the black and the white mask read from the buffer
+        """
+        buffer = self._buffer
+        return int.from_bytes(buffer[:MASK_BYTES], 'little'), int.from_bytes(buffer[MASK_BYTES:TURN_BYTE], 'little')
+
+
+    def _stone_masks(self, stone):
+        """
+        Takes stone as parameter and returns 2 masks: the squares holding that stone and the squares holding anything else.
+        """
+        black, white = self._masks()
+        if stone == '●':
+            return black, white
+        if stone == '○':
+            return white, black
+        return 0, black | white
+
+
+    def _move_piece(self, from_square, to_square):
+        """
+        Takes the squares of the old and the new piece center and moves the piece in the buffer, removing whatever was under
+        the new piece and whatever lands out of boundary, and updates the hash. Returns the two new masks.
+        """
+        stats = self._stats
+        if stats is not None:
+            start = perf_counter()
+
+        old_black, old_white = self._masks()
+        black, white = mask_move(old_black, old_white, from_square, to_square)
+        self._buffer[:TURN_BYTE] = black.to_bytes(MASK_BYTES, 'little') + white.to_bytes(MASK_BYTES, 'little')
+        # only the squares of the two footprints change
+        self._hash ^= mask_hash(old_black ^ black, ZOBRIST_KEYS['●']) ^ mask_hash(old_white ^ white, ZOBRIST_KEYS['○'])
+
+        if stats is not None:
+            stats.count('move_and_capture', perf_counter() - start)
+        return black, white
+
+
+    def _board_position(self, location):
+        """
+        Takes a location in the format like 'm3' and returns 2 integers that respectively represents row and column of the board.
+        """
+        return 20 - int(location[1:]), COLUMN_NUMBERS[location[0]]
+
+
+    def make_move(self, from_location, to_location):
+        """
+        Takes the center of the piece being moved and the center of the new piece, like GessGame.make_move().
+        Returns True if the move was made, False if it's illegal or the game is finished.
+        """
+        if self._buffer[STATE_BYTE]:
+            return False
+        if not self.is_move_legal(STONES[self._buffer[TURN_BYTE]], from_location, to_location):
+            return False
+        self._play_move(SQUARES[from_location], SQUARES[to_location])
+        return True
+
+
+    def make_move_idx(self, from_square, to_square):
+        """
+        Same as make_move(), with the centers given as squares (board row * 20 + board column)
+        """
+        if self._buffer[STATE_BYTE]:
+            return False
+        if not self.is_move_legal_idx(STONES[self._buffer[TURN_BYTE]], from_square, to_square):
+            return False
+        self._play_move(from_square, to_square)
+        return True
+
+
+    def _play_move(self, from_square, to_square):
+        """
+        Takes the squares of a legal move for the current turn. Makes the move, remembers how to take it back,
+        then updates game_state if the opponent has no ring left, otherwise the turn.
+        No return.
+        """
+        if self._undo_stack is None:
+            self._undo_stack = []
+        self._undo_stack.append((bytes(self._buffer), self._hash))
+
+        black, white = self._move_piece(from_square, to_square)
+        turn = self._buffer[TURN_BYTE]
+        if turn == 0:
+            opponent = white
+        else:
+            opponent = black
+
+        # the player to move won if the opponent has no ring left, otherwise the game continues
+        stats = self._stats
+        if stats is None:
+            ring = ring_centers_mask(opponent, black | white)
+        else:
+            start = perf_counter()
+            ring = ring_centers_mask(opponent, black | white)
+            stats.count('has_ring', perf_counter() - start)
+        if not ring:
+            self._buffer[STATE_BYTE] = 1 + turn
+        else:
+            self._buffer[TURN_BYTE] = 1 - turn
+            self._hash ^= ZOBRIST_TURN
+
+
+    def is_move_legal(self, stone, from_location, to_location):
+        """
+        Takes 3 parameters and check if the stone is allowed to make such move, with the same rules as GessGame.is_move_legal().
+        Returns False if the move is illegal, otherwise returns True.
+        """
+        from_square = SQUARES.get(from_location)
+        to_square = SQUARES.get(to_location)
+
+        # not a location of the board: parse it anyway so malformed input fails the way GessGame does
+        if from_square is None or to_square is None:
+            self._board_position(from_location)
+            self._board_position(to_location)
+            return False
+
+        return self.is_move_legal_idx(stone, from_square, to_square)
+
+
+    def is_move_legal_idx(self, stone, from_square, to_square):
+        """
+        Same as is_move_legal(), with the centers given as squares (board row * 20 + board column)
+        """
+        own, other = self._stone_masks(stone)
+        stats = self._stats
+        if stats is None:
+            return not mask_move_rule(own, other, from_square, to_square)
+
+        start = perf_counter()
+        result = mask_move_rule(own, other, from_square, to_square, stats)
+        stats.count_check(result, perf_counter() - start)
+        return not result
+
+
+    def check_move(self, stone, from_location, to_location):
+        """
+        Takes 3 parameters and returns why the stone isn't allowed to make such move, like GessGame.check_move()
+        """
+        from_square = SQUARES.get(from_location)
+        to_square = SQUARES.get(to_location)
+        if from_square is None or to_square is None:
+            self._board_position(from_location)
+            self._board_position(to_location)
+            return MoveReason.OUT_OF_BOUNDS
+
+        return self.check_move_idx(stone, from_square, to_square)
+
+
+    def check_move_idx(self, stone, from_square, to_square):
+        """
+        Same as check_move(), with the centers given as squares (board row * 20 + board column)
+        """
+        own, other = self._stone_masks(stone)
+        return mask_move_rule(own, other, from_square, to_square)
+
+
+    def move_and_capture(self, stone, from_location, to_location):
+        """
+        Takes 3 parameters (stone, from_location, to_location), empties the old piece and restores the same contents in the new
+        piece. Empties out-of-boundary squares.
+        Simply return.
+        """
+        from_row, from_column = self._board_position(from_location)
+        to_row, to_column = self._board_position(to_location)
+        self._move_piece(from_row*20 + from_column, to_row*20 + to_column)
+
+
+    def unmake_move(self):
+        """
+        Takes no parameter and takes back the last move made by make_move(), restoring the board, turn and game_state.
+        Returns False if there's no move to take back, otherwise returns True.
+        """
+        if not self._undo_stack:
+            return False
+        self._buffer[:], self._hash = self._undo_stack.pop()
+        return True
+
+
+    def has_ring(self, stone):
+        """
+        Takes stone as parameter and returns True if there is at least a ring for the passed stone, otherwise False.
+        """
+        stats = self._stats
+        if stats is not None:
+            start = perf_counter()
+
+        own, other = self._stone_masks(stone)
+        ring = bool(ring_centers_mask(own, own | other))
+
+        if stats is not None:
+            stats.count('has_ring', perf_counter() - start)
+        return ring
+
+
+    def count_stones(self, stone):
+        """
+        Takes stone as parameter and returns how many of that stone are on the board
+        """
+        return self._stone_masks(stone)[0].bit_count()
+
+
+    def count_rings(self, stone):
+        """
+        Takes stone as parameter and returns how many rings that stone has
+        """
+        own, other = self._stone_masks(stone)
+        return ring_centers_mask(own, own | other).bit_count()
+
+
+    def move_captures(self, from_location, to_location):
+        """
+        Takes two parameters that respectively represents the center of the piece being moved and the center of the new piece.
+        Returns 2 integers: how many stones of the opponent the new piece would remove, and how many of the opponent's rings
+        it would break. Doesn't check whether the move is legal.
+        """
+        return self.move_captures_idx(SQUARES[from_location], SQUARES[to_location])
+
+
+    def move_captures_idx(self, from_square, to_square):
+        """
+        Same as move_captures(), with the centers given as squares (board row * 20 + board column)
+        """
+        opponent, own = self._stone_masks(STONES[1 - self._buffer[TURN_BYTE]])
+        stones = (opponent & FOOTPRINTS[to_square]).bit_count()
+        rings = (ring_centers_mask(opponent, opponent | own) & NEIGHBORHOODS[to_square]).bit_count()
+        return stones, rings
+
+
+    def generate_legal_moves(self):
+        """
+        Takes no parameter and returns every legal move for the current turn as a list of tuples (from_location, to_location),
+        in the same order as GessGame.generate_legal_moves()
+        """
+        return list(self.iter_legal_moves())
+
+
+    def iter_legal_moves(self):
+        """
+        Takes no parameter and yields the legal moves for the current turn one at a time, like generate_legal_moves()
+        """
+        for from_square, to_square in self.iter_legal_moves_idx():
+            yield (LOCATIONS[from_square], LOCATIONS[to_square])
+
+
+    def generate_legal_moves_idx(self):
+        """
+        Same as generate_legal_moves(), with each move as a tuple of squares (from_square, to_square) for make_move_idx()
+        """
+        return list(self.iter_legal_moves_idx())
+
+
+    def iter_legal_moves_idx(self):
+        """
+        Same as iter_legal_moves(), with each move as a tuple of squares (from_square, to_square) for make_move_idx()
+        """
+        if self._buffer[STATE_BYTE]:
+            return
+        own, other = self._stone_masks(STONES[self._buffer[TURN_BYTE]])
+        yield from mask_piece_moves(own, other, ring_centers_mask(own, own | other))
+
+
+    def get_board(self):
+        """
+        Takes no parameter and returns the board as a new 20x20 nested list of '●', '○' and ''.
+        """
+        black, white = self._masks()
+        board = []
+        for row in range(20):
+            squares = []
+            for column in range(20):
+                bit = 1 << (row*20 + column)
+                if black & bit:
+                    squares.append('●')
+                elif white & bit:
+                    squares.append('○')
+                else:
+                    squares.append('')
+            board.append(squares)
+        return board
+
+
+    def get_hash(self):
+        """
+        Takes no parameter and returns the same 64-bit Zobrist hash as GessGame.get_hash()
+        """
+        return self._hash
+
+
+    def enable_stats(self, stats=None):
+        """
+        Takes an optional GameStats to count into (one can be shared by many games, default: a new one).
+        Starts counting calls, results and time of is_move_legal(), the piece move and has_ring() for this game, like
+        GessGame.enable_stats(). Returns the GameStats.
+        """
+        if stats is None:
+            from game_stats import GameStats
+            stats = GameStats()
+        self._stats = stats
+        return stats
+
+
+    def disable_stats(self):
+        """
+        Takes no parameter and stops counting for this game.
+        No return.
+        """
+        self._stats = None
+
+
+    def get_stats(self):
+        """
+        Takes no parameter and returns a snapshot of the counters as a dictionary (see GameStats.snapshot()),
+        or None if enable_stats() wasn't called
+        """
+        if self._stats is None:
+            return None
+        return self._stats.snapshot()
+
+
+    def get_game_state(self):
+        """
+        Takes no parameter and returns the game state: 'UNFINISHED', 'BLACK_WON' or 'WHITE_WON'
+        """
+        return STATES[self._buffer[STATE_BYTE]]
+
+
+    def resign_game(self):
+        """
+        Takes no parameter.
+        If the game is finsihed, returns False indicating it's not allowed to resign.
+        Otherwise updates game_state as the opponent won the game based on whose turn it currently is, then returns True.
+        """
+        if self._buffer[STATE_BYTE]:
+            return False
+        self._buffer[STATE_BYTE] = 2 - self._buffer[TURN_BYTE]
+        return True
+
+
+    def set_game_state(self, winner):
+        """
+        Takes a parameter winner ('black' or 'white') and updates game_state.
+        No return.
+        """
+        if winner == 'black':
+            self._buffer[STATE_BYTE] = 1
+        else:
+            self._buffer[STATE_BYTE] = 2
+
+
+    def set_turn(self, new_turn):
+        """
+        Takes a parameter turn ('black' or 'white') and makes it the current turn, updating the hash.
+        No return.
+        """
+        turn = 1 if new_turn == 'white' else 0
+        if turn != self._buffer[TURN_BYTE]:
+            self._buffer[TURN_BYTE] = turn
+            self._hash ^= ZOBRIST_TURN
+
+
+    def get_turn(self):
+        """
+        Takes no parameter and returns whose turn it is: 'black' or 'white'
+        """
+        return TURNS[self._buffer[TURN_BYTE]]
+
+
+    def print_board(self):
+        """
+        Takes no parameter and displays the board the same way as GessGame.print_board().
+        No return.
+        """
+        GessGame_Bitboard.from_position(self.get_position()).print_board()
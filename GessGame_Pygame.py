@@ -1,94 +1,349 @@
 # Author: YJL
 # Date: 09/18/2020
 # Description: Add GUI to Gess Game using Pygame.
-# The initial class GessGame is imported and inherited by the class that's created specifically for this project without any modifications. 
+# The initial class GessGame is imported and inherited by the class that's created specifically for this project without any modifications.
+# The grid and the coordinate labels never change, so they're rendered once to a background surface and fonts are created once per
+# (style, size). After a move only the squares that changed are drawn again, and the methods return the rectangles they drew so the
+# caller can pass them to pygame.display.update(rects) instead of updating the whole window.
+# When a piece is selected its legal destinations are marked. They're found by a worker process (GessGame.legal_destinations() on
+# the position's bytes), for every piece of the position at once, and cached by the position's hash. Finding them is pure Python
+# work, so it runs in another process rather than a thread, where it would hold the GIL the event loop needs. A DESTINATIONS_READY
+# event is posted when they're ready, so the event loop never waits for them. It's posted as well when the job fails (the worker
+# process died), so show_destinations() asks again and a new worker is started; a position whose job fails twice is left unmarked.
 
 
-from GessGame import GessGame
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from GessGame import GessGame, legal_destinations
 from constants import *
 import pygame
 
+
+# pygame Font of every (font style, font size) used so far
+_FONTS = {}
+
+# background surface (grid and labels) of every window size used so far
+_BACKGROUNDS = {}
+
+# pygame event posted when the legal destinations of a position are ready, with the position's hash as event.position
+DESTINATIONS_READY = pygame.USEREVENT
+
+# legal destinations of the last DESTINATIONS_CACHE_SIZE positions, keyed by the position's hash, the positions being worked on
+# and the positions whose job has failed once
+DESTINATIONS_CACHE_SIZE = 64
+_DESTINATIONS = OrderedDict()
+_PENDING = set()
+_FAILED = set()
+_destinations_lock = threading.Lock()
+_destinations_worker = None
+
+
+def get_font(font_style, font_size):
+    """
+    Takes a font style and a font size and returns the pygame Font, created the first time it's asked for and reused after that
+    """
+    font = _FONTS.get((font_style, font_size))
+    if font is None:
+        font = pygame.font.Font(pygame.font.match_font(font_style), font_size)
+        _FONTS[(font_style, font_size)] = font
+    return font
+
+
+def _store_destinations(position, future):
+    """
+    Takes a position hash and the finished future of its legal_destinations() job.
+    Caches the result, dropping the oldest position when the cache is full, and posts DESTINATIONS_READY. If the job failed, posts
+    DESTINATIONS_READY all the same so the position is asked for again, unless it had already failed before. Runs in the thread of
+    the process pool that collects results.
+    """
+    with _destinations_lock:
+        _PENDING.discard(position)
+        if future.exception() is not None:
+            if position in _FAILED:
+                return
+            _FAILED.add(position)
+        else:
+            _FAILED.discard(position)
+            _DESTINATIONS[position] = future.result()
+            if len(_DESTINATIONS) > DESTINATIONS_CACHE_SIZE:
+                _DESTINATIONS.popitem(last=False)
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(DESTINATIONS_READY, position=position))
+
+
 class GessGame_Pygame(GessGame):
-    """ 
+    """
     Inherit from class GessGame
 
-    Totally 4 extra methods are implemented:
+    Totally 9 extra methods are implemented:
         1) pygame_board(self, window)
-        2) draw_text(self, window, text, midtop_x, midtop_y, font_size, font_color, font_style = "comicsansms")
-        3) process_click(self, position)
-        4) highlight_piece(self, window, win_pos)
+        2) update_board(self, window)
+        3) redraw_area(self, window, rect)
+        4) draw_text(self, window, text, midtop_x, midtop_y, font_size, font_color, font_style = "comicsansms")
+        5) process_click(self, position)
+        6) highlight_piece(self, window, win_pos)
+        7) clear_highlight(self, window)
+        8) show_destinations(self, window)
+        9) request_destinations(self)
+
+    1 method is overridden:
+        1) _set_area(self, black, white, turn, state)
     """
 
+    def __init__(self):
+        """
+        Initializes the game, plus 4 private data members for drawing: the board as it was last drawn, the highlighted rectangle,
+        the square of the selected piece and the rectangles of the destinations marked for it
+        """
+        super().__init__()
+        self._drawn_board = None
+        self._highlight = None
+        self._selected = None
+        self._marked = []
+
+
+    def _set_area(self, black, white, turn, state):
+        """
+        Puts the position on the board like GessGame._set_area() and resets the 4 drawing members, so a game made by
+        from_bytes() or from_fen() (which don't call __init__) has them too and is drawn in full the first time
+        """
+        super()._set_area(black, white, turn, state)
+        self._drawn_board = None
+        self._highlight = None
+        self._selected = None
+        self._marked = []
+
+
     def pygame_board(self, window):
         """
-        render the board via looping thru data member self._board 
+        render the whole board: the cached background, then every stone of self._board
         """
-        window.fill(BLACK)
-        self.draw_text(window, "github.com/yujyuj/GessGame", 160, 1160, 14, WHITE, "lucidasans")
-        stone_radius = int(SQUARE_SIZE/3)
+        window.blit(self._get_background(window), (0, 0))
+        for row in range(20):
+            for col in range(20):
+                self._draw_stone(window, row, col)
+
+        self._drawn_board = [board_row[:] for board_row in self._board]
+        self._highlight = None
+        self._selected = None
+        self._marked = []
+        self.request_destinations()
+
+
+    def update_board(self, window):
+        """
+        Draws only the squares whose stone changed since the board was last drawn and removes the highlight.
+        Returns the list of rectangles drawn, for pygame.display.update(rects).
+        """
+        if self._drawn_board is None:
+            self.pygame_board(window)
+            return [window.get_rect()]
+
+        rects = self.clear_highlight(window)
+        board = self._board
+        for row in range(20):
+            if board[row] == self._drawn_board[row]:
+                continue
+            for col in range(20):
+                if board[row][col] != self._drawn_board[row][col]:
+                    rects.append(self.redraw_area(window, self._square_rect(row, col)))
+            self._drawn_board[row] = board[row][:]
+
+        # start on the destinations of the new position before a piece is picked
+        self.request_destinations()
+
+        return rects
+
+
+    def redraw_area(self, window, rect):
+        """
+        Draws the background and the stones again inside rect, erasing whatever was drawn over them.
+        Returns rect.
+        """
+        rect = pygame.Rect(rect)
+        window.blit(self._get_background(window), rect, rect)
+
+        # stones of every square the rectangle touches
+        first_col = max(0, int((rect.left - MARGIN)//SQUARE_SIZE))
+        last_col = min(19, int((rect.right - 1 - MARGIN)//SQUARE_SIZE))
+        first_row = max(0, int((rect.top - MARGIN)//SQUARE_SIZE))
+        last_row = min(19, int((rect.bottom - 1 - MARGIN)//SQUARE_SIZE))
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                self._draw_stone(window, row, col)
+
+        return rect
+
+
+    def _get_background(self, window):
+        """
+        Returns the surface with the grid and the labels for the size of window, rendering it the first time
+        """
+        size = window.get_size()
+        background = _BACKGROUNDS.get(size)
+        if background is not None:
+            return background
+
+        background = pygame.Surface(size).convert()
+        background.fill(BLACK)
+        self.draw_text(background, "github.com/yujyuj/GessGame", 160, 1160, 14, WHITE, "lucidasans")
 
         for col in range(20):
             for row in range(20):
                 # grid
-                pygame.draw.rect(window, PURPLE, (col*SQUARE_SIZE + MARGIN, row*SQUARE_SIZE + MARGIN, SQUARE_SIZE - 1, SQUARE_SIZE - 1))
-                pygame.draw.rect(window, BLACK, (col*SQUARE_SIZE + MARGIN, row*SQUARE_SIZE + MARGIN, SQUARE_SIZE, SQUARE_SIZE), 2)
-
-                # # stones
-                if self._board[row][col] == '●':
-                    pygame.draw.circle(window, BLACK, (int(col*SQUARE_SIZE + SQUARE_SIZE/2 + MARGIN), int(row*SQUARE_SIZE + int(SQUARE_SIZE/2) + MARGIN)), stone_radius)
-                elif self._board[row][col] == '○':
-                    pygame.draw.circle(window, WHITE, (int(col*SQUARE_SIZE + SQUARE_SIZE/2 + MARGIN), int(row*SQUARE_SIZE + SQUARE_SIZE/2 + MARGIN)), stone_radius - 1) # width == 0 (default) fill the circle
-                    pygame.draw.circle(window, BLACK, (int(col*SQUARE_SIZE + SQUARE_SIZE/2 + MARGIN), int(row*SQUARE_SIZE + SQUARE_SIZE/2 + MARGIN)), stone_radius, 2) # width > 0, thickness
+                pygame.draw.rect(background, PURPLE, (col*SQUARE_SIZE + MARGIN, row*SQUARE_SIZE + MARGIN, SQUARE_SIZE - 1, SQUARE_SIZE - 1))
+                pygame.draw.rect(background, BLACK, (col*SQUARE_SIZE + MARGIN, row*SQUARE_SIZE + MARGIN, SQUARE_SIZE, SQUARE_SIZE), 2)
 
         # render text
         x = 0
         for i in ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't']:
-            self.draw_text(window, i, 125 + x*50, 1105, 32, WHITE) # for column
-            self.draw_text(window, str(x+1), 1125, 1060-x*50, 32, WHITE) # for row
+            self.draw_text(background, i, 125 + x*50, 1105, 32, WHITE) # for column
+            self.draw_text(background, str(x+1), 1125, 1060-x*50, 32, WHITE) # for row
             x += 1
-        
+
+        _BACKGROUNDS[size] = background
+        return background
+
+
+    def _square_rect(self, row, col):
+        """
+        Takes a board row and column and returns the rectangle of that square on the window
+        """
+        return pygame.Rect(int(col*SQUARE_SIZE + MARGIN), int(row*SQUARE_SIZE + MARGIN), int(SQUARE_SIZE), int(SQUARE_SIZE))
+
+
+    def _draw_stone(self, window, row, col):
+        """
+        Draws the stone of self._board at row, col, if any
+        """
+        stone_radius = int(SQUARE_SIZE/3)
+        center = (int(col*SQUARE_SIZE + SQUARE_SIZE/2 + MARGIN), int(row*SQUARE_SIZE + SQUARE_SIZE/2 + MARGIN))
+        if self._board[row][col] == '●':
+            pygame.draw.circle(window, BLACK, center, stone_radius)
+        elif self._board[row][col] == '○':
+            pygame.draw.circle(window, WHITE, center, stone_radius - 1) # width == 0 (default) fill the circle
+            pygame.draw.circle(window, BLACK, center, stone_radius, 2) # width > 0, thickness
+
+
     def draw_text(self, window, text, midtop_x, midtop_y, font_size, font_color, font_style = "comicsansms"):
         """
-        Takes 7 parameters and sets the image surface's midtop coordinates as the passed in midtop_x and midtop_y
+        Takes 7 parameters and sets the image surface's midtop coordinates as the passed in midtop_x and midtop_y.
+        Returns the rectangle drawn.
         """
-        font_name = pygame.font.match_font(font_style)
-        font = pygame.font.Font(font_name, font_size)
+        font = get_font(font_style, font_size)
         text_as_image = font.render(text, False, font_color) # No anti-aliasesd
         text_rect = text_as_image.get_rect()
         text_rect.midtop = (midtop_x, midtop_y) # sets the image midtop coordinates as the passed in midtop_x and midtop_y
         window.blit(text_as_image, text_rect) # computer will figure out the topleft corner of the image and render from there
+        return text_rect
 
 
     def process_click(self, position):
         """
         Takes a pair of position (x, y) where the user clicked on the window.
-        If in boundary, converts and returns string position in the format like "c3", otherwise returns empty string 
+        If in boundary, converts and returns the square (board row * 20 + board column) for make_move_idx(), otherwise returns None
         """
-        col_lookup_table = {
-            3:'b', 4:'c', 5:'d', 6:'e', 7:'f', 8:'g', 9:'h', 10:'i', 11:'j', 12:'k', 13:'l', 14:'m', 15:'n', 16:'o', 17:'p', 18:'q', 19:'r', 20:'s'
-        }
-
         if 150 <= position[0] <= 1050 and 150 <= position[1] <= 1050:
-            col = col_lookup_table.get(position[0]//50) # use look up table to convert col to string
-            row = str(22 - position[1]//50)             # use str() and simple calculation to convert row to string
-            return col + row
+            col = position[0]//50 - 2   # each square is 50 pixels, the board starts 2 squares from the window's edge
+            row = position[1]//50 - 2
+            return row*20 + col
 
-        # return "" when click out of bound
-        return ""
+        # return None when click out of bound
+        return None
 
 
     def highlight_piece(self, window, win_pos):
         """
-        Hightlights the piece that user picked to move
+        Hightlights the piece that user picked to move, removing the previous highlight.
+        Returns the list of rectangles drawn.
         """
+        rects = self.clear_highlight(window)
+
         # only when user clicks in boundary will the piece be highlighted
         if 150 <= win_pos[0] <= 1050 and 150 <= win_pos[1] <= 1050:
             left = ((win_pos[0] - MARGIN)//50 + 1) * 50
             top = ((win_pos[1] - MARGIN)//50 + 1) * 50
-            pygame.draw.rect(window, CYAN, (left, top, SQUARE_SIZE*3, SQUARE_SIZE*3), 5)
-            return
+            self._highlight = pygame.Rect(int(left), int(top), int(SQUARE_SIZE*3), int(SQUARE_SIZE*3))
+            pygame.draw.rect(window, CYAN, self._highlight, 5)
+            rects.append(self._highlight)
+
+            # and its legal destinations, now if they're cached, otherwise when DESTINATIONS_READY comes
+            self._selected = self.process_click(win_pos)
+            rects.extend(self.show_destinations(window))
+
+        return rects
 
-        # simply return when click out of bound
-        return
 
+    def clear_highlight(self, window):
+        """
+        Removes the highlight drawn by highlight_piece() and the destinations marked for it, if any.
+        Returns the list of rectangles drawn.
+        """
+        rects = [self.redraw_area(window, rect) for rect in self._marked]
+        self._marked = []
+        self._selected = None
+        if self._highlight is not None:
+            rects.append(self.redraw_area(window, self._highlight))
+            self._highlight = None
+        return rects
+
+
+    def show_destinations(self, window):
+        """
+        Marks the legal destinations of the selected piece if the worker has found them for the current position,
+        otherwise asks the worker for them. Call it again on DESTINATIONS_READY.
+        Returns the list of rectangles drawn.
+        """
+        if self._selected is None:
+            return []
+
+        position = self.get_hash()
+        with _destinations_lock:
+            destinations = _DESTINATIONS.get(position)
+            if destinations is not None:
+                _DESTINATIONS.move_to_end(position)
+        if destinations is None:
+            self.request_destinations()
+            return []
+
+        rects = []
+        for to_square in destinations.get(self._selected, ()):
+            row, col = divmod(to_square, 20)
+            rect = self._square_rect(row, col)
+            if rect in self._marked:
+                continue
+            pygame.draw.circle(window, CYAN, rect.center, int(SQUARE_SIZE/2) - 4, 3)
+            self._marked.append(rect)
+            rects.append(rect)
+        return rects
+
+
+    def request_destinations(self):
+        """
+        Sends the current position to the worker process unless its legal destinations are cached or being worked on.
+        Doesn't wait for the worker.
+        No return.
+        """
+        global _destinations_worker
+
+        if self._state != 'UNFINISHED':
+            return
+        position = self.get_hash()
+        with _destinations_lock:
+            if position in _DESTINATIONS or position in _PENDING:
+                return
+            _PENDING.add(position)
+            if _destinations_worker is None:
+                _destinations_worker = ProcessPoolExecutor(max_workers=1)
 
+        data = self.to_bytes()
+        try:
+            future = _destinations_worker.submit(legal_destinations, data)
+        except BrokenProcessPool:
+            # the worker process died (killed, out of memory): start another one
+            _destinations_worker = ProcessPoolExecutor(max_workers=1)
+            future = _destinations_worker.submit(legal_destinations, data)
+        future.add_done_callback(lambda future: _store_destinations(position, future))
@@ -0,0 +1,127 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: A transposition table for Gess positions, keyed on the 64-bit Zobrist hash returned by GessGame.get_hash().
+# The table has a fixed number of slots worked out from a memory budget, so it never grows. Slots come in buckets of two:
+# the first keeps the entry with the deepest search (or one left over from an older search), the second is always replaced.
+# Entries hold whatever the caller stores: legal-move lists, ring status, search results... Use one table per kind of value.
+
+
+class TranspositionTable:
+    """
+    Represents a fixed-size hash table of Gess positions.
+
+    Totally 7 methods are implemented:
+        1) __init__(size_mb)
+        2) probe(key)
+        3) store(key, value, depth)
+        4) new_search()
+        5) clear()
+        6) get_stats()
+        7) __len__()
+    """
+
+    # rough size in bytes of one stored entry: the slot, the entry tuple and its key/depth/generation integers.
+    # The value itself is shared with the caller and isn't counted
+    ENTRY_BYTES = 128
+
+    def __init__(self, size_mb=16):
+        """
+        Takes the memory budget in megabytes and initializes an empty table with the largest power of two number of
+        buckets that fits in it.
+        """
+        buckets = 1
+        while buckets * 4 * self.ENTRY_BYTES <= size_mb * 1024 * 1024:
+            buckets *= 2
+
+        self._mask = buckets - 1
+        self._slots = [None] * (buckets * 2)
+        self._generation = 0
+        self._entries = 0
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+        self._overwrites = 0
+
+
+    def probe(self, key):
+        """
+        Takes a position hash and returns the value stored for it, or None if the position isn't in the table.
+        """
+        self._probes += 1
+        index = (key & self._mask) << 1
+        entry = self._slots[index]
+        if entry is None or entry[0] != key:
+            entry = self._slots[index + 1]
+            if entry is None or entry[0] != key:
+                return None
+
+        self._hits += 1
+        return entry[3]
+
+
+    def store(self, key, value, depth=0):
+        """
+        Takes a position hash, the value to store for it and the search depth the value comes from (0 for values that
+        don't come from a search, like legal-move lists).
+        The first slot of the bucket is replaced when it's empty, holds the same position, comes from an older search or
+        from a shallower one. Otherwise the value goes in the second slot, replacing whatever is there.
+        No return.
+        """
+        self._stores += 1
+        index = (key & self._mask) << 1
+        slots = self._slots
+        entry = (key, depth, self._generation, value)
+
+        deep = slots[index]
+        if deep is None or deep[0] == key or deep[2] != self._generation or depth >= deep[1]:
+            if deep is None:
+                self._entries += 1
+            elif deep[0] != key:
+                self._overwrites += 1
+            slots[index] = entry
+            # drop a stale copy of the same position from the second slot
+            other = slots[index + 1]
+            if other is not None and other[0] == key:
+                slots[index + 1] = None
+                self._entries -= 1
+            return
+
+        other = slots[index + 1]
+        if other is None:
+            self._entries += 1
+        elif other[0] != key:
+            self._overwrites += 1
+        slots[index + 1] = entry
+
+
+    def new_search(self):
+        """
+        Takes no parameter and starts a new generation: entries stored before now can be replaced regardless of their depth.
+        No return.
+        """
+        self._generation += 1
+
+
+    def clear(self):
+        """
+        Takes no parameter and empties the table, keeping its size.
+        No return.
+        """
+        self._slots = [None] * len(self._slots)
+        self._entries = 0
+
+
+    def get_stats(self):
+        """
+        Takes no parameter and returns a dictionary with the number of slots, the entries in use, the probes, hits,
+        stores and overwrites so far.
+        """
+        return {'slots': len(self._slots), 'entries': self._entries, 'probes': self._probes, 'hits': self._hits,
+                'stores': self._stores, 'overwrites': self._overwrites}
+
+
+    def __len__(self):
+        """
+        Takes no parameter and returns the number of entries in the table
+        """
+        return self._entries
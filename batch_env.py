@@ -0,0 +1,259 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: A batch of Gess games stepped together with NumPy, for rollouts and training loops that play thousands of games at
+# once. The boards are one (N, 20, 20) int8 array laid out like batch_boards.py (EMPTY = 0, BLACK = 1, WHITE = -1), with the turn
+# (the stone value of the player to move) and the game state (0 = UNFINISHED, 1 = BLACK_WON, 2 = WHITE_WON) of each game alongside.
+#
+# step() takes one move per game and checks every rule of GessGame for all of them at once: bounds, direction, the 3x3 grid, the
+# perimeter stone, the distance, the squares in between and the ring left to the player. The legal moves are then made with one
+# footprint copy, which captures whatever the new piece lands on, and one border clear; finished games are found from the rings
+# of the whole batch. A move the game would turn down changes nothing, exactly like GessGame.make_move() returning False.
+# With auto_reset, a game that ends is reported by step() and starts again from the initial board.
+#
+# Usage:
+#   env = BatchEnv(4096)
+#   accepted, results = env.step(from_squares, to_squares)      # squares are board row * 20 + board column
+#   finished = results != 0                                       # those games were reset; results holds who won
+
+
+import numpy as np
+
+from GessGame import GessGame, DIRECTIONS, LEADING_EDGES, encode_position, decode_position
+from GessGame_Bitboard import GessGame_Bitboard
+from batch_boards import EMPTY, BLACK, WHITE, board_to_array
+
+
+# game states, the same numbers as the state byte of GessGame.encode_position()
+UNFINISHED = 0
+BLACK_WON = 1
+WHITE_WON = 2
+
+INITIAL_BOARD = board_to_array(GessGame().get_board())
+
+# the 9 squares of a piece, as row and column offsets from its center, in the order GessGame._move_piece() walks them
+FOOTPRINT_ROWS = np.repeat(np.arange(-1, 2), 3)
+FOOTPRINT_COLUMNS = np.tile(np.arange(-1, 2), 3)
+
+# index in DIRECTIONS of every (row step + 1, column step + 1); the entry for no direction is never used
+DIRECTION_TABLE = np.zeros((3, 3), dtype=np.intp)
+DIRECTION_TABLE[[dr + 1 for dr, dc in DIRECTIONS], [dc + 1 for dr, dc in DIRECTIONS]] = np.arange(len(DIRECTIONS))
+
+# the leading edge of a piece moving in each direction (see GessGame.LEADING_EDGES), as (8, 5) arrays of row and column offsets.
+# A straight move has 3 squares on its edge, the list is padded by repeating the first one
+_EDGES = np.array([LEADING_EDGES[direction] + LEADING_EDGES[direction][:1] * (5 - len(LEADING_EDGES[direction]))
+                   for direction in DIRECTIONS])
+EDGE_ROWS = _EDGES[:, :, 0]
+EDGE_COLUMNS = _EDGES[:, :, 1]
+
+STATE_NAMES = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+
+# columns 1..18 of a row packed as bits, the centers a ring can have
+_CENTER_COLUMNS = np.uint32(((1 << 18) - 1) << 1)
+
+
+def row_bits(boards, colour):
+    """
+    Takes an (N, 20, 20) array of boards and BLACK or WHITE.
+    Returns an (N, 20) uint32 array: each row of each board as 20 bits, bit c set where column c holds that colour.
+    """
+    packed = np.packbits(boards == colour, axis=2, bitorder='little').astype(np.uint32)
+    return packed[:, :, 0] | packed[:, :, 1] << 8 | packed[:, :, 2] << 16
+
+
+def has_rings(boards):
+    """
+    Takes an (N, 20, 20) array of boards and returns 2 (N,) bool arrays: whether black and whether white has a ring.
+    Same answer as ring_counts() of batch_boards.py > 0, on whole rows of bits instead of one square at a time.
+    """
+    black = row_bits(boards, BLACK)
+    white = row_bits(boards, WHITE)
+    empty = ~(black | white)
+    flags = []
+    for own in (black, white):
+        # a row of 3 stones centered on each column, and a stone on both sides of each column
+        three = own & own << 1 & own >> 1
+        sides = own << 1 & own >> 1
+        centers = three[:, :-2] & sides[:, 1:-1] & three[:, 2:] & empty[:, 1:-1] & _CENTER_COLUMNS
+        flags.append(centers.any(axis=1))
+    return flags[0], flags[1]
+
+
+class BatchEnv:
+    """
+    Represents N Gess games played in lockstep.
+
+    Totally 7 methods are implemented:
+        1) __init__(count, auto_reset)
+        2) from_games(games, auto_reset) (class method)
+        3) reset(indices)
+        4) legal_moves(from_squares, to_squares)
+        5) step(from_squares, to_squares)
+        6) get_game(index)
+        7) __len__()
+    """
+
+    def __init__(self, count, auto_reset=True):
+        """
+        Takes the number of games and whether games that end start again on their own. Every game starts from the initial board.
+        The public arrays, one entry per game: boards (N, 20, 20), turns (BLACK or WHITE), states and moves (made in the current game).
+        """
+        self.auto_reset = auto_reset
+        self.boards = np.repeat(INITIAL_BOARD[np.newaxis], count, axis=0)
+        self.turns = np.full(count, BLACK, dtype=np.int8)
+        self.states = np.zeros(count, dtype=np.int8)
+        self.moves = np.zeros(count, dtype=np.int32)
+
+
+    @classmethod
+    def from_games(cls, games, auto_reset=True):
+        """
+        Takes a list of GessGame objects (any engine with to_bytes()) and returns a BatchEnv holding their positions
+        """
+        env = cls(len(games), auto_reset)
+        env.boards[:] = EMPTY
+        for index, game in enumerate(games):
+            black, white, turn, state = decode_position(game.to_bytes())
+            area = env.boards[index, 1:19, 1:19]
+            for mask, colour in ((black, BLACK), (white, WHITE)):
+                bits = np.unpackbits(np.frombuffer(mask.to_bytes(41, 'little'), dtype=np.uint8), count=324, bitorder='little')
+                area[bits.reshape(18, 18).astype(bool)] = colour
+            env.turns[index] = BLACK if turn == 'black' else WHITE
+            env.states[index] = STATE_NAMES.index(state)
+        return env
+
+
+    def __len__(self):
+        """
+        Takes no parameter and returns the number of games
+        """
+        return len(self.states)
+
+
+    def reset(self, indices=None):
+        """
+        Takes an array of game indices (default: every game) and puts those games back to the initial board.
+        No return.
+        """
+        if indices is None:
+            indices = slice(None)
+        self.boards[indices] = INITIAL_BOARD
+        self.turns[indices] = BLACK
+        self.states[indices] = UNFINISHED
+        self.moves[indices] = 0
+
+
+    def legal_moves(self, from_squares, to_squares):
+        """
+        Takes 2 arrays of N squares, the centers of the old and the new piece of a move for each game.
+        Returns an (N,) bool array, True where GessGame.make_move_idx() would make the move. Nothing is changed.
+        """
+        candidates, new_boards, mover_rings, opponent_rings = self._try_moves(from_squares, to_squares)
+        legal = np.zeros(len(self), dtype=bool)
+        legal[candidates[mover_rings]] = True
+        return legal
+
+
+    def step(self, from_squares, to_squares):
+        """
+        Takes 2 arrays of N squares, the centers of the old and the new piece of a move for each game, and makes every legal one.
+        Returns 2 (N,) arrays: accepted (bool, whether the move was made) and results (int8, BLACK_WON or WHITE_WON for the games
+        the move ended, UNFINISHED for the rest). With auto_reset the games that ended are back on the initial board.
+        """
+        candidates, new_boards, mover_rings, opponent_rings = self._try_moves(from_squares, to_squares)
+        accepted = np.zeros(len(self), dtype=bool)
+        results = np.zeros(len(self), dtype=np.int8)
+
+        games = candidates[mover_rings]
+        accepted[games] = True
+        self.boards[games] = new_boards[mover_rings]
+        self.moves[games] += 1
+
+        # the player to move won if the opponent has no ring left, otherwise the turn passes
+        won = ~opponent_rings[mover_rings]
+        winners = games[won]
+        results[winners] = np.where(self.turns[winners] == BLACK, BLACK_WON, WHITE_WON)
+        self.states[winners] = results[winners]
+        self.turns[games[~won]] *= -1
+
+        if self.auto_reset and len(winners):
+            self.reset(winners)
+        return accepted, results
+
+
+    def _try_moves(self, from_squares, to_squares):
+        """
+        Takes the moves of step(). Checks the rules that don't need the move made for every unfinished game, then makes the moves
+        that pass on copies of their boards.
+        Returns the indices of those games, their new boards and 2 bool arrays: whether the player moving and the opponent
+        have a ring on the new boards. A move is legal if the player moving still has a ring.
+        """
+        from_squares = np.asarray(from_squares, dtype=np.intp)
+        to_squares = np.asarray(to_squares, dtype=np.intp)
+        games = np.flatnonzero(self.states == UNFINISHED)
+        from_row, from_column = np.divmod(from_squares[games], 20)
+        to_row, to_column = np.divmod(to_squares[games], 20)
+        own = self.turns[games]
+
+        # out of bound
+        ok = ((1 <= from_row) & (from_row <= 18) & (1 <= from_column) & (from_column <= 18)
+              & (1 <= to_row) & (to_row <= 18) & (1 <= to_column) & (to_column <= 18))
+        from_row, from_column, to_row, to_column = (np.clip(array, 1, 18) for array in (from_row, from_column, to_row, to_column))
+
+        # only straight or 45 degree diagonal moves
+        row_distance = to_row - from_row
+        column_distance = to_column - from_column
+        ok &= (row_distance == 0) | (column_distance == 0) | (np.abs(row_distance) == np.abs(column_distance))
+        distance = np.maximum(np.abs(row_distance), np.abs(column_distance))
+
+        # the 3x3 grid holds nothing but the player's stones
+        boards = self.boards[games]
+        rows = np.arange(len(games))[:, np.newaxis]
+        piece = boards[rows, from_row[:, np.newaxis] + FOOTPRINT_ROWS, from_column[:, np.newaxis] + FOOTPRINT_COLUMNS]
+        ok &= ~((piece != EMPTY) & (piece != own[:, np.newaxis])).any(axis=1)
+
+        # a stone on the perimeter in the direction of the move, and up to 3 squares if the center is empty
+        row_step = np.sign(row_distance)
+        column_step = np.sign(column_distance)
+        ok &= (distance == 0) | (boards[rows[:, 0], from_row + row_step, from_column + column_step] == own)
+        ok &= (piece[:, 4] != EMPTY) | (distance <= 3)
+
+        # nothing in the way: the leading edge of the piece is empty at every square it passes
+        direction = DIRECTION_TABLE[row_step + 1, column_step + 1]
+        edge_rows = EDGE_ROWS[direction]
+        edge_columns = EDGE_COLUMNS[direction]
+        for step in range(1, int(distance[ok].max(initial=1))):
+            moving = np.flatnonzero(ok & (distance > step))
+            blocked = (boards[moving[:, np.newaxis], (from_row[moving] + step * row_step[moving])[:, np.newaxis] + edge_rows[moving],
+                              (from_column[moving] + step * column_step[moving])[:, np.newaxis] + edge_columns[moving]] != EMPTY).any(axis=1)
+            ok[moving[blocked]] = False
+
+        # make the moves that are left on their copies: empty the old piece, copy it to the new one (capturing whatever was there),
+        # then empty the border
+        passed = np.flatnonzero(ok)
+        new_boards = boards[passed]
+        moved = np.arange(len(passed))[:, np.newaxis]
+        new_boards[moved, from_row[passed, np.newaxis] + FOOTPRINT_ROWS, from_column[passed, np.newaxis] + FOOTPRINT_COLUMNS] = EMPTY
+        new_boards[moved, to_row[passed, np.newaxis] + FOOTPRINT_ROWS, to_column[passed, np.newaxis] + FOOTPRINT_COLUMNS] = piece[passed]
+        new_boards[:, 0, :] = EMPTY
+        new_boards[:, 19, :] = EMPTY
+        new_boards[:, :, 0] = EMPTY
+        new_boards[:, :, 19] = EMPTY
+
+        # not legal if it would leave the player no ring
+        black_rings, white_rings = has_rings(new_boards)
+        mover_is_black = own[passed] == BLACK
+        mover_rings = np.where(mover_is_black, black_rings, white_rings)
+        opponent_rings = np.where(mover_is_black, white_rings, black_rings)
+        return games[passed], new_boards, mover_rings, opponent_rings
+
+
+    def get_game(self, index):
+        """
+        Takes the index of a game and returns a GessGame_Bitboard object with its position, e.g. to list its legal moves
+        """
+        board = self.boards[index, 1:19, 1:19]
+        black = int.from_bytes(np.packbits(board == BLACK, bitorder='little').tobytes(), 'little')
+        white = int.from_bytes(np.packbits(board == WHITE, bitorder='little').tobytes(), 'little')
+        turn = 'black' if self.turns[index] == BLACK else 'white'
+        state = STATE_NAMES[self.states[index]]
+        return GessGame_Bitboard.from_bytes(encode_position(black, white, turn, state))
@@ -0,0 +1,260 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: A compact binary file format for Gess game records, and a memory-mapped reader.
+# Every move takes 2 bytes. A square of the 18x18 playable area alone takes 324 values, so a move can't be two one-byte squares;
+# instead it's packed as from_square * 136 + direction * 17 + (distance - 1), which fits in 16 bits since a legal move always goes
+# straight or diagonally, 1 to 17 squares.
+#
+# File layout (little-endian):
+#   header   b'GESS', version (u16), reserved (u16), number of games (u32), offset of the index (u64)
+#   games    for each game: result (u8, 0 = UNFINISHED, 1 = BLACK_WON, 2 = WHITE_WON), 3 reserved bytes,
+#            number of moves (u32), then the moves (u16 each)
+#   index    the offset of every game (u64 each)
+#
+# The reader maps the file into memory and only reads the header up front, so any game can be decoded or replayed
+# into a GessGame object without parsing the rest of the file. A file cut short or a damaged game raises ValueError.
+#
+# Usage:
+#   with GameRecordWriter('games.gess') as writer:
+#       writer.add_game([('c3', 'c6'), ...], 'BLACK_WON')
+#   with GameRecordReader('games.gess') as reader:
+#       game = reader.replay(123)
+
+
+import mmap
+import struct
+import sys
+
+from GessGame import GessGame, DIRECTIONS, LOCATIONS, SQUARES
+
+
+MAGIC = b'GESS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIQ')
+GAME_HEADER = struct.Struct('<BxxxI')
+RESULTS = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+
+
+def encode_move(from_location, to_location):
+    """
+    Takes a move as two location strings like 'c3' and returns its 16-bit code.
+    Raises ValueError if a location is out of bound or the move isn't straight or diagonal.
+    """
+    try:
+        from_row, from_column = divmod(SQUARES[from_location], 20)
+        to_row, to_column = divmod(SQUARES[to_location], 20)
+    except KeyError:
+        raise ValueError(f'not a board location: {from_location} or {to_location}') from None
+    if not (1 <= from_row <= 18 and 1 <= from_column <= 18 and 1 <= to_row <= 18 and 1 <= to_column <= 18):
+        raise ValueError(f'location out of bound: {from_location} or {to_location}')
+
+    row_distance = to_row - from_row
+    column_distance = to_column - from_column
+    distance = max(abs(row_distance), abs(column_distance))
+    if distance == 0 or (row_distance and column_distance and abs(row_distance) != abs(column_distance)):
+        raise ValueError(f'not a straight or diagonal move: {from_location} to {to_location}')
+
+    direction = DIRECTIONS.index((row_distance // distance, column_distance // distance))
+    return ((from_row - 1) * 18 + from_column - 1) * 136 + direction * 17 + distance - 1
+
+
+def decode_move(code):
+    """
+    Takes a 16-bit move code and returns the move as a tuple (from_location, to_location).
+    Raises ValueError if it isn't the code of a move between two centers of the playable area.
+    """
+    if not 0 <= code < 324 * 136:
+        raise ValueError(f'not a move code: {code}')
+    from_index, rest = divmod(code, 136)
+    direction, distance = divmod(rest, 17)
+    from_row, from_column = divmod(from_index, 18)
+    dr, dc = DIRECTIONS[direction]
+    to_row = from_row + 1 + (distance + 1) * dr
+    to_column = from_column + 1 + (distance + 1) * dc
+    if not (1 <= to_row <= 18 and 1 <= to_column <= 18):
+        raise ValueError(f'move code {code} goes out of bound')
+    return LOCATIONS[(from_row + 1) * 20 + from_column + 1], LOCATIONS[to_row * 20 + to_column]
+
+
+class GameRecordWriter:
+    """
+    Writes games to a new record file. Can be used as a context manager.
+
+    Totally 4 methods are implemented:
+        1) __init__(path)
+        2) add_game(moves, result)
+        3) close()
+        4) __enter__() / __exit__()
+    """
+
+    def __init__(self, path):
+        """
+        Takes the path of the file to create (an existing file is overwritten)
+        """
+        self._file = open(path, 'wb')
+        self._offsets = []
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))   # filled in by close()
+
+
+    def add_game(self, moves, result='UNFINISHED'):
+        """
+        Takes the list of moves of a game as tuples (from_location, to_location) and the game state it ended in.
+        Appends the game to the file.
+        No return.
+        """
+        codes = [encode_move(from_location, to_location) for from_location, to_location in moves]
+        self._offsets.append(self._file.tell())
+        self._file.write(GAME_HEADER.pack(RESULTS.index(result), len(codes)))
+        self._file.write(struct.pack(f'<{len(codes)}H', *codes))
+
+
+    def close(self):
+        """
+        Takes no parameter, writes the index and the header and closes the file.
+        No return.
+        """
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(struct.pack(f'<{len(self._offsets)}Q', *self._offsets))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, len(self._offsets), index_offset))
+        self._file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class GameRecordReader:
+    """
+    Reads games from a record file through a memory map. Can be used as a context manager.
+
+    Totally 9 methods are implemented:
+        1) __init__(path)
+        2) __len__()
+        3) get_result(number)
+        4) get_moves(number)
+        5) _game_header(number)
+        6) replay(number, game_class)
+        7) iter_games()
+        8) close()
+        9) __enter__() / __exit__()
+    """
+
+    def __init__(self, path):
+        """
+        Takes the path of a record file and maps it. Raises ValueError if it isn't a record file or is too short for its header
+        or its index.
+        """
+        self._path = path
+        with open(path, 'rb') as file:
+            if file.seek(0, 2) < HEADER.size:
+                raise ValueError(f'{path} is not a Gess record file')
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, reserved, self._count, index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f'{path} is not a Gess record file')
+        if index_offset + 8*self._count > len(self._map):
+            self._map.close()
+            raise ValueError(f'{path} is cut short: its index of {self._count} games goes past the end of the file')
+
+        # the offsets stay in the map and are read when a game is looked up, so opening a file of any size takes no memory
+        self._view = memoryview(self._map)
+        if sys.byteorder == 'little':
+            self._index = self._view[index_offset:index_offset + 8*self._count].cast('Q')
+        else:
+            self._index = struct.unpack_from(f'<{self._count}Q', self._map, index_offset)
+
+
+    def __len__(self):
+        """
+        Takes no parameter and returns the number of games in the file
+        """
+        return self._count
+
+
+    def get_result(self, number):
+        """
+        Takes the number of a game (0 is the first) and returns the game state it ended in.
+        Raises ValueError if the game's record is damaged.
+        """
+        offset, result, move_count = self._game_header(number)
+        return RESULTS[result]
+
+
+    def get_moves(self, number):
+        """
+        Takes the number of a game (0 is the first) and returns its moves as a list of tuples (from_location, to_location).
+        Raises ValueError if the game's record is damaged.
+        """
+        offset, result, move_count = self._game_header(number)
+        codes = struct.unpack_from(f'<{move_count}H', self._map, offset + GAME_HEADER.size)
+        try:
+            return [decode_move(code) for code in codes]
+        except ValueError as error:
+            raise ValueError(f'{self._path}: game {number}: {error}') from None
+
+
+    def _game_header(self, number):
+        """
+        Takes the number of a game and returns (offset, result, number of moves) read from its header.
+        Raises ValueError if the header or the moves go past the end of the file or the result isn't a game state.
+        """
+        offset = self._index[number]
+        if offset + GAME_HEADER.size > len(self._map):
+            raise ValueError(f'{self._path}: game {number} starts past the end of the file')
+        result, move_count = GAME_HEADER.unpack_from(self._map, offset)
+        if offset + GAME_HEADER.size + 2*move_count > len(self._map):
+            raise ValueError(f'{self._path}: the {move_count} moves of game {number} go past the end of the file')
+        if result >= len(RESULTS):
+            raise ValueError(f'{self._path}: game {number} has no valid result')
+        return offset, result, move_count
+
+
+    def replay(self, number, game_class=GessGame):
+        """
+        Takes the number of a game and the GessGame class to replay it on (GessGame_Bitboard is faster).
+        Returns the game object after all of its moves were made with make_move().
+        Raises ValueError if one of the moves is illegal.
+        """
+        game = game_class()
+        for move_number, (from_location, to_location) in enumerate(self.get_moves(number)):
+            if not game.make_move(from_location, to_location):
+                raise ValueError(f'game {number}: move {move_number} ({from_location} to {to_location}) is illegal')
+        return game
+
+
+    def iter_games(self):
+        """
+        Takes no parameter and yields (result, moves) for every game in the file, in order
+        """
+        for number in range(self._count):
+            yield self.get_result(number), self.get_moves(number)
+
+
+    def close(self):
+        """
+        Takes no parameter and unmaps the file.
+        No return.
+        """
+        if self._map.closed:
+            return
+        if isinstance(self._index, memoryview):
+            self._index.release()
+        self._view.release()
+        self._map.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,377 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: An asyncio server hosting many Gess games in one process. Clients connect over TCP and send one JSON object per line;
+# every request may carry an "id" that is echoed in its reply, so a client can keep many requests in flight on one connection.
+#
+# Requests:
+#   {"op": "new", "id": 1}                                          -> {"id": 1, "ok": true, "session": 7}
+#   {"op": "join", "session": 7, "id": 2}                           -> {"id": 2, "ok": true, "turn": ..., "state": ..., "ply": ...}
+#   {"op": "move", "session": 7, "from": "c3", "to": "c6", "id": 3} -> {"id": 3, "ok": true}
+#   {"op": "resign", "session": 7, "id": 4}                         -> {"id": 4, "ok": true}
+# A move or resignation the game turns down is answered with "ok": false and a "reason": "game_over", or for an illegal move the
+# MoveReason in lower case ("obstructed", "too_far", ...).
+#   {"op": "board", "session": 7, "id": 5}                          -> {"id": 5, "ok": true, "board": [20 strings of 20 '.', 'b', 'w']}
+# A request that isn't a JSON object, or a line longer than MAX_REQUEST_BYTES, is answered with "id": null, "ok": false and an
+# "error"; the connection stays open.
+# Every connection that created or joined a session gets {"op": "state", "session", "turn", "state", "ply", "move"} after each
+# change to it.
+#
+# Each session has its own asyncio.Lock, so the moves of one game are applied one at a time while other games go on. make_move()
+# runs in a thread pool, so a slow legality check never holds up the event loop. Replies and state broadcasts are queued per
+# connection and written in one batch per wakeup; when a client reads slowly, a newer state of a session replaces the queued one
+# instead of piling up, and the server stops reading the client's requests until its replies are written.
+#
+# Usage:
+#   python game_server.py --port 8765
+#   python load_client.py --port 8765 --sessions 10000
+
+
+import argparse
+import asyncio
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from GessGame_Bitboard import GessGame_Bitboard
+
+
+MAX_IN_FLIGHT = 256       # requests of one connection handled at the same time
+MAX_PENDING_REPLIES = 1024  # replies queued for one connection before its requests stop being read
+MAX_REQUEST_BYTES = 65536   # longest request line read, a longer one is skipped and answered with an error
+BOARD_CHARACTERS = {'': '.', '●': 'b', '○': 'w'}
+
+
+class RequestError(Exception):
+    """
+    Raised while handling a request that can't be carried out, the message is sent back as the reply's "error"
+    """
+    pass
+
+
+def play_move(game, from_location, to_location):
+    """
+    Takes a game and the two locations of a move, and makes the move if the game allows it. Runs in the thread pool.
+    Returns None if the move was made, otherwise 'game_over' or the name of the MoveReason it was rejected for, in lower case.
+    """
+    if game.make_move(from_location, to_location):
+        return None
+    if game.get_game_state() != 'UNFINISHED':
+        return 'game_over'
+    stone = '●' if game.get_turn() == 'black' else '○'
+    return game.check_move(stone, from_location, to_location).name.lower()
+
+
+class Session:
+    """
+    Represents one game hosted by the server and the connections following it
+    """
+    __slots__ = ('number', 'game', 'lock', 'subscribers', 'ply', 'last_move')
+
+    def __init__(self, number, game):
+        """
+        Takes the session number and a new GessGame object
+        """
+        self.number = number
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.subscribers = set()
+        self.ply = 0
+        self.last_move = None
+
+
+    def state_message(self):
+        """
+        Takes no parameter and returns the state broadcast of the session as a dictionary
+        """
+        game = self.game
+        return {'op': 'state', 'session': self.number, 'turn': game.get_turn(), 'state': game.get_game_state(),
+                'ply': self.ply, 'move': self.last_move}
+
+
+class Connection:
+    """
+    Represents one client connection: its outgoing queue and the task writing it.
+
+    Totally 5 methods are implemented:
+        1) __init__(writer)
+        2) send_reply(message)
+        3) send_state(session_number, message)
+        4) wait_for_room()
+        5) close()
+    """
+
+    def __init__(self, writer):
+        """
+        Takes the asyncio StreamWriter of the connection and starts the task writing to it
+        """
+        self.sessions = set()
+        self._writer = writer
+        self._replies = []
+        self._states = {}       # session number -> newest state not written yet
+        self._ready = asyncio.Event()
+        self._flushed = asyncio.Event()
+        self._closed = False
+        self._task = asyncio.create_task(self._write_loop())
+
+
+    def send_reply(self, message):
+        """
+        Takes a reply dictionary and queues it.
+        No return.
+        """
+        self._replies.append(json.dumps(message).encode() + b'\n')
+        self._ready.set()
+
+
+    def send_state(self, session_number, message):
+        """
+        Takes a session number and its state broadcast and queues it, replacing the queued state of that session if any.
+        No return.
+        """
+        self._states[session_number] = message
+        self._ready.set()
+
+
+    async def wait_for_room(self):
+        """
+        Takes no parameter and waits until fewer than MAX_PENDING_REPLIES replies are queued
+        """
+        while len(self._replies) >= MAX_PENDING_REPLIES and not self._closed:
+            self._flushed.clear()
+            await self._flushed.wait()
+
+
+    async def _write_loop(self):
+        """
+        Takes no parameter. Writes everything queued in one batch each time something is queued, waiting for the client to take it.
+        """
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                lines = self._replies
+                lines.extend(json.dumps(message).encode() + b'\n' for message in self._states.values())
+                self._replies = []
+                self._states = {}
+                self._flushed.set()
+                if lines:
+                    self._writer.write(b''.join(lines))
+                    await self._writer.drain()
+                if self._closed and not self._replies and not self._states:
+                    break
+        except ConnectionError:
+            self._closed = True
+            self._flushed.set()
+
+
+    async def close(self):
+        """
+        Takes no parameter, writes what's left and closes the connection.
+        No return.
+        """
+        self._closed = True
+        self._ready.set()
+        self._flushed.set()
+        await self._task
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class GameServer:
+    """
+    Hosts GessGame sessions for any number of connections.
+
+    Totally 4 methods are implemented:
+        1) __init__(workers, game_class)
+        2) handle_connection(reader, writer)
+        3) handle_request(connection, request)
+        4) serve(host, port)
+    """
+
+    def __init__(self, workers=None, game_class=GessGame_Bitboard):
+        """
+        Takes the number of threads checking and making moves (default: ThreadPoolExecutor's) and the GessGame class of the sessions
+        """
+        self.sessions = {}
+        self._numbers = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._game_class = game_class
+
+
+    async def handle_connection(self, reader, writer):
+        """
+        Takes the streams of a new connection. Reads requests until the client disconnects, handling up to MAX_IN_FLIGHT at once.
+        """
+        connection = Connection(writer)
+        in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+        tasks = set()
+
+        async def run(request):
+            try:
+                await self.handle_request(connection, request)
+            finally:
+                in_flight.release()
+
+        try:
+            while True:
+                await connection.wait_for_room()
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial            # the last request, not ended by a newline
+                except asyncio.LimitOverrunError:
+                    await self._skip_line(reader)
+                    connection.send_reply({'id': None, 'ok': False, 'error': f'request longer than {MAX_REQUEST_BYTES} bytes'})
+                    continue
+                if not line:
+                    break
+                await in_flight.acquire()
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    in_flight.release()
+                    connection.send_reply({'id': None, 'ok': False, 'error': 'not a JSON object'})
+                    continue
+                task = asyncio.create_task(run(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            for number in connection.sessions:
+                session = self.sessions.get(number)
+                if session is not None:
+                    session.subscribers.discard(connection)
+                    if not session.subscribers:
+                        del self.sessions[number]
+            await connection.close()
+
+
+    async def handle_request(self, connection, request):
+        """
+        Takes the connection a request came from and the request dictionary. Carries the request out and queues the reply.
+        """
+        reply = {'id': request.get('id'), 'ok': True}
+        try:
+            operation = request.get('op')
+            if operation == 'new':
+                session = Session(next(self._numbers), self._game_class())
+                self.sessions[session.number] = session
+                self._subscribe(connection, session)
+                reply['session'] = session.number
+            elif operation in ('join', 'move', 'resign', 'board'):
+                number = request.get('session')
+                if not isinstance(number, int) or isinstance(number, bool):
+                    raise RequestError('session must be a session number')
+                session = self.sessions.get(number)
+                if session is None:
+                    raise RequestError('no such session')
+                if operation == 'join':
+                    async with session.lock:    # not while a move is being made in the thread pool
+                        self._subscribe(connection, session)
+                        state = session.state_message()
+                    reply.update(turn=state['turn'], state=state['state'], ply=state['ply'])
+                elif operation == 'board':
+                    async with session.lock:
+                        board = session.game.get_board()
+                    reply['board'] = [''.join(BOARD_CHARACTERS[square] for square in row) for row in board]
+                else:
+                    reason = await self._change(session, operation, request)
+                    if reason is not None:
+                        reply['ok'] = False
+                        reply['reason'] = reason
+            else:
+                raise RequestError(f'unknown op: {operation}')
+        except RequestError as error:
+            reply['ok'] = False
+            reply['error'] = str(error)
+        connection.send_reply(reply)
+
+
+    @staticmethod
+    async def _skip_line(reader):
+        """
+        Takes the stream of a connection whose request line went past MAX_REQUEST_BYTES and reads up to the end of that line
+        """
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.IncompleteReadError:
+                return
+            except asyncio.LimitOverrunError as error:
+                # nothing was read: drop what's buffered of the line so far and look for its end again
+                await reader.readexactly(error.consumed)
+
+
+    def _subscribe(self, connection, session):
+        """
+        Takes a connection and a session and sends the session's state broadcasts to the connection from now on
+        """
+        session.subscribers.add(connection)
+        connection.sessions.add(session.number)
+
+
+    async def _change(self, session, operation, request):
+        """
+        Takes a session, 'move' or 'resign' and the request. Applies it to the game in the thread pool while holding the session's
+        lock, then broadcasts the new state. Returns None if the game accepted it, otherwise the reason it was turned down.
+        """
+        loop = asyncio.get_running_loop()
+        async with session.lock:
+            if operation == 'move':
+                from_location = request.get('from')
+                to_location = request.get('to')
+                if not isinstance(from_location, str) or not isinstance(to_location, str):
+                    raise RequestError('from and to must be locations like "c3"')
+                try:
+                    reason = await loop.run_in_executor(self._executor, play_move, session.game, from_location, to_location)
+                except (KeyError, ValueError, IndexError):
+                    raise RequestError(f'not a board location: {from_location} or {to_location}') from None
+                if reason is None:
+                    session.ply += 1
+                    session.last_move = [from_location, to_location]
+            else:
+                reason = None if session.game.resign_game() else 'game_over'
+
+            if reason is None:
+                message = session.state_message()
+                for subscriber in session.subscribers:
+                    subscriber.send_state(session.number, message)
+        return reason
+
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """
+        Takes the address to listen on and serves connections until cancelled
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST_BYTES)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """
+    Parses the command line and runs the server
+    """
+    parser = argparse.ArgumentParser(description='Host Gess games for TCP clients sending JSON lines.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help='threads checking and making moves')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(GameServer(args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
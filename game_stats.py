@@ -0,0 +1,98 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Opt-in counters and timers for the legality pipeline of a GessGame: how many times a move's legality is checked
+# (is_move_legal_idx(), which make_move() and is_move_legal() run), a piece is moved (make_move(), move_and_capture() and the ring
+# rule of a legality check) and a ring is looked for (has_ring(), the ring rule and the end of a move), the seconds spent in each,
+# and how many moves were legal or rejected by each rule.
+# Nothing is counted until GessGame.enable_stats() gives a game a GameStats. The engines (GessGame, GessGame_Bitboard and
+# GessGame_Compact) count into it at each phase of their own pipeline; a game without one only tests that it has none, and
+# disable_stats() takes it away again. The GameStats is a plain object, so a game with stats on still pickles (the copy sent to
+# another process counts into a copy of the stats).
+# Calls nested inside another phase are counted in both (the ring rule of a legality check moves the piece and looks for a ring).
+#
+# Usage:
+#   stats = game.enable_stats()              # or share one GameStats between many games: game.enable_stats(stats)
+#   ...
+#   game.get_stats()                         # {'calls': {...}, 'seconds': {...}, 'results': {'legal': ..., 'obstructed': ...}}
+#   print(stats.to_text())                   # Prometheus text format, for scraping
+
+
+from GessGame import MoveReason
+
+
+PHASES = ('is_move_legal', 'move_and_capture', 'has_ring')
+
+# name of every result of a legality check (see GessGame.check_move_idx()): 'legal' or the reason the move was rejected
+RESULTS = {reason: reason.name.lower() for reason in MoveReason}
+
+
+class GameStats:
+    """
+    Represents the counters of one game, or of many games sharing it.
+
+    Totally 6 methods are implemented:
+        1) __init__()
+        2) reset()
+        3) count(phase, seconds)
+        4) count_check(result, seconds)
+        5) snapshot()
+        6) to_text(prefix)
+    """
+
+    def __init__(self):
+        """
+        Takes no parameter and starts every counter at 0
+        """
+        self.reset()
+
+
+    def reset(self):
+        """
+        Takes no parameter and sets every counter back to 0.
+        No return.
+        """
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.results = dict.fromkeys(RESULTS, 0)
+
+
+    def count(self, phase, seconds):
+        """
+        Takes a phase from PHASES and the seconds one call of it took, and counts that call.
+        No return.
+        """
+        self.calls[phase] += 1
+        self.seconds[phase] += seconds
+
+
+    def count_check(self, result, seconds):
+        """
+        Takes the MoveReason a legality check returned and the seconds it took, and counts that check.
+        No return.
+        """
+        self.calls['is_move_legal'] += 1
+        self.seconds['is_move_legal'] += seconds
+        self.results[result] += 1
+
+
+    def snapshot(self):
+        """
+        Takes no parameter and returns a copy of the counters as a dictionary that can be dumped as JSON:
+        calls and seconds per phase, and legality results by name
+        """
+        return {'calls': dict(self.calls), 'seconds': dict(self.seconds),
+                'results': {RESULTS[result]: count for result, count in self.results.items()}}
+
+
+    def to_text(self, prefix='gess'):
+        """
+        Takes a metric name prefix and returns the counters in the Prometheus text exposition format
+        """
+        lines = [f'# TYPE {prefix}_calls_total counter']
+        lines.extend(f'{prefix}_calls_total{{phase="{phase}"}} {count}' for phase, count in self.calls.items())
+        lines.append(f'# TYPE {prefix}_seconds_total counter')
+        lines.extend(f'{prefix}_seconds_total{{phase="{phase}"}} {seconds:.9f}' for phase, seconds in self.seconds.items())
+        lines.append(f'# TYPE {prefix}_legality_checks_total counter')
+        lines.extend(f'{prefix}_legality_checks_total{{result="{RESULTS[result]}"}} {count}'
+                     for result, count in self.results.items())
+        return '\n'.join(lines) + '\n'
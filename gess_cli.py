@@ -0,0 +1,290 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: A command line for Gess that runs without a display. It plays moves read from standard input, counts perft nodes and
+# validates games, and starts the Pygame window only when asked to.
+# Worker processes start this script over and over, so it imports nothing but the standard library and the rules: GessGame only
+# needs random and enum, the faster engines are imported when a command runs on one, perft.py only for the perft command, and
+# main.py, which brings in Pygame, only for the gui command.
+#
+# The play command reads one request per line and answers each on one line:
+#   c3 c6          -> 'ok', 'ok BLACK_WON' when the move wins the game, or 'illegal <reason>' (a MoveReason in lower case,
+#                     'game_over' once the game is finished, or 'not_a_location')
+#   resign         -> 'ok WHITE_WON' or 'illegal game_over'
+#   turn, state    -> 'black', 'UNFINISHED', ...
+#   fen            -> the position as a FEN-like string (see GessGame.to_fen())
+#   board          -> the playable area, 18 lines from rank 19 down to rank 2
+# Blank lines and lines starting with '#' are skipped. The final state is written when the input ends.
+#
+# The validate command reads a game record file (see game_records.py) or a text file of games: one move per line like 'c3 c6',
+# a blank line between games, and optionally a line with the state the game should end in ('UNFINISHED', 'BLACK_WON' or
+# 'WHITE_WON') after its moves. It writes the first illegal move of every game that has one and exits with status 1 if any game
+# doesn't replay or doesn't end in the expected state.
+#
+# Usage:
+#   python gess_cli.py play < moves.txt
+#   python gess_cli.py play --fen "<position>" --engine bitboard
+#   python gess_cli.py perft 3
+#   python gess_cli.py validate games.gess
+#   python gess_cli.py gui
+
+
+import argparse
+import importlib
+import sys
+import time
+
+from GessGame import SQUARES
+
+
+# engine name -> module, the class in each module has the module's name
+ENGINES = {'list': 'GessGame', 'bitboard': 'GessGame_Bitboard', 'compact': 'GessGame_Compact'}
+STATES = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+BOARD_CHARACTERS = {'': '.', '●': 'b', '○': 'w'}
+
+
+def load_engine(name):
+    """
+    Takes an engine name from ENGINES and returns its GessGame class, importing its module the first time
+    """
+    module = ENGINES[name]
+    return getattr(importlib.import_module(module), module)
+
+
+def new_game(game_class, fen=None):
+    """
+    Takes a GessGame class and optionally a FEN-like position. Returns a new game at that position, or at the initial position.
+    Raises ValueError if fen isn't a valid position.
+    """
+    if fen is None:
+        return game_class()
+    return game_class.from_fen(fen)
+
+
+def play_move(game, from_location, to_location):
+    """
+    Takes a game and the two locations of a move, and makes the move if the game allows it.
+    Returns None if the move was made, otherwise why it wasn't: 'not_a_location', 'game_over' or the name of the MoveReason it was
+    rejected for, in lower case.
+    """
+    from_square = SQUARES.get(from_location)
+    to_square = SQUARES.get(to_location)
+    if from_square is None or to_square is None:
+        return 'not_a_location'
+    if game.make_move_idx(from_square, to_square):
+        return None
+    if game.get_game_state() != 'UNFINISHED':
+        return 'game_over'
+    stone = '●' if game.get_turn() == 'black' else '○'
+    return game.check_move_idx(stone, from_square, to_square).name.lower()
+
+
+def replay_moves(game, moves):
+    """
+    Takes a game and an iterable of moves as (from_location, to_location), and makes them in order up to the first one the
+    game turns down.
+    Returns None if every move was made, otherwise (move number counted from 0, from_location, to_location, reason) of that move,
+    the reason as returned by play_move().
+    """
+    for number, (from_location, to_location) in enumerate(moves):
+        reason = play_move(game, from_location, to_location)
+        if reason is not None:
+            return number, from_location, to_location, reason
+    return None
+
+
+def read_text_games(lines):
+    """
+    Takes an iterable of lines in the text format of the validate command. Yields (moves, expected state or None) for every
+    game, reading only as far as the end of that game.
+    Raises ValueError with the line number for a line that's neither a move nor a state.
+    """
+    moves = []
+    expected = None
+    for line_number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            if not fields and (moves or expected):
+                yield moves, expected
+                moves = []
+                expected = None
+            continue
+        if len(fields) == 2 and expected is None:
+            moves.append((fields[0], fields[1]))
+        elif len(fields) == 1 and fields[0] in STATES and expected is None:
+            expected = fields[0]
+        else:
+            raise ValueError(f'line {line_number}: expected a move like "c3 c6" or a game state, got {line.strip()!r}')
+    if moves or expected:
+        yield moves, expected
+
+
+def check_game(game, moves, expected=None):
+    """
+    Takes a new game, the moves of a recorded game and the state it should end in (None to not check it). Replays the moves.
+    Returns None if every move is legal and the game ends in the expected state, otherwise a line describing the problem.
+    """
+    illegal = replay_moves(game, moves)
+    if illegal is not None:
+        number, from_location, to_location, reason = illegal
+        return f'move {number} ({from_location} to {to_location}) is illegal: {reason}'
+    state = game.get_game_state()
+    if expected is not None and state != expected:
+        return f'ends {state}, expected {expected}'
+    return None
+
+
+def board_text(game):
+    """
+    Takes a game and returns its 18x18 playable area as text: one line per rank from 19 down to 2, then the column letters
+    """
+    board = game.get_board()
+    lines = [f"{20 - row:>2} {' '.join(BOARD_CHARACTERS[stone] for stone in board[row][1:19])}" for row in range(1, 19)]
+    lines.append('   ' + ' '.join('bcdefghijklmnopqrs'))
+    return '\n'.join(lines)
+
+
+def run_play(args, output=sys.stdout):
+    """
+    Takes the parsed command line of the play command. Plays the requests read from standard input on a new game and writes
+    the answers to output, then the final state.
+    Returns the exit status.
+    """
+    try:
+        game = new_game(load_engine(args.engine), args.fen)
+    except ValueError as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 2
+
+    for line in sys.stdin:
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        request = fields[0].lower()
+        if len(fields) == 2:
+            reason = play_move(game, fields[0], fields[1])
+            state = game.get_game_state()
+            if reason is not None:
+                answer = f'illegal {reason}'
+            elif state != 'UNFINISHED':
+                answer = f'ok {state}'
+            else:
+                answer = 'ok'
+        elif len(fields) > 1:
+            answer = f'error: not a request: {line.strip()!r}'
+        elif request == 'resign':
+            answer = f'ok {game.get_game_state()}' if game.resign_game() else 'illegal game_over'
+        elif request == 'turn':
+            answer = game.get_turn()
+        elif request == 'state':
+            answer = game.get_game_state()
+        elif request == 'fen':
+            answer = game.to_fen()
+        elif request == 'board':
+            answer = board_text(game)
+        elif request == 'quit':
+            break
+        else:
+            answer = f'error: not a request: {line.strip()!r}'
+        print(answer, file=output, flush=args.flush)
+
+    print(game.get_game_state(), file=output)
+    return 0
+
+
+def run_perft(args, output=sys.stdout):
+    """
+    Takes the parsed command line of the perft command. Counts the leaf nodes at the given depth from the position and writes
+    the count and the nodes per second to output.
+    Returns the exit status.
+    """
+    from perft import PerftCounter
+
+    try:
+        game = new_game(load_engine(args.engine), args.fen)
+    except ValueError as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    leaves = PerftCounter().perft(game, args.depth)
+    seconds = time.perf_counter() - start
+    print(f'depth {args.depth}: {leaves} nodes in {seconds:.2f}s ({leaves / seconds if seconds > 0 else 0:.0f} nodes/s)', file=output)
+    return 0
+
+
+def run_validate(args, output=sys.stdout):
+    """
+    Takes the parsed command line of the validate command. Replays every game of the file and writes a line for every game
+    that has a problem, then a summary.
+    Returns the exit status: 0 if every game is valid, 1 otherwise, 2 if the file can't be read.
+    """
+    game_class = load_engine(args.engine)
+    try:
+        with open(args.file, 'rb') as file:
+            is_record_file = file.read(4) == b'GESS'
+        if is_record_file:
+            from game_records import GameRecordReader
+            reader = GameRecordReader(args.file)
+            games = ((moves, result) for result, moves in reader.iter_games())
+        else:
+            reader = open(args.file, encoding='utf-8')
+            games = read_text_games(reader)
+
+        count = invalid = 0
+        with reader:
+            for moves, expected in games:
+                problem = check_game(game_class(), moves, expected)
+                if problem is not None:
+                    invalid += 1
+                    print(f'game {count}: {problem}', file=output)
+                count += 1
+    except (OSError, ValueError) as error:
+        message = str(error)
+        if args.file not in message:        # the errors of open() and GameRecordReader already name the file
+            message = f'{args.file}: {message}'
+        print(f'error: {message}', file=sys.stderr)
+        return 2
+
+    print(f'{count} games, {invalid} invalid', file=output)
+    return 1 if invalid else 0
+
+
+def run_gui(args):
+    """
+    Takes the parsed command line of the gui command and opens the Pygame window (see main.py).
+    Returns the exit status.
+    """
+    import main
+    main.main()
+    return 0
+
+
+def main(argv=None):
+    """
+    Takes the command line arguments (default: sys.argv[1:]), runs the command and returns its exit status
+    """
+    parser = argparse.ArgumentParser(description='Play, count and validate Gess games without a display.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    play = commands.add_parser('play', help='play the moves read from standard input')
+    play.add_argument('--fen', default=None, help='start from this position instead of the initial one')
+    play.add_argument('--engine', choices=sorted(ENGINES), default='list')
+    play.add_argument('--flush', action='store_true', help='flush every answer, for a process driving the game through a pipe')
+
+    perft = commands.add_parser('perft', help='count the positions reachable in exactly DEPTH moves')
+    perft.add_argument('depth', type=int)
+    perft.add_argument('--fen', default=None, help='count from this position instead of the initial one')
+    perft.add_argument('--engine', choices=sorted(ENGINES), default='bitboard')
+
+    validate = commands.add_parser('validate', help='replay every game of a game record file or text file of games')
+    validate.add_argument('file')
+    validate.add_argument('--engine', choices=sorted(ENGINES), default='list')
+
+    commands.add_parser('gui', help='open the Pygame window')
+
+    args = parser.parse_args(argv)
+    run = {'play': run_play, 'perft': run_perft, 'validate': run_validate, 'gui': run_gui}[args.command]
+    return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
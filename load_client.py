@@ -0,0 +1,221 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Load generator for game_server.py. Opens a number of TCP connections, creates the sessions spread over them and plays
+# moves in every session at the same time. Each session replays one of a few random legal games worked out before the clock starts,
+# so the client spends its time waiting on the server rather than generating moves.
+# Reports the moves per second the server handled and the p50/p99 latency from sending a move to reading its reply.
+#
+# Usage:
+#   python game_server.py --port 8765 &
+#   python load_client.py --port 8765 --sessions 10000 --connections 100 --moves 20 --processes 4
+
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from multiprocessing import Pool
+
+from GessGame_Bitboard import GessGame_Bitboard
+
+
+class Client:
+    """
+    Represents one connection to the server. Many requests can be in flight, replies are matched to them by id.
+
+    Totally 4 methods are implemented:
+        1) __init__(reader, writer)
+        2) connect(host, port) (class method)
+        3) request(message)
+        4) close()
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Takes the streams of an open connection and starts reading replies
+        """
+        self.broadcasts = 0
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting = {}
+        self._task = asyncio.create_task(self._read_loop())
+
+
+    @classmethod
+    async def connect(cls, host, port):
+        """
+        Takes the server address and returns a new Client connected to it
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+
+    async def request(self, message):
+        """
+        Takes a request dictionary (without an id), sends it and returns the reply dictionary
+        """
+        number = next(self._ids)
+        reply = asyncio.get_running_loop().create_future()
+        self._waiting[number] = reply
+        self._writer.write(json.dumps(dict(message, id=number)).encode() + b'\n')
+        await self._writer.drain()
+        return await reply
+
+
+    async def _read_loop(self):
+        """
+        Takes no parameter. Reads replies and state broadcasts until the server closes the connection.
+        """
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if message.get('op') == 'state':
+                self.broadcasts += 1
+                continue
+            reply = self._waiting.pop(message.get('id'), None)
+            if reply is not None:
+                reply.set_result(message)
+
+        for reply in self._waiting.values():
+            reply.set_exception(ConnectionError('the server closed the connection'))
+        self._waiting.clear()
+
+
+    async def close(self):
+        """
+        Takes no parameter and closes the connection.
+        No return.
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._task
+
+
+def make_games(count, moves, seed=0):
+    """
+    Takes the number of games, the number of moves in each and a random seed.
+    Returns a list of games, each a list of legal moves from the initial position (shorter if the game ends first).
+    """
+    rng = random.Random(seed)
+    games = []
+    for number in range(count):
+        game = GessGame_Bitboard()
+        played = []
+        while len(played) < moves and game.get_game_state() == 'UNFINISHED':
+            legal_moves = game.generate_legal_moves()
+            if not legal_moves:
+                break
+            move = rng.choice(legal_moves)
+            game.make_move(move[0], move[1])
+            played.append(move)
+        games.append(played)
+    return games
+
+
+def percentile(values, fraction):
+    """
+    Takes a sorted list of numbers and a fraction between 0 and 1 and returns the value at that fraction of the list
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def play_session(client, moves, latencies):
+    """
+    Takes a Client, the moves to play and the list to add move latencies to.
+    Creates a session and plays the moves one after another. Returns the number of moves the server rejected.
+    """
+    reply = await client.request({'op': 'new'})
+    session = reply['session']
+    for from_location, to_location in moves:
+        start = time.perf_counter()
+        reply = await client.request({'op': 'move', 'session': session, 'from': from_location, 'to': to_location})
+        latencies.append(time.perf_counter() - start)
+        if not reply['ok']:
+            return 1
+    return 0
+
+
+async def play_sessions(host, port, sessions, connections, moves, seed=0):
+    """
+    Takes the server address, the number of sessions, the number of connections to spread them over, the moves per session
+    and a random seed. Plays every session at the same time.
+    Returns a dictionary: the move latencies in seconds, the rejected moves, the state broadcasts received and the seconds spent.
+    """
+    games = make_games(min(sessions, 64), moves, seed)
+    clients = [await Client.connect(host, port) for number in range(connections)]
+    latencies = []
+
+    start = time.perf_counter()
+    rejected = await asyncio.gather(*(play_session(clients[number % connections], games[number % len(games)], latencies)
+                                      for number in range(sessions)))
+    seconds = time.perf_counter() - start
+
+    broadcasts = sum(client.broadcasts for client in clients)
+    for client in clients:
+        await client.close()
+
+    return {'latencies': latencies, 'rejected': sum(rejected), 'broadcasts': broadcasts, 'seconds': seconds}
+
+
+def run_share(job):
+    """
+    Takes a tuple of play_sessions() arguments and runs it in its own event loop. This is the job each client process runs.
+    """
+    return asyncio.run(play_sessions(*job))
+
+
+def run_load(host, port, sessions, connections, moves, processes=1, seed=0):
+    """
+    Takes the server address, the number of sessions, the number of connections, the moves per session, the number of client
+    processes to split them over (one Python process can't keep thousands of sessions busy on a fast server) and a random seed.
+    Returns a report dictionary: sessions, moves, rejected moves, seconds, moves per second, p50/p99/max latency in milliseconds
+    and state broadcasts received.
+    """
+    processes = max(1, min(processes, sessions, connections))
+    jobs = [(host, port, sessions // processes + (index < sessions % processes),
+             connections // processes + (index < connections % processes), moves, seed + index) for index in range(processes)]
+    if processes == 1:
+        results = [run_share(jobs[0])]
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(run_share, jobs)
+
+    latencies = sorted(latency for result in results for latency in result['latencies'])
+    seconds = max(result['seconds'] for result in results)
+    return {'sessions': sessions, 'moves': len(latencies), 'rejected': sum(result['rejected'] for result in results),
+            'seconds': seconds, 'moves_per_second': len(latencies) / seconds if seconds > 0 else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000, 'p99_ms': percentile(latencies, 0.99) * 1000,
+            'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'broadcasts': sum(result['broadcasts'] for result in results)}
+
+
+def main():
+    """
+    Parses the command line, runs the load and prints the report
+    """
+    parser = argparse.ArgumentParser(description='Play many concurrent sessions against game_server.py and report move latency.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--moves', type=int, default=20, help='moves played in every session')
+    parser.add_argument('--processes', type=int, default=1, help='client processes the sessions are split over')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    report = run_load(args.host, args.port, args.sessions, args.connections, args.moves, args.processes, args.seed)
+    print(f"{report['sessions']} sessions, {report['moves']} moves ({report['rejected']} rejected) in {report['seconds']:.1f}s, "
+          f"{report['moves_per_second']:.0f} moves/s")
+    print(f"latency p50 {report['p50_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms, max {report['max_ms']:.1f} ms; "
+          f"{report['broadcasts']} state broadcasts received")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,9 @@
 # Description: The driver.
 # The initial class GessGame is imported and inherited by class GessGame_Pygame that's created specifically for this project without any modifications. 
 
-from GessGame_Pygame import GessGame_Pygame
+import multiprocessing
+
+from GessGame_Pygame import GessGame_Pygame, DESTINATIONS_READY
 from constants import *
 import pygame
 
@@ -16,74 +18,94 @@ def main():
     game.pygame_board(window)
     pygame.display.update()
 
+    # mouse motion would wake the loop up for nothing, nothing here reacts to it
+    pygame.event.set_blocked(pygame.MOUSEMOTION)
+
     run = True
-    from_position = ""
-    to_position = ""
+    redraw = True # the text above the board needs drawing
+    from_position = None
+    to_position = None
+    notice = "" # why the last move was turned down, shown until the next click
 
     while run:
-        if game.get_game_state() == "UNFINISHED": 
+        if redraw and game.get_game_state() == "UNFINISHED": 
+            redraw = False
+            header = game.redraw_area(window, (0, 0, WIDTH, int(MARGIN))) # erase the previous text above the board
             game.draw_text(window, game.get_turn(), 100, 40, 32, PINK)
-            if not from_position:
+            if from_position is None:
                 instruction = "Select a piece"
             else:
                 instruction = "Select destination"
             game.draw_text(window, instruction, WIDTH/2, 50, 32, PINK)
-            pygame.display.update()
+            if notice:
+                game.draw_text(window, notice, WIDTH/2, 10, 24, YELLOW)
+            pygame.display.update(header)
 
-        for event in pygame.event.get():
+        # sleep until something happens, then handle everything that happened at once. Nothing animates, so the loop only
+        # draws in answer to an event and there's no frame rate to keep: a click is handled as soon as it arrives
+        events = [pygame.event.wait()] + pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 run = False
 
+            # the worker found the legal destinations, mark them if the piece is still selected
+            elif event.type == DESTINATIONS_READY:
+                pygame.display.update(game.show_destinations(window))
+
             # when a mouse click occures, if the from_position is not yet filled, fill it
-            elif event.type == pygame.MOUSEBUTTONDOWN and not from_position:
-                pos = pygame.mouse.get_pos()
-                from_position = game.process_click(pos) # will be "" if clicked off boundary
-                game.pygame_board(window)
-                game.highlight_piece(window, pos)
-                pygame.display.update()
+            elif event.type == pygame.MOUSEBUTTONDOWN and from_position is None:
+                pos = event.pos # where the click was, the mouse may have moved since
+                from_position = game.process_click(pos) # will be None if clicked off boundary
+                notice = ""
+                pygame.display.update(game.highlight_piece(window, pos))
+                redraw = True
 
             # when a mouse click occures, if the from_position already yet filled, fill the to_position
-            elif event.type == pygame.MOUSEBUTTONDOWN and from_position:
-                pos = pygame.mouse.get_pos()
+            elif event.type == pygame.MOUSEBUTTONDOWN and from_position is not None:
+                pos = event.pos # where the click was, the mouse may have moved since
                 to_position = game.process_click(pos)
 
                 # when both positions are filled and they are not the same, call make_move() method
-                if from_position and to_position and from_position != to_position:
-                    game.make_move(from_position, to_position)
-                    game.pygame_board(window)
-                    pygame.display.update()
+                if to_position is not None and from_position != to_position:
+                    if not game.make_move_idx(from_position, to_position):
+                        # tell the player which rule turned the move down
+                        stone = '●' if game.get_turn() == 'black' else '○'
+                        reason = game.check_move_idx(stone, from_position, to_position)
+                        notice = "Illegal move: " + reason.name.replace('_', ' ').lower()
+                    pygame.display.update(game.update_board(window)) # only the squares the move changed
 
                     # reset to empty
-                    from_position = ""
-                    to_position = ""
+                    from_position = None
+                    to_position = None
+                    redraw = True
 
                     # some one won or resigned
                     if game.get_game_state() != "UNFINISHED":
-                        game.pygame_board(window)
-                        pygame.display.update()
                         if game.get_game_state() == "BLACK_WON":
                             text = "BLACK WON"
                         else:
                             text = "WHITE WON"
-                        game.draw_text(window, text, WIDTH/2, HEIGHT/2, 64, YELLOW)
-                        game.draw_text(window, "Press any key to start a new game", WIDTH/2, 50, 32, PINK)
-                        pygame.display.update()
+                        rects = [game.redraw_area(window, (0, 0, WIDTH, int(MARGIN)))]
+                        rects.append(game.draw_text(window, text, WIDTH/2, HEIGHT/2, 64, YELLOW))
+                        rects.append(game.draw_text(window, "Press any key to start a new game", WIDTH/2, 50, 32, PINK))
+                        pygame.display.update(rects)
 
                         # player can start a new game
                         waiting = True
                         while waiting:
-                            for event in pygame.event.get():
-                                if event.type == pygame.QUIT:
-                                    run = False
-                                    waiting = False
-                                elif event.type == pygame.KEYUP:
-                                    waiting = False
-                                    game = GessGame_Pygame()
-                                    game.pygame_board(window)
-                                    pygame.display.update()
+                            event = pygame.event.wait() # sleeps until a key or the window is closed
+                            if event.type == pygame.QUIT:
+                                run = False
+                                waiting = False
+                            elif event.type == pygame.KEYUP:
+                                waiting = False
+                                game = GessGame_Pygame()
+                                game.pygame_board(window)
+                                pygame.display.update()
 
     pygame.quit()
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support() # the legal destinations are found in a worker process, which a PyInstaller executable has to start itself
     main()
\ No newline at end of file
@@ -0,0 +1,243 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Monte Carlo tree search for Gess, spread over a pool of worker processes.
+# Root parallelism: every worker grows its own UCT tree from the same root position with its own random seed and its share of
+# the playout budget, then sends back only the visit and win counts of the root's children. The counts are added up and the most
+# visited move is played. The workers share nothing while they run, so playouts per second grow with the number of cores.
+# Positions go to the workers in the compact form of GessGame_Bitboard.get_position() (two integers and two strings).
+#
+# Usage:
+#   move = best_move(game, playouts=4000, workers=8)
+#   with MCTSEngine(workers=8) as engine:      # keeps the worker processes between moves
+#       result = engine.search(game, playouts=4000)
+
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from GessGame import LOCATIONS
+from GessGame_Bitboard import GessGame_Bitboard
+from search import evaluate
+
+
+EXPLORATION = 1.4       # UCT exploration constant
+PLAYOUT_DEPTH = 40      # plies a random playout runs before the position is scored with search.evaluate()
+
+
+class Node:
+    """
+    Represents a position in the search tree, reached by playing move.
+    wins is counted for the player who played move.
+    """
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, parent, untried):
+        """
+        Takes the move leading to this node, the parent node and the list of legal moves not expanded yet
+        """
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+
+    def select_child(self):
+        """
+        Takes no parameter and returns the child with the best UCT value
+        """
+        log_visits = math.log(self.visits)
+        best_child = None
+        best_value = -1.0
+        for child in self.children:
+            value = child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_child = child
+                best_value = value
+        return best_child
+
+
+def playout_result(game, rng, playout_depth):
+    """
+    Takes a GessGame object, a random.Random and the number of plies to play.
+    Plays random legal moves until the game ends or playout_depth plies were played, then takes them all back.
+    Returns 1.0 if black won (or is ahead when the playout stops), 0.0 if white, 0.5 for an even position.
+    """
+    plies = 0
+    while plies < playout_depth and game.get_game_state() == 'UNFINISHED':
+        moves = game.generate_legal_moves_idx()
+        if not moves:
+            break
+        move = moves[rng.randrange(len(moves))]
+        game.make_move_idx(move[0], move[1])
+        plies += 1
+
+    state = game.get_game_state()
+    if state == 'BLACK_WON':
+        result = 1.0
+    elif state == 'WHITE_WON':
+        result = 0.0
+    else:
+        score = evaluate(game)
+        if game.get_turn() == 'white':
+            score = -score
+        result = 1.0 if score > 0 else 0.0 if score < 0 else 0.5
+
+    for ply in range(plies):
+        game.unmake_move()
+    return result
+
+
+def run_tree(position, playouts, seed, playout_depth=PLAYOUT_DEPTH):
+    """
+    Takes a position from GessGame_Bitboard.get_position(), the number of playouts, a random seed and the playout depth.
+    Grows one UCT tree from the position. This is the job each worker process runs.
+    Returns a dictionary {move: (visits, wins)} for the children of the root, wins counted for the player to move at the root.
+    Inside the tree moves are tuples of squares; the returned moves are tuples (from_location, to_location).
+    """
+    rng = random.Random(seed)
+    game = GessGame_Bitboard.from_position(position)
+    root = Node(None, None, game.generate_legal_moves_idx())
+
+    for playout in range(playouts):
+        node = root
+        made = 0
+
+        # selection: walk down through fully expanded nodes
+        while not node.untried and node.children:
+            node = node.select_child()
+            game.make_move_idx(node.move[0], node.move[1])
+            made += 1
+
+        # expansion: add one child for a move not tried yet
+        if node.untried and game.get_game_state() == 'UNFINISHED':
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            game.make_move_idx(move[0], move[1])
+            made += 1
+            if game.get_game_state() == 'UNFINISHED':
+                untried = game.generate_legal_moves_idx()
+            else:
+                untried = []
+            child = Node(move, node, untried)
+            node.children.append(child)
+            node = child
+
+        # simulation. The turn doesn't change on the winning move, so who played node.move is read before the playout
+        if game.get_game_state() == 'UNFINISHED':
+            mover_is_black = game.get_turn() == 'white'
+        else:
+            mover_is_black = game.get_game_state() == 'BLACK_WON'
+        black_result = playout_result(game, rng, playout_depth)
+
+        # back propagation: each node counts the result for the player who played its move
+        result = black_result if mover_is_black else 1.0 - black_result
+        while node is not None:
+            node.visits += 1
+            node.wins += result
+            result = 1.0 - result
+            node = node.parent
+
+        for ply in range(made):
+            game.unmake_move()
+
+    return {(LOCATIONS[child.move[0]], LOCATIONS[child.move[1]]): (child.visits, child.wins) for child in root.children}
+
+
+class MCTSEngine:
+    """
+    Represents a pool of worker processes running Monte Carlo tree search. Can be used as a context manager.
+
+    Totally 5 methods are implemented:
+        1) __init__(workers)
+        2) search(game, playouts, seed)
+        3) best_move(game, playouts)
+        4) close()
+        5) __enter__() / __exit__()
+    """
+
+    def __init__(self, workers=None):
+        """
+        Takes the number of worker processes (default: one per core). With 1 worker the search runs in this process.
+        """
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = None
+        if self._workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+
+    def search(self, game, playouts=1000, seed=None):
+        """
+        Takes a GessGame object, the total playout budget and optionally a random seed.
+        Splits the playouts evenly between the workers and adds up the root statistics they send back.
+        The game isn't changed.
+        Returns a dictionary: the most visited move (None when there's no legal move), its visits and win rate for the player
+        to move, the playouts done, the seconds spent and the playouts per second.
+        """
+        start = time.perf_counter()
+        result = {'move': None, 'visits': 0, 'win_rate': 0.0, 'playouts': 0}
+
+        if game.get_game_state() == 'UNFINISHED':
+            position = GessGame_Bitboard.from_game(game).get_position()
+            rng = random.Random(seed)
+            shares = [playouts // self._workers + (index < playouts % self._workers) for index in range(self._workers)]
+            jobs = [(position, share, rng.getrandbits(32)) for share in shares if share]
+
+            if self._executor is None:
+                trees = [run_tree(*job) for job in jobs]
+            else:
+                trees = list(self._executor.map(run_tree, *zip(*jobs)))
+
+            totals = {}
+            for tree in trees:
+                for move, (visits, wins) in tree.items():
+                    total_visits, total_wins = totals.get(move, (0, 0.0))
+                    totals[move] = (total_visits + visits, total_wins + wins)
+
+            if totals:
+                move, (visits, wins) = max(totals.items(), key=lambda item: item[1][0])
+                result.update(move=move, visits=visits, win_rate=wins / visits, playouts=sum(shares))
+
+        seconds = time.perf_counter() - start
+        result['seconds'] = seconds
+        result['playouts_per_second'] = result['playouts'] / seconds if seconds > 0 else 0.0
+        return result
+
+
+    def best_move(self, game, playouts=1000):
+        """
+        Takes a GessGame object and the playout budget.
+        Returns the most visited move as a tuple (from_location, to_location), or None if there's no legal move.
+        """
+        return self.search(game, playouts)['move']
+
+
+    def close(self):
+        """
+        Takes no parameter and shuts the worker processes down.
+        No return.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def best_move(game, playouts=1000, workers=None):
+    """
+    Takes a GessGame object, the playout budget and the number of worker processes (default: one per core).
+    Starts a pool for this one search. Use MCTSEngine to keep the pool between moves.
+    Returns the most visited move as a tuple (from_location, to_location), or None if there's no legal move.
+    """
+    with MCTSEngine(workers) as engine:
+        return engine.best_move(game, playouts)
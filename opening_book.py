@@ -0,0 +1,229 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: An opening book for Gess built from game record files (see game_records.py). Every game is replayed through GessGame
+# for its first moves, and each move played is counted under the Zobrist hash of the position it was played from (the hash is
+# the same in every process, see GessGame.ZOBRIST_KEYS), together with how the games that played it ended.
+#
+# File layout (little-endian):
+#   header   b'GBOK', version (u16), depth (u16), number of entries (u32), reserved (u32)
+#   keys     the position hash of every entry (u64 each), sorted
+#   entries  for each key in the same order: move (u16, encoded as in game_records.py), 2 reserved bytes,
+#            games played (u32), games black won (u32), games white won (u32)
+# A position has one entry per move played from it, most played first.
+#
+# The reader maps the file and only reads the header; a lookup is a binary search of the keys, straight on the memory map,
+# so a book of any size is ready as soon as it's opened and answers in a few microseconds.
+#
+# Usage:
+#   python opening_book.py build games.gess book.gbk --depth 12
+#   python opening_book.py show book.gbk c3 c6 r18 r15
+#   with OpeningBook('book.gbk') as book:
+#       move = book.choose_move(game)          # None when the position isn't in the book
+
+
+import argparse
+import mmap
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+
+from GessGame import GessGame, SQUARES
+from game_records import GameRecordReader, encode_move, decode_move
+
+
+MAGIC = b'GBOK'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+ENTRY = struct.Struct('<HxxIII')
+DEFAULT_DEPTH = 12
+
+
+def count_openings(record_paths, depth=DEFAULT_DEPTH, game_class=GessGame):
+    """
+    Takes the paths of game record files, the number of moves to read from the start of every game and the GessGame class to
+    replay them on. A game is read up to its first illegal move, if any.
+    Returns a dictionary {(position hash, move code): [games, black wins, white wins]}.
+    """
+    counts = {}
+    for path in record_paths:
+        with GameRecordReader(path) as reader:
+            for result, moves in reader.iter_games():
+                black_won = result == 'BLACK_WON'
+                white_won = result == 'WHITE_WON'
+                game = game_class()
+                for from_location, to_location in moves[:depth]:
+                    position = game.get_hash()
+                    if not game.make_move_idx(SQUARES[from_location], SQUARES[to_location]):
+                        break
+                    count = counts.setdefault((position, encode_move(from_location, to_location)), [0, 0, 0])
+                    count[0] += 1
+                    count[1] += black_won
+                    count[2] += white_won
+    return counts
+
+
+def write_book(path, counts, depth=DEFAULT_DEPTH, min_games=1):
+    """
+    Takes the path of the book file to create (an existing file is overwritten), the dictionary returned by count_openings(),
+    the depth it was counted to and the fewest games a move needs to be kept.
+    Returns the number of entries written.
+    """
+    entries = sorted(((position, -count[0], move, count) for (position, move), count in counts.items() if count[0] >= min_games))
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, depth, len(entries), 0))
+        file.write(struct.pack(f'<{len(entries)}Q', *[entry[0] for entry in entries]))
+        file.write(b''.join(ENTRY.pack(move, *count) for position, games, move, count in entries))
+    return len(entries)
+
+
+def build_book(record_paths, book_path, depth=DEFAULT_DEPTH, min_games=1, game_class=GessGame):
+    """
+    Takes the paths of game record files, the path of the book file to create, the number of moves to read from every game,
+    the fewest games a move needs to be kept and the GessGame class to replay the games on.
+    Returns the number of entries written.
+    """
+    return write_book(book_path, count_openings(record_paths, depth, game_class), depth, min_games)
+
+
+class OpeningBook:
+    """
+    Reads an opening book file through a memory map. Can be used as a context manager.
+
+    Totally 7 methods are implemented:
+        1) __init__(path)
+        2) __len__()
+        3) lookup(position)
+        4) choose_move(game, rng)
+        5) get_depth()
+        6) close()
+        7) __enter__() / __exit__()
+    """
+
+    def __init__(self, path):
+        """
+        Takes the path of a book file and maps it. Raises ValueError if it isn't a book file.
+        """
+        if sys.byteorder != 'little':
+            raise ValueError('opening books are read in place, which needs a little-endian machine')
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self._depth, self._count, reserved = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f'{path} is not a Gess opening book')
+        self._entries_offset = HEADER.size + 8 * self._count
+
+        # the keys as a sequence of integers, read from the map when they're compared
+        self._view = memoryview(self._map)
+        self._keys = self._view[HEADER.size:self._entries_offset].cast('Q')
+
+
+    def __len__(self):
+        """
+        Takes no parameter and returns the number of entries (position and move) in the book
+        """
+        return self._count
+
+
+    def get_depth(self):
+        """
+        Takes no parameter and returns the number of moves of every game the book was built from
+        """
+        return self._depth
+
+
+    def lookup(self, position):
+        """
+        Takes a GessGame object or a position hash (GessGame.get_hash()).
+        Returns the moves played from that position as a list of tuples (from_location, to_location, games, black wins, white wins),
+        most played first. The list is empty if the position isn't in the book.
+        """
+        if not isinstance(position, int):
+            position = position.get_hash()
+        keys = self._keys
+        first = bisect_left(keys, position)
+        if first == self._count or keys[first] != position:
+            return []
+        last = bisect_right(keys, position, first)
+
+        moves = []
+        for offset in range(self._entries_offset + first * ENTRY.size, self._entries_offset + last * ENTRY.size, ENTRY.size):
+            move, games, black_wins, white_wins = ENTRY.unpack_from(self._map, offset)
+            moves.append(decode_move(move) + (games, black_wins, white_wins))
+        return moves
+
+
+    def choose_move(self, game, rng=None):
+        """
+        Takes a GessGame object and optionally a random.Random. Returns a book move of the position as a tuple
+        (from_location, to_location): the most played one, or with rng one picked at random in proportion to how often it was played.
+        Returns None if the position isn't in the book or the game is over.
+        """
+        if game.get_game_state() != 'UNFINISHED':
+            return None
+        moves = self.lookup(game.get_hash())
+        if not moves:
+            return None
+        if rng is None:
+            return moves[0][:2]
+        return rng.choices(moves, weights=[move[2] for move in moves])[0][:2]
+
+
+    def close(self):
+        """
+        Takes no parameter and unmaps the file.
+        No return.
+        """
+        if self._map.closed:
+            return
+        self._keys.release()
+        self._view.release()
+        self._map.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """
+    Parses the command line and builds a book, or shows the book moves of a position
+    """
+    parser = argparse.ArgumentParser(description='Build or read a Gess opening book.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='build a book from game record files')
+    build.add_argument('records', nargs='+', help='game record files written by game_records.py')
+    build.add_argument('book', help='book file to create')
+    build.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help='moves read from the start of every game')
+    build.add_argument('--min-games', type=int, default=1, help='fewest games a move needs to be kept')
+    show = commands.add_parser('show', help='show the book moves of the position after the given moves')
+    show.add_argument('book')
+    show.add_argument('moves', nargs='*', help='locations, two per move: c3 c6 r18 r15 ...')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        entries = build_book(args.records, args.book, args.depth, args.min_games)
+        print(f'{entries} entries written to {args.book}')
+        return
+
+    if len(args.moves) % 2:
+        parser.error('moves are given as pairs of locations')
+    game = GessGame()
+    for from_location, to_location in zip(args.moves[::2], args.moves[1::2]):
+        if not game.make_move(from_location, to_location):
+            parser.error(f'{from_location} to {to_location} is illegal')
+    with OpeningBook(args.book) as book:
+        moves = book.lookup(game)
+    if not moves:
+        print('not in the book')
+    for from_location, to_location, games, black_wins, white_wins in moves:
+        print(f'{from_location} {to_location}: {games} games, black won {black_wins}, white won {white_wins}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Perft benchmark for the Gess move generator. perft(game, depth) counts the positions reachable in exactly depth moves
+# by generating, making and taking back every legal move, so a change to is_move_legal(), move_and_capture() or has_ring() that
+# breaks the rules changes the counts, and one that makes them slower shows up in the nodes per second.
+# Reference counts for the initial position and a few stored positions (move lists played from the initial position) are checked
+# in as perft_positions.json. The command line runs them and prints a report, as JSON with --json.
+#
+# Usage:
+#   python perft.py                        # every stored position, every depth with a reference count
+#   python perft.py --depth 2 --engine list --json
+
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from GessGame import GessGame
+from GessGame_Bitboard import GessGame_Bitboard
+from GessGame_Compact import GessGame_Compact
+
+
+ENGINES = {'list': GessGame, 'bitboard': GessGame_Bitboard, 'compact': GessGame_Compact}
+POSITIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perft_positions.json')
+
+
+class PerftCounter:
+    """
+    Counts the leaf positions of a game tree and the time spent in each phase: generating moves, making them and taking them back.
+
+    Totally 2 methods are implemented:
+        1) __init__()
+        2) perft(game, depth)
+    """
+
+    def __init__(self):
+        """
+        Takes no parameter and initializes the counters and phase timers at 0
+        """
+        self.nodes = 0
+        self.phases = {'generate': 0.0, 'make': 0.0, 'unmake': 0.0}
+
+
+    def perft(self, game, depth):
+        """
+        Takes a GessGame object and a depth. Returns the number of positions reached by every sequence of depth legal moves.
+        Moves at the last level are counted without being made. The game is left as it was.
+        """
+        self.nodes += 1
+        clock = time.perf_counter
+
+        start = clock()
+        moves = game.generate_legal_moves_idx()
+        self.phases['generate'] += clock() - start
+        if depth <= 1:
+            return len(moves) if depth == 1 else 1
+
+        leaves = 0
+        for move in moves:
+            start = clock()
+            game.make_move_idx(move[0], move[1])
+            self.phases['make'] += clock() - start
+
+            leaves += self.perft(game, depth - 1)
+
+            start = clock()
+            game.unmake_move()
+            self.phases['unmake'] += clock() - start
+        return leaves
+
+
+def perft(game, depth):
+    """
+    Takes a GessGame object and a depth and returns the number of leaf positions at that depth
+    """
+    return PerftCounter().perft(game, depth)
+
+
+def load_positions(path=POSITIONS_FILE):
+    """
+    Takes the path of a positions file and returns its list of positions: dictionaries with a 'name', the 'moves' played from the
+    initial position and the reference 'counts' for depth 1, 2, ...
+    """
+    with open(path) as file:
+        return json.load(file)['positions']
+
+
+def setup_position(position, game_class=GessGame_Bitboard):
+    """
+    Takes a stored position and the GessGame class to use. Returns a new game with the position's moves played.
+    """
+    game = game_class()
+    for from_location, to_location in position['moves']:
+        if not game.make_move(from_location, to_location):
+            raise ValueError(f"position {position['name']}: {from_location} to {to_location} is illegal")
+    return game
+
+
+def peak_memory_kb():
+    """
+    Takes no parameter and returns the peak resident memory of this process in kilobytes, or None where it can't be measured
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak    # bytes on macOS, kilobytes elsewhere
+
+
+def run_suite(positions, max_depth=None, game_class=GessGame_Bitboard):
+    """
+    Takes the stored positions, the deepest depth to run (default: every depth with a reference count) and the GessGame class.
+    Returns a report dictionary with one result per position and depth: nodes, expected nodes, whether they match,
+    seconds, nodes per second and the seconds spent in each phase.
+    """
+    results = []
+    for position in positions:
+        counts = position.get('counts', [])
+        depths = range(1, (max_depth or len(counts)) + 1)
+        for depth in depths:
+            game = setup_position(position, game_class)
+            counter = PerftCounter()
+            start = time.perf_counter()
+            leaves = counter.perft(game, depth)
+            seconds = time.perf_counter() - start
+            expected = counts[depth - 1] if depth <= len(counts) else None
+            results.append({'position': position['name'], 'depth': depth, 'nodes': leaves, 'expected': expected,
+                            'ok': expected is None or leaves == expected, 'seconds': seconds,
+                            'nps': leaves / seconds if seconds > 0 else 0.0, 'interior_nodes': counter.nodes,
+                            'phases': counter.phases})
+
+    return {'engine': game_class.__name__, 'results': results, 'ok': all(result['ok'] for result in results),
+            'peak_memory_kb': peak_memory_kb()}
+
+
+def main():
+    """
+    Parses the command line, runs the suite and prints the report. Exits with status 1 if a count doesn't match.
+    """
+    parser = argparse.ArgumentParser(description='Count Gess move-generation leaf nodes and compare them with reference counts.')
+    parser.add_argument('--depth', type=int, default=None, help='deepest depth (default: every depth with a reference count)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='bitboard')
+    parser.add_argument('--positions', default=POSITIONS_FILE, help='positions file')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    report = run_suite(load_positions(args.positions), args.depth, ENGINES[args.engine])
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for result in report['results']:
+            phases = ', '.join(f'{phase} {seconds:.2f}s' for phase, seconds in result['phases'].items())
+            status = 'ok' if result['ok'] else f"MISMATCH, expected {result['expected']}"
+            print(f"{result['position']} depth {result['depth']}: {result['nodes']} nodes in {result['seconds']:.2f}s "
+                  f"({result['nps']:.0f} nodes/s; {phases}) {status}")
+        print(f"{report['engine']}, peak memory {report['peak_memory_kb']} kB")
+
+    if not report['ok']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
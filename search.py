@@ -0,0 +1,254 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: A computer opponent for Gess. Negamax alpha-beta search with iterative deepening on top of any GessGame object
+# (GessGame_Bitboard is the fastest). Moves are made and taken back with make_move()/unmake_move(), positions are cached in a
+# TranspositionTable keyed on get_hash(), and the search stops at a hard deadline, returning the best move found so far.
+# Captures and ring threats are searched first. Every search reports how many nodes it visited per second.
+# Inside the search moves are tuples of squares (the *_idx methods of GessGame), so no location string is parsed or built;
+# only the move returned to the caller is converted back to location strings.
+#
+# Usage:
+#   move = best_move(game, 2000)          # ('c3', 'c6'), or None when there's no legal move
+#   result = search(game, 2000)           # {'move', 'score', 'depth', 'nodes', 'seconds', 'nps'}
+
+
+import time
+
+from GessGame import LOCATIONS
+from TranspositionTable import TranspositionTable
+
+
+# scores are from the point of view of whoever's turn it is
+WIN_SCORE = 1000000
+RING_SCORE = 50     # a ring is worth this many stones
+
+# scores this far from 0 are wins or losses a known number of plies away, never a static score
+MATE_THRESHOLD = WIN_SCORE // 2
+
+# flags telling what kind of bound a stored score is
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+def score_to_table(score, ply):
+    """
+    Takes a score found ply moves from the root and returns it as stored in the TranspositionTable: a win or loss counted
+    from the position itself rather than from the root, so it's right wherever the position comes up again
+    """
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """
+    Takes a score read from the TranspositionTable for a position ply moves from the root and returns it counted from the root,
+    the reverse of score_to_table()
+    """
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the deadline has passed
+    """
+    pass
+
+
+def evaluate(game):
+    """
+    Takes a GessGame object of an unfinished game and returns its static score for whoever's turn it is:
+    the difference in stones plus RING_SCORE for each ring of difference
+    """
+    if game.get_turn() == 'black':
+        stone, opponent_stone = '●', '○'
+    else:
+        stone, opponent_stone = '○', '●'
+
+    return (game.count_stones(stone) - game.count_stones(opponent_stone)
+            + RING_SCORE * (game.count_rings(stone) - game.count_rings(opponent_stone)))
+
+
+def order_moves(game, moves, first_move=None):
+    """
+    Takes a GessGame object, its list of legal moves as tuples of squares and optionally the best move from an earlier search.
+    Returns the moves sorted so that first_move comes first, then the moves that break the most rings, then the moves
+    that capture the most stones.
+    """
+    scored = []
+    for move in moves:
+        stones, rings = game.move_captures_idx(move[0], move[1])
+        scored.append((move == first_move, rings, stones, move))
+    scored.sort(key=lambda entry: entry[:3], reverse=True)
+    return [entry[3] for entry in scored]
+
+
+class Searcher:
+    """
+    Represents one search of one position. Keeps the deadline and the node count, which search() reports.
+
+    Totally 3 methods are implemented:
+        1) __init__(game, deadline, table)
+        2) search_root(depth, first_move, root_moves)
+        3) negamax(depth, alpha, beta, ply)
+    """
+
+    def __init__(self, game, deadline, table):
+        """
+        Takes the GessGame object to search, the deadline as a time.perf_counter() value and the TranspositionTable to use
+        """
+        self._game = game
+        self._deadline = deadline
+        self._table = table
+        self.nodes = 0
+        self.partial_best = None
+
+
+    def search_root(self, depth, first_move, root_moves):
+        """
+        Takes the depth to search, the best move of the previous iteration and the legal moves of the root.
+        Returns (best score, best move). Raises SearchTimeout if the deadline passes, leaving the best move found by then
+        in self.partial_best when at least one move was fully searched.
+        """
+        game = self._game
+        alpha = -WIN_SCORE - 1
+        best_move = None
+        self.partial_best = None
+
+        for move in order_moves(game, root_moves, first_move):
+            game.make_move_idx(move[0], move[1])
+            try:
+                score = -self.negamax(depth - 1, -WIN_SCORE - 1, -alpha, 1)
+            finally:
+                game.unmake_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self.partial_best = (score, move)
+
+        self._table.store(game.get_hash(), (depth, alpha, EXACT, best_move), depth)
+        return alpha, best_move
+
+
+    def negamax(self, depth, alpha, beta, ply):
+        """
+        Takes the depth left, the alpha-beta window and the distance from the root.
+        Returns the score of the current position for whoever's turn it is.
+        """
+        game = self._game
+        self.nodes += 1
+        if time.perf_counter() >= self._deadline:
+            raise SearchTimeout
+
+        # the player who just moved won: prefer the quickest win and the slowest loss
+        if game.get_game_state() != 'UNFINISHED':
+            return -(WIN_SCORE - ply)
+        if depth <= 0:
+            return evaluate(game)
+
+        key = game.get_hash()
+        entry = self._table.probe(key)
+        first_move = None
+        if entry is not None:
+            stored_depth, stored_score, flag, first_move = entry
+            if stored_depth >= depth:
+                stored_score = score_from_table(stored_score, ply)
+                if flag == EXACT:
+                    return stored_score
+                if flag == LOWER_BOUND and stored_score >= beta:
+                    return stored_score
+                if flag == UPPER_BOUND and stored_score <= alpha:
+                    return stored_score
+
+        moves = game.generate_legal_moves_idx()
+        if not moves:
+            return 0    # no legal move: neither side can make progress
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in order_moves(game, moves, first_move):
+            game.make_move_idx(move[0], move[1])
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            # every move failed low, so best_move is no better than the others: keep the move the entry already had
+            flag = UPPER_BOUND
+            best_move = first_move
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, (depth, score_to_table(best_score, ply), flag, best_move), depth)
+
+        return best_score
+
+
+def search(game, time_ms, max_depth=64, table=None):
+    """
+    Takes a GessGame object, the time budget in milliseconds, the deepest depth to try and optionally a TranspositionTable
+    to reuse between searches. Searches 1, 2, 3... moves deep until the time is up or max_depth is done.
+    The game is left exactly as it was.
+    Returns a dictionary: the best move (None when there's no legal move), its score, the deepest depth fully searched,
+    the nodes visited, the seconds spent and the nodes per second.
+    """
+    start = time.perf_counter()
+    deadline = start + time_ms / 1000
+    if table is None:
+        table = TranspositionTable()
+    table.new_search()
+
+    searcher = Searcher(game, deadline, table)
+    result = {'move': None, 'score': 0, 'depth': 0}
+
+    if game.get_game_state() == 'UNFINISHED':
+        root_moves = game.generate_legal_moves_idx()
+        if root_moves:
+            # something to play even if the first iteration doesn't finish
+            result['move'] = order_moves(game, root_moves)[0]
+
+            for depth in range(1, max_depth + 1):
+                try:
+                    score, move = searcher.search_root(depth, result['move'], root_moves)
+                except SearchTimeout:
+                    # the previous best move is searched first, so a move that beat it in the unfinished iteration is better
+                    if searcher.partial_best is not None and searcher.partial_best[1] != result['move']:
+                        result['score'], result['move'] = searcher.partial_best
+                    break
+                result.update(move=move, score=score, depth=depth)
+                if abs(score) >= WIN_SCORE - max_depth:
+                    break   # a forced win or loss was found, searching deeper won't change it
+
+    if result['move'] is not None:
+        result['move'] = (LOCATIONS[result['move'][0]], LOCATIONS[result['move'][1]])
+
+    seconds = time.perf_counter() - start
+    result['nodes'] = searcher.nodes
+    result['seconds'] = seconds
+    result['nps'] = searcher.nodes / seconds if seconds > 0 else 0.0
+    return result
+
+
+def best_move(game, time_ms):
+    """
+    Takes a GessGame object and the time budget in milliseconds.
+    Returns the best move found in that time as a tuple (from_location, to_location), or None if there's no legal move.
+    """
+    return search(game, time_ms)['move']
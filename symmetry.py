@@ -0,0 +1,148 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Left-right mirror symmetry of Gess positions. The rules treat every direction alike, so the mirror image of a position
+# (column c swapped with column 19 - c) has the mirror images of its legal moves and the same outcome, and keying caches,
+# transposition tables and game databases on the canonical orientation of a position stores both images once.
+# The initial board is almost but not quite symmetric (rows 18 and 3 have a stone on column i and none on column l), so games
+# played from it only meet mirror images by transposition; the gain is largest for positions from anywhere else (analysis,
+# positions loaded with GessGame.from_fen(), collections of positions from many sources).
+#
+# The canonical orientation is the one with the smaller Zobrist hash: a position and its mirror image get the same canonical hash.
+# The hash of the mirror image is worked out from the stone masks with mirrored keys, so nothing is copied or mirrored to find it.
+# A symmetric position is its own mirror image and is never mirrored.
+#
+# Usage:
+#   key, mirrored = canonical_hash(game)
+#   table.store(key, orient_move(move, mirrored))          # a move of the game, in the canonical orientation
+#   move = orient_move(table.probe(key), mirrored)           # back to the game's orientation
+
+
+from GessGame import LOCATIONS, SQUARES, ZOBRIST_KEYS, ZOBRIST_TURN, encode_position, decode_position, area_to_mask
+
+
+# mirror image of every square of the 20x20 board: same row, column 19 - column
+MIRROR_SQUARES = tuple(square - square % 20 + 19 - square % 20 for square in range(400))
+
+# mirror image of every location string, like 'c3' <-> 'r3'
+MIRROR_LOCATIONS = {location: LOCATIONS[MIRROR_SQUARES[square]] for location, square in SQUARES.items()}
+
+
+
+def _byte_tables(keys):
+    """
+    Takes 400 Zobrist keys, one per square. Returns 50 tables, one per byte of a mask (little-endian), each holding the XOR of
+    the keys of the squares set in every value of that byte, so the hash of a mask takes 50 lookups instead of one per stone.
+    """
+    tables = []
+    for byte in range(50):
+        table = [0] * 256
+        for value in range(1, 256):
+            lowest = value & -value
+            table[value] = table[value ^ lowest] ^ keys[byte*8 + lowest.bit_length() - 1]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+# byte tables of the Zobrist keys of each stone read from the mirrored square: they hash a mask as its mirror image
+MIRROR_BYTE_KEYS = {stone: _byte_tables([keys[MIRROR_SQUARES[square]] for square in range(400)])
+                    for stone, keys in ZOBRIST_KEYS.items()}
+
+# the 9 bits of every 9-bit number in reverse order, to reverse an 18-square row of an area mask in two lookups
+_REVERSED_9_BITS = tuple(int(format(bits, '09b')[::-1], 2) for bits in range(512))
+
+
+def mirror_square(square):
+    """
+    Takes a square (board row * 20 + board column) and returns the square of its mirror image
+    """
+    return MIRROR_SQUARES[square]
+
+
+def mirror_location(location):
+    """
+    Takes a location string like 'c3' and returns the location of its mirror image, like 'r3'
+    """
+    return MIRROR_LOCATIONS[location]
+
+
+def orient_move(move, mirrored):
+    """
+    Takes a move as (from_square, to_square) or (from_location, to_location), or None, and whether to mirror it.
+    Returns the move mirrored if mirrored is true, otherwise unchanged. Mirroring twice gives back the move, so the same call maps
+    a move into the canonical orientation and back.
+    """
+    if not mirrored or move is None:
+        return move
+    from_position, to_position = move
+    if isinstance(from_position, str):
+        return MIRROR_LOCATIONS[from_position], MIRROR_LOCATIONS[to_position]
+    return MIRROR_SQUARES[from_position], MIRROR_SQUARES[to_position]
+
+
+def mirror_area(area):
+    """
+    Takes an area mask of the 18x18 playable area (see GessGame.encode_position()) and returns the area mask of its mirror image
+    """
+    mirrored = 0
+    for shift in range(0, 324, 18):
+        row = area >> shift & 0x3FFFF
+        mirrored |= (_REVERSED_9_BITS[row & 511] << 9 | _REVERSED_9_BITS[row >> 9]) << shift
+    return mirrored
+
+
+def mirror_position(data):
+    """
+    Takes a position as the bytes returned by GessGame.to_bytes() and returns the bytes of its mirror image
+    """
+    black, white, turn, state = decode_position(data)
+    return encode_position(mirror_area(black), mirror_area(white), turn, state)
+
+
+def _stone_masks(game):
+    """
+    Takes a GessGame object and returns its black and white masks of the 20x20 board without copying the board
+    """
+    get_position = getattr(game, 'get_position', None)     # GessGame_Bitboard and GessGame_Compact keep the masks
+    if get_position is not None:
+        black, white, turn, state = get_position()
+        return black, white
+    black, white, turn, state = decode_position(game.to_bytes())
+    return area_to_mask(black), area_to_mask(white)
+
+
+def mirror_hash(game):
+    """
+    Takes a GessGame object and returns the Zobrist hash its mirror image would have
+    """
+    black, white = _stone_masks(game)
+    position_hash = 0
+    for tables, mask in ((MIRROR_BYTE_KEYS['●'], black), (MIRROR_BYTE_KEYS['○'], white)):
+        for table, value in zip(tables, mask.to_bytes(50, 'little')):
+            position_hash ^= table[value]
+    if game.get_turn() == 'white':
+        position_hash ^= ZOBRIST_TURN
+    return position_hash
+
+
+def canonical_hash(game):
+    """
+    Takes a GessGame object and returns (canonical hash, mirrored): the smaller of the hashes of the position and of its mirror
+    image, and whether that's the mirror image's, i.e. whether moves have to go through orient_move() to match the key
+    """
+    position_hash = game.get_hash()
+    mirrored_hash = mirror_hash(game)
+    if mirrored_hash < position_hash:
+        return mirrored_hash, True
+    return position_hash, False
+
+
+def canonical_position(game):
+    """
+    Takes a GessGame object and returns (position bytes, mirrored): the position in its canonical orientation as POSITION_BYTES
+    bytes (see GessGame.to_bytes()), and whether that's the mirror image
+    """
+    position_hash, mirrored = canonical_hash(game)
+    data = game.to_bytes()
+    if mirrored:
+        data = mirror_position(data)
+    return data, mirrored
@@ -0,0 +1,45 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Positions the tests run on: the stored perft positions (initial, opening, middlegame, endgame) and positions reached
+# by random legal moves from a fixed seed, so every run checks the same positions. Positions are POSITION_BYTES bytes
+# (see GessGame.to_bytes()), which every engine loads with from_bytes().
+#
+# Usage:
+#   for name, data in sample_positions(seed=1, count=4):
+#       game = GessGame_Compact.from_bytes(data)
+
+
+import random
+
+from GessGame_Bitboard import GessGame_Bitboard
+from perft import load_positions, setup_position
+
+
+def random_game(rng, max_moves=80, game_class=GessGame_Bitboard):
+    """
+    Takes a random.Random, the most moves to play and the GessGame class. Returns (new game, moves played): up to max_moves
+    random legal moves from the initial position as tuples of squares, fewer if the game ends or has no legal move first.
+    """
+    game = game_class()
+    moves = []
+    for _ in range(rng.randrange(max_moves + 1)):
+        legal = game.generate_legal_moves_idx()
+        if not legal or game.get_game_state() != 'UNFINISHED':
+            break
+        move = rng.choice(legal)
+        game.make_move_idx(*move)
+        moves.append(move)
+    return game, moves
+
+
+def sample_positions(seed=0, count=4, max_moves=80):
+    """
+    Takes a seed, the number of random positions and the most moves played to reach one.
+    Returns a list of (name, position bytes): every stored perft position, then the random positions.
+    """
+    positions = [(position['name'], setup_position(position).to_bytes()) for position in load_positions()]
+    rng = random.Random(seed)
+    for number in range(count):
+        game, moves = random_game(rng, max_moves)
+        positions.append((f'random {seed}-{number}', game.to_bytes()))
+    return positions
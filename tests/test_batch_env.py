@@ -0,0 +1,102 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Checks BatchEnv (batch_env.py) against GessGame_Bitboard.make_move_idx(): a batch of games at different stages is
+# stepped with a mix of legal moves and moves the games turn down, and after every step each board, turn and game state must be
+# those of the same move made on its own game. Skipped when NumPy isn't installed.
+#
+# Usage:
+#   python -m unittest tests.test_batch_env
+
+
+import random
+import unittest
+
+from GessGame import DIRECTIONS
+from GessGame_Bitboard import GessGame_Bitboard
+from tests.sample_positions import random_game
+
+try:
+    import numpy as np
+    from batch_env import BatchEnv, BLACK, WHITE, STATE_NAMES
+    from batch_boards import board_to_array
+except ImportError:
+    np = None
+
+
+def random_move(game, rng):
+    """
+    Takes a game and a random.Random. Returns a move for it as a tuple of squares: mostly a legal move, otherwise a move from a
+    random center in a random direction, or between two random squares, which the game will most likely turn down
+    """
+    legal = game.generate_legal_moves_idx() if game.get_game_state() == 'UNFINISHED' else []
+    choice = rng.random()
+    if legal and choice < 0.6:
+        return rng.choice(legal)
+    if choice < 0.85:
+        from_square = rng.randrange(21, 379)
+        dr, dc = rng.choice(DIRECTIONS)
+        to_square = from_square + rng.randrange(1, 8) * (dr*20 + dc)
+        if 0 <= to_square < 400:
+            return from_square, to_square
+    return rng.randrange(400), rng.randrange(400)
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestBatchEnv(unittest.TestCase):
+    """
+    BatchEnv stepped side by side with one GessGame_Bitboard per game
+    """
+
+    def assert_same(self, env, games):
+        for index, game in enumerate(games):
+            self.assertTrue(np.array_equal(env.boards[index], board_to_array(game.get_board())), f'board of game {index}')
+            self.assertEqual(env.turns[index], BLACK if game.get_turn() == 'black' else WHITE, f'turn of game {index}')
+            self.assertEqual(STATE_NAMES[env.states[index]], game.get_game_state(), f'state of game {index}')
+
+
+    def test_step_matches_make_move(self):
+        rng = random.Random(12)
+        games = [random_game(rng, 60)[0] for _ in range(48)]
+        env = BatchEnv.from_games(games, auto_reset=False)
+        self.assert_same(env, games)
+
+        for step in range(40):
+            moves = [random_move(game, rng) for game in games]
+            from_squares = np.array([move[0] for move in moves])
+            to_squares = np.array([move[1] for move in moves])
+
+            expected = [game.make_move_idx(*move) for game, move in zip(games, moves)]
+            legal = env.legal_moves(from_squares, to_squares)
+            accepted, results = env.step(from_squares, to_squares)
+            with self.subTest(step=step):
+                self.assertEqual(list(accepted), expected)
+                self.assertEqual(list(legal), expected)
+                for index, game in enumerate(games):
+                    if accepted[index] and game.get_game_state() != 'UNFINISHED':
+                        self.assertEqual(STATE_NAMES[results[index]], game.get_game_state())
+                    else:
+                        self.assertEqual(results[index], 0)
+                self.assert_same(env, games)
+
+
+    def test_auto_reset(self):
+        rng = random.Random(13)
+        for attempt in range(200):
+            game, moves = random_game(rng, 200)
+            if game.get_game_state() != 'UNFINISHED':
+                break
+        self.assertNotEqual(game.get_game_state(), 'UNFINISHED')
+        last_move = moves[-1]
+        game.unmake_move()
+        winner = 'BLACK_WON' if game.get_turn() == 'black' else 'WHITE_WON'
+
+        env = BatchEnv.from_games([game, GessGame_Bitboard()])
+        accepted, results = env.step(np.array([last_move[0], 0]), np.array([last_move[1], 0]))
+        self.assertEqual(list(accepted), [True, False])
+        self.assertEqual([STATE_NAMES[result] for result in results], [winner, 'UNFINISHED'])
+        self.assert_same(env, [GessGame_Bitboard(), GessGame_Bitboard()])
+        self.assertEqual(env.get_game(0).to_bytes(), GessGame_Bitboard().to_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,241 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Round trips of the position codecs (to_bytes()/from_bytes(), to_fen()/from_fen(), GessGame_Compact snapshots) on
+# every engine, and of the move codes and files of game_records.py. A position saved by one engine loads into any other with the
+# same board, turn, game state and hash, and a malformed position is turned down with ValueError.
+#
+# Usage:
+#   python -m unittest tests.test_codecs
+
+
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from GessGame import (GessGame, LOCATIONS, DIRECTIONS, POSITION_BYTES, encode_position, decode_position, encode_fen,
+                      decode_fen)
+from GessGame_Bitboard import GessGame_Bitboard
+from GessGame_Compact import GessGame_Compact
+from game_records import HEADER, GAME_HEADER, GameRecordReader, GameRecordWriter, encode_move, decode_move
+from tests.sample_positions import random_game, sample_positions
+
+
+ENGINES = (GessGame, GessGame_Bitboard, GessGame_Compact)
+
+
+def position_of(game):
+    """
+    Takes a game of any engine and returns everything a codec has to keep: (board, turn, game state, hash)
+    """
+    return game.get_board(), game.get_turn(), game.get_game_state(), game.get_hash()
+
+
+class TestPositionCodec(unittest.TestCase):
+    """
+    Binary and FEN-like positions of every engine
+    """
+
+    def test_initial_position(self):
+        fen = GessGame().to_fen()
+        self.assertTrue(fen.startswith('1w1w1wwwwwwww1w1w1/www1w1wwww1w1w1www/'))
+        self.assertTrue(fen.endswith(' b -'))
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                self.assertEqual(engine().to_fen(), fen)
+                self.assertEqual(len(engine().to_bytes()), POSITION_BYTES)
+                self.assertEqual(position_of(engine.from_fen(fen)), position_of(GessGame()))
+
+
+    def test_round_trips_between_engines(self):
+        for name, data in sample_positions(seed=1, count=4):
+            expected = position_of(GessGame.from_bytes(data))
+            fen = GessGame.from_bytes(data).to_fen()
+            for saver in ENGINES:
+                game = saver.from_bytes(data)
+                for loader in ENGINES:
+                    with self.subTest(position=name, saver=saver.__name__, loader=loader.__name__):
+                        self.assertEqual(game.to_bytes(), data)
+                        self.assertEqual(game.to_fen(), fen)
+                        self.assertEqual(position_of(loader.from_bytes(game.to_bytes())), expected)
+                        self.assertEqual(position_of(loader.from_fen(game.to_fen())), expected)
+
+
+    def test_turn_and_state(self):
+        for engine in ENGINES:
+            game = engine()
+            game.make_move('c3', 'c6')
+            game.resign_game()
+            with self.subTest(engine=engine.__name__):
+                loaded = engine.from_fen(game.to_fen())
+                self.assertEqual((loaded.get_turn(), loaded.get_game_state()), ('white', 'BLACK_WON'))
+                self.assertEqual(position_of(engine.from_bytes(game.to_bytes())), position_of(game))
+                self.assertFalse(loaded.unmake_move())
+
+
+    def test_loaded_game_plays_on(self):
+        rng = random.Random(4)
+        original, moves = random_game(rng, 30)
+        for engine in ENGINES:
+            game = engine.from_bytes(original.to_bytes())
+            with self.subTest(engine=engine.__name__):
+                self.assertEqual(game.generate_legal_moves_idx(), original.generate_legal_moves_idx())
+                move = original.generate_legal_moves_idx()[0]
+                self.assertTrue(game.make_move_idx(*move))
+                self.assertTrue(game.unmake_move())
+                self.assertEqual(game.to_bytes(), original.to_bytes())
+
+
+    def test_area_masks(self):
+        rng = random.Random(2)
+        for _ in range(20):
+            squares = rng.sample(range(324), 120)
+            black = sum(1 << square for square in squares[:60])
+            white = sum(1 << square for square in squares[60:])
+            for turn, state in (('black', 'UNFINISHED'), ('white', 'WHITE_WON')):
+                self.assertEqual(decode_position(encode_position(black, white, turn, state)), (black, white, turn, state))
+                self.assertEqual(decode_fen(encode_fen(black, white, turn, state)), (black, white, turn, state))
+
+
+    def test_malformed_positions(self):
+        data = GessGame().to_bytes()
+        both = (1 | 1 << 324).to_bytes(81, 'little') + bytes(1)
+        for bad in (data[:-1], data + b'\0', both, data[:81] + bytes((7,))):
+            for engine in ENGINES:
+                with self.subTest(data=bad[-4:], engine=engine.__name__):
+                    with self.assertRaises(ValueError):
+                        engine.from_bytes(bad)
+
+        fen = GessGame().to_fen()
+        placement = fen.split()[0]
+        for bad in ('', fen + ' x', placement + ' x -', placement + ' b ?', placement.replace('1w1w1w', 'zw1w1w', 1) + ' b -',
+                    placement.replace('/', '', 1) + ' b -', placement.replace('1w', '2w', 1) + ' b -'):
+            for engine in ENGINES:
+                with self.subTest(fen=bad[:20], engine=engine.__name__):
+                    with self.assertRaises(ValueError):
+                        engine.from_fen(bad)
+
+
+    def test_compact_snapshot(self):
+        for name, data in sample_positions(seed=6, count=2):
+            game = GessGame_Compact.from_bytes(data)
+            with self.subTest(position=name):
+                self.assertEqual(GessGame_Compact.from_snapshot(game.snapshot()).to_bytes(), data)
+                self.assertEqual(position_of(game.copy()), position_of(game))
+                self.assertEqual(position_of(GessGame_Compact.from_game(GessGame.from_bytes(data))), position_of(game))
+        with self.assertRaises(ValueError):
+            GessGame_Compact.from_snapshot(bytes(10))
+
+
+class TestGameRecords(unittest.TestCase):
+    """
+    Move codes and record files of game_records.py
+    """
+
+    def test_move_codes(self):
+        codes = set()
+        count = 0
+        for from_square in (21, 29, 30, 210, 378):
+            row, column = divmod(from_square, 20)
+            for dr, dc in DIRECTIONS:
+                distance = 1
+                while 1 <= row + distance*dr <= 18 and 1 <= column + distance*dc <= 18:
+                    move = (LOCATIONS[from_square], LOCATIONS[from_square + distance*(dr*20 + dc)])
+                    code = encode_move(*move)
+                    self.assertLess(code, 1 << 16)
+                    self.assertEqual(decode_move(code), move)
+                    codes.add(code)
+                    count += 1
+                    distance += 1
+        self.assertEqual(len(codes), count)     # no two moves share a code
+
+        for bad in (('c3', 'c3'), ('c3', 'd5'), ('a3', 'a6'), ('c3', 'c1'), ('c3', 'z9')):
+            with self.assertRaises(ValueError):
+                encode_move(*bad)
+
+
+    def test_corrupt_move_codes(self):
+        valid = 0
+        for code in range(1 << 16):
+            try:
+                from_location, to_location = decode_move(code)
+            except ValueError:
+                continue
+            valid += 1
+            self.assertEqual(encode_move(from_location, to_location), code)
+        # every valid code is a move of encode_move(), so there are as many as moves in the playable area
+        self.assertEqual(valid, sum(min(18 - row if dr > 0 else row - 1 if dr < 0 else 18,
+                                        18 - column if dc > 0 else column - 1 if dc < 0 else 18)
+                                    for row in range(1, 19) for column in range(1, 19) for dr, dc in DIRECTIONS))
+        # b2 one square south, off the board: it would wrap into another row if it weren't checked
+        south_of_b2 = (17*18 + 0) * 136 + DIRECTIONS.index((1, 0)) * 17
+        for bad in (-1, 324 * 136, 65535, 44064, south_of_b2):
+            with self.subTest(code=bad):
+                with self.assertRaises(ValueError):
+                    decode_move(bad)
+
+
+    def test_record_file(self):
+        rng = random.Random(8)
+        games = []
+        for _ in range(5):
+            game, moves = random_game(rng, 60)
+            games.append(([(LOCATIONS[f], LOCATIONS[t]) for f, t in moves], game.get_game_state(), game.to_bytes()))
+        games.append(([], 'UNFINISHED', GessGame().to_bytes()))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.gess')
+            with GameRecordWriter(path) as writer:
+                for moves, result, data in games:
+                    writer.add_game(moves, result)
+            with GameRecordReader(path) as reader:
+                self.assertEqual(len(reader), len(games))
+                for number, (moves, result, data) in enumerate(games):
+                    with self.subTest(game=number):
+                        self.assertEqual(reader.get_moves(number), moves)
+                        self.assertEqual(reader.get_result(number), result)
+                        self.assertEqual(reader.replay(number).to_bytes(), data)
+                self.assertEqual([(result, moves) for moves, result, data in games], list(reader.iter_games()))
+
+
+    def test_damaged_record_file(self):
+        rng = random.Random(10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.gess')
+            with GameRecordWriter(path) as writer:
+                for _ in range(3):
+                    game, moves = random_game(rng, 20)
+                    writer.add_game([(LOCATIONS[f], LOCATIONS[t]) for f, t in moves], game.get_game_state())
+            with open(path, 'rb') as file:
+                data = file.read()
+            with GameRecordReader(path) as reader:
+                second_game = (reader.get_result(1), reader.get_moves(1))
+
+            # cut short anywhere before the end of the index, or not a record file at all
+            for size in (0, 10, HEADER.size, 100, len(data) - 1):
+                with self.subTest(size=size):
+                    with open(path, 'wb') as file:
+                        file.write(data[:size])
+                    with self.assertRaises(ValueError):
+                        GameRecordReader(path)
+
+            # one damaged game: the others can still be read
+            index_offset = HEADER.unpack_from(data, 0)[4]
+            first_game = HEADER.size
+            damages = {'corrupt move': (first_game + GAME_HEADER.size, struct.pack('<H', 65535)),
+                       'game past the end': (index_offset, struct.pack('<Q', len(data))),
+                       'moves past the end': (first_game + 4, struct.pack('<I', len(data))),
+                       'unknown result': (first_game, bytes((3,)))}
+            for name, (offset, patch) in damages.items():
+                with self.subTest(damage=name):
+                    with open(path, 'wb') as file:
+                        file.write(data[:offset] + patch + data[offset + len(patch):])
+                    with GameRecordReader(path) as reader:
+                        with self.assertRaises(ValueError):
+                            reader.get_moves(0) if name == 'corrupt move' else reader.get_result(0)
+                        self.assertEqual((reader.get_result(1), reader.get_moves(1)), second_game)
+
+
+if __name__ == '__main__':
+    unittest.main()
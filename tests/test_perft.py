@@ -0,0 +1,41 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Checks the perft counts of every engine against the reference counts in perft_positions.json. A change to move
+# generation, making or taking back moves that breaks the rules changes a count. Every engine runs the counts up to depth 2,
+# GessGame_Bitboard also the deeper ones.
+#
+# Usage:
+#   python -m unittest tests.test_perft
+
+
+import unittest
+
+from GessGame import GessGame
+from GessGame_Bitboard import GessGame_Bitboard
+from GessGame_Compact import GessGame_Compact
+from perft import load_positions, perft, setup_position
+
+
+ENGINES = (GessGame, GessGame_Bitboard, GessGame_Compact)
+MAX_DEPTH = 2       # for every engine but GessGame_Bitboard, which runs every stored count
+
+
+class TestPerft(unittest.TestCase):
+    """
+    Perft counts of the stored positions
+    """
+
+    def test_counts(self):
+        for position in load_positions():
+            for engine in ENGINES:
+                game = setup_position(position, engine)
+                before = game.to_bytes()
+                counts = position['counts'] if engine is GessGame_Bitboard else position['counts'][:MAX_DEPTH]
+                for depth, expected in enumerate(counts, 1):
+                    with self.subTest(position=position['name'], engine=engine.__name__, depth=depth):
+                        self.assertEqual(perft(game, depth), expected)
+                        self.assertEqual(game.to_bytes(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
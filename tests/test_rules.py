@@ -0,0 +1,156 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Checks the three engines (GessGame, GessGame_Bitboard, GessGame_Compact) against the rules as first written
+# (tests/reference_game.py): every move the reference accepts or rejects is accepted or rejected the same way by
+# is_move_legal(), is_move_legal_idx() and check_move_idx(), generate_legal_moves_idx() lists exactly the moves the reference
+# accepts, and games played on all of them leave the same boards. make_move()/unmake_move() must give back every position.
+#
+# Usage:
+#   python -m unittest tests.test_rules
+#   python -m pytest tests/test_rules.py
+
+
+import random
+import unittest
+
+from GessGame import GessGame, MoveReason, DIRECTIONS, LOCATIONS
+from GessGame_Bitboard import GessGame_Bitboard
+from GessGame_Compact import GessGame_Compact
+from tests.reference_game import ReferenceGessGame
+from tests.sample_positions import sample_positions
+
+
+ENGINES = (GessGame, GessGame_Bitboard, GessGame_Compact)
+STONES = ('●', '○')
+CENTERS = [row*20 + column for row in range(1, 19) for column in range(1, 19)]
+
+
+def reference_game(game):
+    """
+    Takes a game of any engine and returns a ReferenceGessGame with the same board, turn and game state
+    """
+    reference = ReferenceGessGame()
+    reference._board = game.get_board()
+    reference.set_turn(game.get_turn())
+    reference._state = game.get_game_state()
+    return reference
+
+
+def candidate_moves(board, stone, rng, extra=8):
+    """
+    Takes a 20x20 board, a stone and a random.Random. Returns moves worth checking as tuples of squares: from every center whose
+    3x3 grid holds the stone, every square in bound in each direction, the center itself and a few random squares of the whole
+    board (most of them neither straight nor diagonal, some off the playable area).
+    """
+    moves = []
+    for from_square in CENTERS:
+        row, column = divmod(from_square, 20)
+        if not any(board[r][c] == stone for r in (row - 1, row, row + 1) for c in (column - 1, column, column + 1)):
+            continue
+        moves.append((from_square, from_square))
+        for dr, dc in DIRECTIONS:
+            to_row, to_column = row + dr, column + dc
+            while 1 <= to_row <= 18 and 1 <= to_column <= 18:
+                moves.append((from_square, to_row*20 + to_column))
+                to_row += dr
+                to_column += dc
+        moves.extend((from_square, rng.randrange(400)) for _ in range(extra))
+    return moves
+
+
+class TestMoveRules(unittest.TestCase):
+    """
+    Differential checks of the legality rules of every engine against ReferenceGessGame
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.positions = sample_positions(seed=3, count=2)
+
+
+    def test_legality_matches_reference(self):
+        rng = random.Random(7)
+        for name, data in self.positions:
+            games = [engine.from_bytes(data) for engine in ENGINES]
+            reference = reference_game(games[0])
+            mismatches = []
+            for stone in STONES:
+                for from_square, to_square in candidate_moves(reference._board, stone, rng):
+                    from_location, to_location = LOCATIONS[from_square], LOCATIONS[to_square]
+                    expected = reference.is_move_legal(stone, from_location, to_location)
+                    for game in games:
+                        answers = (game.is_move_legal(stone, from_location, to_location),
+                                   game.is_move_legal_idx(stone, from_square, to_square),
+                                   game.check_move_idx(stone, from_square, to_square) == MoveReason.LEGAL)
+                        if answers != (expected,) * 3:
+                            mismatches.append((type(game).__name__, stone, from_location, to_location, expected, answers))
+            self.assertEqual(mismatches, [], f'position {name}')
+
+
+    def test_generated_moves_match_reference(self):
+        rng = random.Random(11)
+        for name, data in self.positions:
+            games = [engine.from_bytes(data) for engine in ENGINES]
+            reference = reference_game(games[0])
+            if reference.get_game_state() != 'UNFINISHED':
+                continue
+            stone = '●' if reference.get_turn() == 'black' else '○'
+            # the reference accepts a piece "moving" onto its own center, move generation leaves it out
+            expected = {(from_square, to_square) for from_square, to_square in candidate_moves(reference._board, stone, rng, extra=0)
+                        if from_square != to_square
+                        and reference.is_move_legal(stone, LOCATIONS[from_square], LOCATIONS[to_square])}
+            for game in games:
+                with self.subTest(position=name, engine=type(game).__name__):
+                    moves = game.generate_legal_moves_idx()
+                    self.assertEqual(len(moves), len(set(moves)))
+                    self.assertEqual(set(moves), expected)
+                    self.assertEqual(game.generate_legal_moves(), [(LOCATIONS[f], LOCATIONS[t]) for f, t in moves])
+
+
+    def test_games_match_reference(self):
+        rng = random.Random(5)
+        for number in range(3):
+            games = [engine() for engine in ENGINES]
+            reference = ReferenceGessGame()
+            history = [game.to_bytes() for game in games]
+            for ply in range(100):
+                moves = games[0].generate_legal_moves()
+                if not moves or reference.get_game_state() != 'UNFINISHED':
+                    break
+                # mostly legal moves, now and then one the games have to turn down without changing anything
+                if rng.random() < 0.2:
+                    move = (rng.choice(LOCATIONS), rng.choice(LOCATIONS))
+                else:
+                    move = rng.choice(moves)
+                expected = reference.make_move(*move)
+                for game in games:
+                    with self.subTest(game=number, ply=ply, engine=type(game).__name__, move=move):
+                        self.assertEqual(game.make_move(*move), expected)
+                        self.assertEqual(game.get_board(), reference._board)
+                        self.assertEqual(game.get_turn(), reference.get_turn())
+                        self.assertEqual(game.get_game_state(), reference.get_game_state())
+                if expected:
+                    history.append(games[0].to_bytes())
+
+            # taking every move back gives back every position on the way
+            for game in games:
+                for data in reversed(history):
+                    self.assertEqual(game.to_bytes(), data)
+                    game.unmake_move()
+                self.assertFalse(game.unmake_move())
+
+
+    def test_hash_follows_moves(self):
+        rng = random.Random(9)
+        for game in [engine() for engine in ENGINES]:
+            for ply in range(60):
+                moves = game.generate_legal_moves_idx()
+                if not moves or game.get_game_state() != 'UNFINISHED':
+                    break
+                game.make_move_idx(*rng.choice(moves))
+                with self.subTest(engine=type(game).__name__, ply=ply):
+                    self.assertEqual(game.get_hash(), GessGame.from_bytes(game.to_bytes()).get_hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Checks the left-right mirror canonicalisation of symmetry.py against positions mirrored square by square: the
+# mirror hash is the hash of the mirrored board, a position and its mirror image get the same canonical hash and position, and
+# the legal moves of the mirror image are the mirrored legal moves.
+#
+# Usage:
+#   python -m unittest tests.test_symmetry
+
+
+import unittest
+
+from GessGame import GessGame, SQUARES
+from GessGame_Bitboard import GessGame_Bitboard
+from GessGame_Compact import GessGame_Compact
+from symmetry import (mirror_square, mirror_location, orient_move, mirror_area, mirror_position, mirror_hash, canonical_hash,
+                      canonical_position)
+from tests.sample_positions import sample_positions
+
+
+ENGINES = (GessGame, GessGame_Bitboard, GessGame_Compact)
+
+
+def mirrored_game(game):
+    """
+    Takes a GessGame object and returns a new GessGame with its board mirrored square by square, and the same turn and state
+    """
+    mirrored = GessGame()
+    mirrored._board = [row[::-1] for row in game.get_board()]
+    mirrored.set_turn(game.get_turn())
+    mirrored._state = game.get_game_state()
+    mirrored._rings = mirrored._scan_rings()
+    mirrored._hash = mirrored._scan_hash()
+    return mirrored
+
+
+class TestSymmetry(unittest.TestCase):
+    """
+    Mirror images and canonical orientation of positions
+    """
+
+    def test_mirror_squares(self):
+        for square in range(400):
+            self.assertEqual(mirror_square(mirror_square(square)), square)
+            self.assertEqual(divmod(mirror_square(square), 20), (square // 20, 19 - square % 20))
+        self.assertEqual(mirror_location('c3'), 'r3')
+        self.assertEqual(orient_move(('c3', 'c6'), True), ('r3', 'r6'))
+        self.assertEqual(orient_move((SQUARES['c3'], SQUARES['f6']), True), (SQUARES['r3'], SQUARES['o6']))
+        self.assertEqual(orient_move(('c3', 'c6'), False), ('c3', 'c6'))
+        self.assertIsNone(orient_move(None, True))
+
+
+    def test_mirror_position(self):
+        for name, data in sample_positions(seed=2, count=3):
+            game = GessGame.from_bytes(data)
+            mirrored = mirrored_game(game)
+            with self.subTest(position=name):
+                self.assertEqual(mirror_position(data), mirrored.to_bytes())
+                self.assertEqual(mirror_position(mirror_position(data)), data)
+                black, white = game._get_area()
+                self.assertEqual(mirror_area(mirror_area(black)), black)
+                self.assertEqual((mirror_area(black), mirror_area(white)), mirrored._get_area())
+
+
+    def test_canonical_hash(self):
+        for name, data in sample_positions(seed=2, count=3):
+            for engine in ENGINES:
+                game = engine.from_bytes(data)
+                mirrored = engine.from_bytes(mirror_position(data))
+                with self.subTest(position=name, engine=engine.__name__):
+                    self.assertEqual(mirror_hash(game), mirrored.get_hash())
+                    key, flipped = canonical_hash(game)
+                    mirrored_key, mirrored_flipped = canonical_hash(mirrored)
+                    self.assertEqual(key, mirrored_key)
+                    self.assertEqual(key, min(game.get_hash(), mirrored.get_hash()))
+                    if game.get_hash() != mirrored.get_hash():
+                        self.assertNotEqual(flipped, mirrored_flipped)
+                    self.assertEqual(canonical_position(game)[0], canonical_position(mirrored)[0])
+
+
+    def test_mirrored_moves(self):
+        for name, data in sample_positions(seed=5, count=2):
+            game = GessGame_Bitboard.from_bytes(data)
+            mirrored = GessGame_Bitboard.from_bytes(mirror_position(data))
+            with self.subTest(position=name):
+                self.assertEqual({orient_move(move, True) for move in game.generate_legal_moves_idx()},
+                                 set(mirrored.generate_legal_moves_idx()))
+                for move in game.generate_legal_moves()[:20]:
+                    after = GessGame_Bitboard.from_bytes(data)
+                    after.make_move(*move)
+                    mirrored_after = GessGame_Bitboard.from_bytes(mirror_position(data))
+                    self.assertTrue(mirrored_after.make_move(*orient_move(move, True)))
+                    self.assertEqual(mirror_position(after.to_bytes()), mirrored_after.to_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Headless self-play tournament between two Gess engines. Games are spread over a pool of worker processes, one game
+# per job, each played on a GessGame_Bitboard until BLACK_WON/WHITE_WON or a move cap (a draw). Results are printed as soon as
+# each game finishes, followed by the Elo difference of engine A over engine B with a 95% confidence interval.
+# Only the standard library and the engine modules are imported, so it runs unattended without pygame.
+#
+# With --book, both engines play from an opening book (see opening_book.py) while the position is in it, picking book moves at
+# random in proportion to how often they were played, so the games don't all start the same way.
+#
+# Engines are given as strings:
+#   random          a random legal move
+#   search:<ms>     search.best_move() with <ms> milliseconds per move
+#   mcts:<n>        Monte Carlo tree search with <n> playouts per move, in the worker process
+#
+# Usage:
+#   python tournament.py search:200 random --games 1000 --workers 32 --max-moves 300
+#   python tournament.py search:200 mcts:500 --games 200 --book book.gbk
+
+
+import argparse
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from GessGame_Bitboard import GessGame_Bitboard
+from opening_book import OpeningBook
+
+
+def make_player(spec, seed):
+    """
+    Takes an engine string and a random seed.
+    Returns a function that takes a GessGame object and returns the engine's move, or None if there's no legal move.
+    """
+    name, _, argument = spec.partition(':')
+
+    if name == 'random':
+        rng = random.Random(seed)
+
+        def play(game):
+            moves = game.generate_legal_moves()
+            return rng.choice(moves) if moves else None
+        return play
+
+    if name == 'search':
+        import search
+        time_ms = int(argument or 100)
+        return lambda game: search.best_move(game, time_ms)
+
+    if name == 'mcts':
+        import mcts
+        engine = mcts.MCTSEngine(workers=1)
+        playouts = int(argument or 200)
+        rng = random.Random(seed)
+        return lambda game: engine.search(game, playouts, rng.getrandbits(32))['move']
+
+    raise ValueError(f'unknown engine: {spec}')
+
+
+def play_game(job):
+    """
+    Takes a tuple (game number, engine A, engine B, whether A plays black, move cap, random seed, opening book path or None)
+    and plays one game.
+    Returns a dictionary describing the result, with score_a = 1 if engine A won, 0 if it lost, 0.5 for a draw.
+    """
+    number, engine_a, engine_b, a_is_black, max_moves, seed, book_path = job
+    start = time.perf_counter()
+    player_a = make_player(engine_a, seed)
+    player_b = make_player(engine_b, seed + 1)
+    if a_is_black:
+        players = {'black': player_a, 'white': player_b}
+    else:
+        players = {'black': player_b, 'white': player_a}
+
+    book = OpeningBook(book_path) if book_path else None
+    book_rng = random.Random(seed)
+
+    game = GessGame_Bitboard()
+    moves = 0
+    while game.get_game_state() == 'UNFINISHED' and moves < max_moves:
+        move = None
+        if book is not None:
+            move = book.choose_move(game, book_rng)
+        if move is None:
+            move = players[game.get_turn()](game)
+        if move is None or not game.make_move(move[0], move[1]):
+            break
+        moves += 1
+
+    if book is not None:
+        book.close()
+
+    state = game.get_game_state()
+    if state == 'UNFINISHED':
+        result = 'DRAW'
+        score_a = 0.5
+    else:
+        result = state
+        score_a = 1.0 if (state == 'BLACK_WON') == a_is_black else 0.0
+
+    return {'game': number, 'black': engine_a if a_is_black else engine_b, 'white': engine_b if a_is_black else engine_a,
+            'result': result, 'moves': moves, 'score_a': score_a, 'seconds': time.perf_counter() - start}
+
+
+def elo_estimate(scores):
+    """
+    Takes the list of game scores of engine A (1, 0.5 or 0 each).
+    Returns (elo, low, high): the Elo difference of A over B and its 95% confidence interval, from the mean score and its
+    standard error. Scores of 0% or 100% are pulled in by half a game so the numbers stay finite.
+    """
+    games = len(scores)
+    if not games:
+        return 0.0, 0.0, 0.0
+
+    mean = sum(scores) / games
+    variance = sum((score - mean) ** 2 for score in scores) / games
+    margin = 1.96 * math.sqrt(variance / games)
+
+    def to_elo(score):
+        score = min(max(score, 0.5 / games), 1 - 0.5 / games)
+        return -400 * math.log10(1 / score - 1) + 0.0   # + 0.0 turns -0.0 into 0.0
+
+    return to_elo(mean), to_elo(mean - margin), to_elo(mean + margin)
+
+
+def run_tournament(engine_a, engine_b, games, workers=None, max_moves=300, seed=0, book_path=None):
+    """
+    Takes the two engine strings, the number of games, the number of worker processes (default: one per core),
+    the move cap, a random seed and optionally the path of an opening book. Engine A plays black in even games and white in odd
+    games.
+    Yields each game's result dictionary as soon as it finishes, in whatever order they finish.
+    """
+    jobs = [(number, engine_a, engine_b, number % 2 == 0, max_moves, seed + 2 * number, book_path) for number in range(games)]
+    with Pool(workers or os.cpu_count()) as pool:
+        for result in pool.imap_unordered(play_game, jobs):
+            yield result
+
+
+def main():
+    """
+    Parses the command line, runs the tournament, prints each game as it finishes and the summary at the end.
+    """
+    parser = argparse.ArgumentParser(description='Play a self-play tournament between two Gess engines.')
+    parser.add_argument('engine_a', help='random, search:<ms> or mcts:<playouts>')
+    parser.add_argument('engine_b', help='random, search:<ms> or mcts:<playouts>')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--max-moves', type=int, default=300, help='moves before a game is called a draw')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--book', default=None, help='opening book file written by opening_book.py')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scores = []
+    for result in run_tournament(args.engine_a, args.engine_b, args.games, args.workers, args.max_moves, args.seed,
+                                 args.book):
+        scores.append(result['score_a'])
+        print(f"game {result['game']}: {result['black']} (black) vs {result['white']} (white): {result['result']} "
+              f"in {result['moves']} moves, {result['seconds']:.1f}s", flush=True)
+
+    wins = scores.count(1.0)
+    draws = scores.count(0.5)
+    losses = scores.count(0.0)
+    elo, low, high = elo_estimate(scores)
+    print(f'{args.engine_a} vs {args.engine_b}: +{wins} ={draws} -{losses} in {time.perf_counter() - start:.1f}s')
+    print(f'Elo difference: {elo:+.0f} (95% confidence interval {low:+.0f} to {high:+.0f})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+# Author: YJL
+# Date: 10/18/2026
+# Description: Bulk validation of logged Gess games. Every game of the given move logs is replayed move by move on a pool of worker
+# processes to check that each move is legal and that the game ends in the state it was logged with, and the first problem of
+# every game that has one is written out, one line per game.
+# Logs are game record files (see game_records.py) or text files of games in the format of gess_cli.py validate, and are read as
+# a stream: the games go to the workers in batches, only a few batches per worker are in flight at a time, and the problems of a
+# batch are written as soon as it's done, so memory use stays the same whatever the size of the logs. A worker reads the games of
+# a record file straight from its own memory map of the file, only the numbers of the first and last game of a batch are sent to it.
+#
+# Output, tab-separated, in the order of the games:
+#   file  game  move  from  to  reason
+# for the first illegal move of a game (reason is the MoveReason in lower case, 'game_over' for a move after the game ended or
+# 'not_a_location'), or with '-' for from and to and reason 'ends_unfinished', 'ends_black_won' or 'ends_white_won' for a game
+# whose moves are all legal but which ends in another state than the one logged (move is then its number of moves).
+# A game that can't be read from a damaged record file gets '-' for move, from and to and reason 'unreadable_game', a log that
+# can't be opened or read any further gets one line with the number of the first game not read and reason 'unreadable_file'. Why
+# is reported on standard error, and the other logs are validated all the same.
+# Throughput in games per second is reported on standard error while the logs are read and at the end.
+#
+# Usage:
+#   python validate_games.py games-*.gess --workers 32 --output problems.tsv
+#   python validate_games.py games.txt --engine list --batch 64
+
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from gess_cli import ENGINES, load_engine, read_text_games, replay_moves
+from game_records import MAGIC, GameRecordReader
+
+
+DEFAULT_BATCH = 256        # games sent to a worker at a time
+BATCHES_PER_WORKER = 4     # batches in flight for every worker, enough to keep them all busy while the results are written
+
+# set in every worker process by _start_worker()
+_game_class = None
+_readers = {}
+
+
+def is_record_file(path):
+    """
+    Takes the path of a move log and returns True if it's a game record file, False for a text file of games
+    """
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def iter_batches(paths, batch_size=DEFAULT_BATCH):
+    """
+    Takes the paths of move logs and the number of games per batch. Yields the batches of games to validate, reading every log
+    only as far as the batch it yields:
+        ('records', path, first game number, last game number + 1) for a record file
+        ('text', path, first game number, [(moves, expected state or None), ...]) for a text file
+        ('unreadable', path, number of the first game not read, error message) for a log that can't be opened, isn't a record
+        file though it starts like one, or has a line that's neither a move nor a state
+    """
+    for path in paths:
+        first = 0
+        games = []
+        try:
+            if is_record_file(path):
+                with GameRecordReader(path) as reader:
+                    count = len(reader)
+                for first in range(0, count, batch_size):
+                    yield 'records', path, first, min(first + batch_size, count)
+                continue
+
+            with open(path, encoding='utf-8') as file:
+                for game in read_text_games(file):
+                    games.append(game)
+                    if len(games) == batch_size:
+                        yield 'text', path, first, games
+                        first += len(games)
+                        games = []
+                if games:
+                    yield 'text', path, first, games
+        except (OSError, ValueError) as error:
+            if games:                    # the games of a text file before the line that can't be read
+                yield 'text', path, first, games
+                first += len(games)
+            message = str(error)         # the errors of GameRecordReader and open() already name the file
+            yield 'unreadable', path, first, message if path in message else f'{path}: {message}'
+
+
+def _start_worker(engine):
+    """
+    Takes an engine name from gess_cli.ENGINES and sets up a worker process to replay games on it.
+    No return.
+    """
+    global _game_class
+    _game_class = load_engine(engine)
+
+
+def _record_games(path, first, last):
+    """
+    Takes the path of a record file and the numbers of the first and last + 1 game to read. Yields (moves, logged state) for
+    every game, reading them through a memory map of the file that the worker keeps open, or (None, error message) for a game
+    that can't be read.
+    """
+    reader = _readers.get(path)
+    if reader is None:
+        try:
+            reader = _readers[path] = GameRecordReader(path)
+        except (OSError, ValueError) as error:
+            for number in range(first, last):
+                yield None, f'{path}: {error}'
+            return
+    for number in range(first, last):
+        try:
+            yield reader.get_moves(number), reader.get_result(number)
+        except ValueError as error:
+            yield None, str(error)
+
+
+def validate_batch(batch):
+    """
+    Takes a batch yielded by iter_batches() and replays its games in a worker process.
+    Returns (path, number of games, problems, errors): a tuple (game number, move number, from_location, to_location, reason)
+    for the first problem of every game that has one, in the output format described above, and the error message of every
+    game or log that couldn't be read.
+    """
+    kind, path, first, games = batch
+    if kind == 'unreadable':         # games is the error message
+        return path, 0, [(first, '-', '-', '-', 'unreadable_file')], [games]
+    if kind == 'records':            # games is the number of the last game + 1
+        games = _record_games(path, first, games)
+
+    problems = []
+    errors = []
+    count = 0
+    for number, (moves, expected) in enumerate(games, first):
+        count += 1
+        if moves is None:            # expected is the error message
+            problems.append((number, '-', '-', '-', 'unreadable_game'))
+            errors.append(expected)
+            continue
+        game = _game_class()
+        illegal = replay_moves(game, moves)
+        if illegal is not None:
+            problems.append((number,) + illegal)
+            continue
+        state = game.get_game_state()
+        if expected is not None and state != expected:
+            problems.append((number, len(moves), '-', '-', f'ends_{state.lower()}'))
+    return path, count, problems, errors
+
+
+def validate_games(paths, workers=None, engine='bitboard', batch_size=DEFAULT_BATCH):
+    """
+    Takes the paths of move logs, the number of worker processes (default: one per core), the engine name and the number of
+    games per batch. Validates every game on a process pool.
+    Yields (path, number of games, problems, errors) for every batch, as returned by validate_batch(), in the order of the games.
+    At most BATCHES_PER_WORKER batches per worker are read ahead of the results.
+    """
+    workers = workers or os.cpu_count()
+    with Pool(workers, _start_worker, (engine,)) as pool:
+        pending = deque()
+        for batch in iter_batches(paths, batch_size):
+            if len(pending) == workers * BATCHES_PER_WORKER:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(validate_batch, (batch,)))
+        while pending:
+            yield pending.popleft().get()
+
+
+def main():
+    """
+    Parses the command line, validates the logs, writes out the problems and reports the throughput.
+    Exits with status 2 if a log or a game can't be read, otherwise 1 if a game has a problem.
+    """
+    parser = argparse.ArgumentParser(description='Replay logged Gess games on a process pool and write out the first illegal '
+                                                 'move of every game.')
+    parser.add_argument('logs', nargs='+', help='game record files or text files of games')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per core)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='bitboard')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, help='games sent to a worker at a time')
+    parser.add_argument('--output', default=None, help='file to write the problems to (default: standard output)')
+    parser.add_argument('--progress', type=float, default=10.0, help='seconds between throughput reports')
+    args = parser.parse_args()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    next_report = start + args.progress
+    games = invalid = unreadable = 0
+    try:
+        print('file\tgame\tmove\tfrom\tto\treason', file=output)
+        for path, count, problems, errors in validate_games(args.logs, args.workers, args.engine, args.batch):
+            games += count
+            invalid += len(problems)
+            unreadable += len(errors)
+            for problem in problems:
+                print(path, *problem, sep='\t', file=output)
+            for error in errors:
+                print(f'error: {error}', file=sys.stderr)
+
+            now = time.perf_counter()
+            if now >= next_report:
+                next_report = now + args.progress
+                print(f'{games} games, {invalid} invalid, {games / (now - start):.0f} games/s', file=sys.stderr, flush=True)
+    except (OSError, ValueError) as error:
+        print(f'error: {error}', file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    seconds = time.perf_counter() - start
+    print(f'{games} games, {invalid} invalid in {seconds:.1f}s ({games / seconds if seconds > 0 else 0:.0f} games/s)',
+          file=sys.stderr)
+    if unreadable:
+        sys.exit(2)
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()